@@ -51,6 +51,7 @@ from ruamel.yaml import YAML
 
 import autosubmit.helpers.autosubmit_helper as AutosubmitHelper
 import autosubmit.statistics.utils as StatisticsUtils
+from autosubmit.database.db_backup import BACKUP_INTERVAL, backup_database, restore_database, restore_database_from_dump
 from autosubmit.database.db_common import create_db
 from autosubmit.database.db_common import delete_experiment, get_experiment_descrip
 from autosubmit.database.db_common import get_autosubmit_version, check_experiment_exists
@@ -63,6 +64,7 @@ from autosubmit.git.autosubmit_git import AutosubmitGit, check_unpushed_changes,
 from autosubmit.helpers.processes import process_id
 from autosubmit.helpers.utils import check_jobs_file_exists, get_rc_path
 from autosubmit.helpers.utils import strtobool
+from autosubmit.history.database_managers.database_manager import connection_pool
 from autosubmit.history.experiment_history import ExperimentHistory
 from autosubmit.history.experiment_status import ExperimentStatus
 from autosubmit.job.job import Job
@@ -71,6 +73,7 @@ from autosubmit.job.job_grouping import JobGrouping
 from autosubmit.job.job_list import JobList
 from autosubmit.job.job_list_persistence import JobListPersistenceDb
 from autosubmit.job.job_list_persistence import JobListPersistencePkl
+from autosubmit.job.job_list_persistence import JobListPersistenceJournal
 from autosubmit.job.job_package_persistence import JobPackagePersistence
 from autosubmit.job.job_packager import JobPackager
 from autosubmit.job.job_utils import SubJob, SubJobManager
@@ -79,6 +82,8 @@ from autosubmit.notifications.mail_notifier import MailNotifier
 from autosubmit.notifications.notifier import Notifier
 from autosubmit.platforms.paramiko_submitter import ParamikoSubmitter
 from autosubmit.platforms.platform import Platform
+from autosubmit.platforms.platform_checker import PlatformChecker
+from autosubmit.platforms.polling import PollingScheduler
 from autosubmit.platforms.submitter import Submitter
 from autosubmit.log.log import Log, AutosubmitError, AutosubmitCritical
 
@@ -1104,6 +1109,7 @@ class Autosubmit:
         message_parts.extend(f"{path}\n" for path in experiment_path.rglob('*'))
         message_parts.append(f"{structure_db_path}\n")
         message_parts.append(f"{job_data_db_path}.db\n")
+        message_parts.append(f"{job_data_db_path}_backup.db\n")
         message_parts.append(f"{job_data_db_path}.sql\n")
         message = '\n'.join(message_parts)
         return message
@@ -1149,9 +1155,12 @@ class Autosubmit:
         Log.info("Removing job_data db...")
         try:
             db_path = job_data_db_path.with_suffix(".db")
+            backup_path = job_data_db_path.with_name(f"{job_data_db_path.name}_backup.db")
             sql_path = job_data_db_path.with_suffix(".sql")
             if db_path.exists():
                 os.remove(db_path)
+            if backup_path.exists():
+                os.remove(backup_path)
             if sql_path.exists():
                 os.remove(sql_path)
         except BaseException as e:
@@ -1542,6 +1551,7 @@ class Autosubmit:
         as_conf.experiment_data['STARTDATES'] = []
         for date in job_list._date_list:
             as_conf.experiment_data['STARTDATES'].append(date2str(date, job_list.get_date_format()))
+        as_conf.invalidate_parameters()
 
     @staticmethod
     def inspect(expid, lst, filter_chunks, filter_status, filter_section, notransitive=False, force=False,
@@ -1738,6 +1748,7 @@ class Autosubmit:
         """
         Log.warning("Generating the auxiliary job_list used for the -CW flag.")
         job_list._job_list = jobs_filtered
+        job_list._status_index.invalidate()
         job_list._persistence_file = job_list._persistence_file + "_cw_flag"
         parameters = as_conf.load_parameters()
         date_list = as_conf.get_date_list()
@@ -1976,7 +1987,7 @@ class Autosubmit:
                                         historiclog_dir_path=BasicConfig.HISTORICAL_LOG_DIR)
         if len(job_changes_tracker) > 0:
             exp_history.process_job_list_changes_to_experiment_totals(job_list.get_job_list())
-            Autosubmit.database_backup(expid)
+            Autosubmit.database_backup(expid, min_interval=BACKUP_INTERVAL)
         return exp_history
 
     @staticmethod
@@ -2267,6 +2278,8 @@ class Autosubmit:
 
                 max_recovery_retrials = as_conf.experiment_data.get("CONFIG",{}).get("RECOVERY_RETRIALS",3650)  # (72h - 122h )
                 recovery_retrials = 0
+                platform_checker = None
+                polling = PollingScheduler()
                 Autosubmit.check_logs_status(job_list, as_conf, new_run=True)
                 while job_list.get_active():
                     try:
@@ -2289,30 +2302,60 @@ class Autosubmit:
                             raise AutosubmitError("Config files seems to not be accessible", 6040, str(e))
                         total_jobs, safetysleeptime, default_retrials, check_wrapper_jobs_sleeptime = Autosubmit.get_iteration_info(as_conf,job_list)
 
+                        # Platforms whose previous check is still running are left alone in this iteration
+                        if platform_checker is not None:
+                            platforms_in_use = [platform for platform in platforms_to_test
+                                                if not platform_checker.is_busy(platform)]
+                        else:
+                            platforms_in_use = platforms_to_test
+                        # The queues are listed again in each iteration
+                        for platform in platforms_in_use:
+                            platform.invalidate_queue_snapshot()
                         # This function name is totally misleading, yes it check the status of the wrappers, but also orders jobs the jobs that  are not wrapped by platform.
-                        jobs_to_check, job_changes_tracker = Autosubmit.check_wrappers(as_conf, job_list, platforms_to_test, expid)
+                        jobs_to_check, job_changes_tracker = Autosubmit.check_wrappers(as_conf, job_list, platforms_in_use, expid)
                         # Jobs to check are grouped by platform.
                         # platforms_to_test could be renamed to active_platforms or something like that.
-                        for platform in platforms_to_test:
+                        platforms_jobs = []
+                        for platform in platforms_in_use:
                             platform_jobs = jobs_to_check.get(platform.name, [])
                             if len(platform_jobs) == 0:
                                 Log.info(f"No jobs to check for platform {platform.name}")
                                 continue
 
                             Log.info(f"Checking {len(platform_jobs)} jobs for platform {platform.name}")
-                            # Check all non-wrapped jobs status for the current platform
-                            platform.check_Alljobs(platform_jobs, as_conf)
+                            platforms_jobs.append((platform, platform_jobs))
+                        # Check all non-wrapped jobs status, one platform after another or all of them at the same time
+                        platform_check_timeout = as_conf.get_platform_check_timeout()
+                        if platform_check_timeout > 0:
+                            # Kept across iterations, even if the timeout changes, to know the busy platforms
+                            if platform_checker is None:
+                                platform_checker = PlatformChecker(platform_check_timeout)
+                            platform_checker.timeout = platform_check_timeout
+                            platforms_jobs = platform_checker.check(platforms_jobs, as_conf)
+                        else:
+                            for platform, platform_jobs in platforms_jobs:
+                                platform.check_Alljobs(platform_jobs, as_conf)
+                        for platform, platform_jobs in platforms_jobs:
+                            # The COMPLETED files of the jobs that finished are retrieved all at once
+                            platform.fetch_completed_files([job.name for job, _ in platform_jobs
+                                                            if job.new_status in [Status.COMPLETED, Status.UNKNOWN]])
                             # mail notification ( in case of changes )
-                            for job, job_prev_status in jobs_to_check[platform.name]:
+                            for job, job_prev_status in platform_jobs:
                                 if job_prev_status != job.update_status(as_conf):
                                     Autosubmit.job_notify(as_conf,expid,job,job_prev_status,job_changes_tracker)
                         # Updates all workflow status with the new information.
-                        job_list.update_list(as_conf, submitter=submitter)
+                        job_list.update_list(as_conf, submitter=submitter, incremental=True)
                         job_list.save()
+                        # Platforms whose check did not finish in time are left alone as well
+                        if platform_checker is not None:
+                            platforms_to_submit = [platform for platform in platforms_in_use
+                                                   if not platform_checker.is_busy(platform)]
+                        else:
+                            platforms_to_submit = platforms_in_use
                         # Submit jobs that are ready to run
                         if len(job_list.get_ready()) > 0:
-                            Autosubmit.submit_ready_jobs(as_conf, job_list, platforms_to_test, packages_persistence, hold=False)
-                            job_list.update_list(as_conf, submitter=submitter)
+                            Autosubmit.submit_ready_jobs(as_conf, job_list, platforms_to_submit, packages_persistence, hold=False)
+                            job_list.update_list(as_conf, submitter=submitter, incremental=True)
                             job_list.save()
                             as_conf.save()
 
@@ -2321,8 +2364,8 @@ class Autosubmit:
                         # This only works for SLURM. ( Prepare status can not be achieved in other platforms )
                         if as_conf.get_remote_dependencies() == "true" and len(job_list.get_prepared()) > 0:
                             Autosubmit.submit_ready_jobs(
-                                as_conf, job_list, platforms_to_test, packages_persistence, hold=True)
-                            job_list.update_list(as_conf, submitter=submitter)
+                                as_conf, job_list, platforms_to_submit, packages_persistence, hold=True)
+                            job_list.update_list(as_conf, submitter=submitter, incremental=True)
                             job_list.save()
                             as_conf.save()
                         # Safe spot to store changes
@@ -2342,7 +2385,8 @@ class Autosubmit:
                             Autosubmit.check_logs_status(job_list, as_conf, new_run=False)
                             job_list.save()
                             as_conf.save()
-                        time.sleep(safetysleeptime)
+                        time.sleep(polling.next_poll(job_list.get_in_queue(), as_conf.get_min_safetysleeptime(),
+                                                     as_conf.get_max_safetysleeptime()))
                     except AutosubmitError as e:  # If an error is detected, restore all connections and job_list
                         Log.error("Trace: {0}", e.trace)
                         Log.error("{1} [eCode={0}]", e.code, e.message)
@@ -2586,14 +2630,16 @@ class Autosubmit:
             for platform in platforms_to_test:
                 packager = JobPackager(as_conf, platform, job_list, hold=hold)
                 packages_to_submit = packager.build_packages()
-                save_1, failed_packages, error_message, valid_packages_to_submit, any_job_submitted = platform.submit_ready_jobs(as_conf,
-                                                                                                              job_list,
-                                                                                                              platforms_to_test,
-                                                                                                              packages_persistence,
-                                                                                                              packages_to_submit,
-                                                                                                              inspect=inspect,
-                                                                                                              only_wrappers=only_wrappers,
-                                                                                                              hold=hold)
+                # The scripts of all the packages are sent at once, before the submit script is run
+                with platform.defer_uploads(platform.type.lower() in ["slurm", "pjm"] and not inspect and not only_wrappers):
+                    save_1, failed_packages, error_message, valid_packages_to_submit, any_job_submitted = platform.submit_ready_jobs(as_conf,
+                                                                                                                  job_list,
+                                                                                                                  platforms_to_test,
+                                                                                                                  packages_persistence,
+                                                                                                                  packages_to_submit,
+                                                                                                                  inspect=inspect,
+                                                                                                                  only_wrappers=only_wrappers,
+                                                                                                                  hold=hold)
                 wrapper_errors.update(packager.wrappers_with_error)
                 # Jobs that are being retrieved in batch. Right now, only available for slurm platforms.
 
@@ -2607,6 +2653,8 @@ class Autosubmit:
                                                                                          error_message="", hold=hold)
                     if not inspect and len(valid_packages_to_submit) > 0:
                         job_list.save()
+                if not inspect and len(valid_packages_to_submit) > 0:
+                    platform.last_submission_time = time.monotonic()
                 # Save wrappers(jobs that has the same id) to be visualized and checked in other parts of the code
                 job_list.save_wrappers(valid_packages_to_submit, failed_packages, as_conf, packages_persistence,
                                        hold=hold, inspect=inspect)
@@ -2691,7 +2739,7 @@ class Autosubmit:
             output_type = as_conf.get_output_type()
             pkl_dir = os.path.join(BasicConfig.LOCAL_ROOT_DIR, expid, 'pkl')
             job_list = Autosubmit.load_job_list(
-                expid, as_conf, notransitive=notransitive, monitor=True, new=False)
+                expid, as_conf, notransitive=notransitive, monitor=True, new=False, lazy=True)
             Log.debug("Job list restored from {0} files", pkl_dir)
         except AutosubmitError as e:
             if profile:
@@ -2874,7 +2922,7 @@ class Autosubmit:
             as_conf.check_conf_files(False)
 
             pkl_dir = os.path.join(BasicConfig.LOCAL_ROOT_DIR, expid, 'pkl')
-            job_list = Autosubmit.load_job_list(expid, as_conf, notransitive=notransitive, new=False)
+            job_list = Autosubmit.load_job_list(expid, as_conf, notransitive=notransitive, new=False, lazy=True)
             for job in job_list.get_job_list():
                 job._init_runtime_parameters()
                 job.update_dict_parameters(as_conf)
@@ -3009,7 +3057,7 @@ class Autosubmit:
             Log.info(f'Recovering experiment {expid}')
             pkl_dir = os.path.join(BasicConfig.LOCAL_ROOT_DIR, expid, 'pkl')
             job_list = Autosubmit.load_job_list(
-                expid, as_conf, notransitive=notransitive, new=False, monitor=True)
+                expid, as_conf, notransitive=notransitive, new=False, monitor=True, lazy=True)
 
             current_active_jobs = job_list.get_in_queue()
 
@@ -3036,8 +3084,10 @@ class Autosubmit:
                         platforms_to_test.add(job.platform)
                     for platform in platforms_to_test:
                         platform.test_connection(as_conf)
-                    for job in current_active_jobs:
-                        job.platform.send_command(job.platform.cancel_cmd + " " + str(job.id), ignore_log=True)
+                    # The jobs of each platform are cancelled in one round trip
+                    for platform in platforms_to_test:
+                        platform.send_commands([platform.cancel_cmd + " " + str(job.id) for job in current_active_jobs
+                                                if job.platform is platform], ignore_log=True)
 
                 if not force:
                     raise AutosubmitCritical(f"Experiment can't be recovered due being {len(current_active_jobs)} "
@@ -3071,11 +3121,16 @@ class Autosubmit:
         Log.info("Looking for COMPLETED files")
         try:
             start = datetime.datetime.now()
+            jobs_by_platform = dict()
             for job in jobs_to_recover:
                 if job.platform_name is None:
                     job.platform_name = hpcarch
                 # noinspection PyTypeChecker
                 job.platform = platforms[job.platform_name]
+                jobs_by_platform.setdefault(job.platform, []).append(job.name)
+            for platform, job_names in jobs_by_platform.items():
+                platform.fetch_completed_files(job_names)
+            for job in jobs_to_recover:
                 if job.platform.get_completed_files(job.name, 0, recovery=True):
                     job.status = Status.COMPLETED
                     Log.info(f"CHANGED job '{job.name}' status to COMPLETED")
@@ -3313,6 +3368,7 @@ class Autosubmit:
                     pass
                 if len(jobs_parameters) > 0:
                     del as_conf.experiment_data["JOBS"]
+                    as_conf.invalidate_parameters()
                 parameters = as_conf.load_parameters()
                 parameters.update(jobs_parameters)
                 for key, value in parameters.items():
@@ -4116,20 +4172,32 @@ class Autosubmit:
             raise AutosubmitCritical(e.message, e.code, e.trace)
 
     @staticmethod
-    def database_backup(expid):
+    def database_backup(expid, min_interval=0):
+        """
+        Database methods. Backs up the historical database of the experiment while it is in use.
+
+        :param expid: experiment identifier
+        :type expid: str
+        :param min_interval: seconds to wait since the previous backup, 0 to back it up anyway
+        :type min_interval: int
+        """
         try:
-            database_path= os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}.db")
-            backup_path = os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}.sql")
-            command = f"sqlite3 {database_path} .dump > {backup_path} "
+            database_path = os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}.db")
+            backup_path = os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}_backup.db")
+            if min_interval > 0 and os.path.exists(backup_path) and \
+                    time.time() - os.path.getmtime(backup_path) < min_interval:
+                return
             Log.debug("Backing up jobs_data...")
-            out = subprocess.call(command, shell=True)
+            backup_database(database_path, backup_path)
             Log.debug("Jobs_data database backup completed.")
         except BaseException as e:
-            Log.debug("Jobs_data database backup failed.")
+            Log.debug(f"Jobs_data database backup failed: {str(e)}")
+
     @staticmethod
     def database_fix(expid):
         """
-        Database methods. Performs a sql dump of the database and restores it.
+        Database methods. Restores the historical database from its backup, or from the sql dump
+        of previous versions of Autosubmit. A new blank database is created if neither works.
 
         :param expid: experiment identifier
         :type expid: str
@@ -4137,28 +4205,35 @@ class Autosubmit:
         :rtype:        
         """
         os.umask(0) # Overrides user permissions
-        current_time = int(time.time())
         corrupted_db_path = os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}_corrupted.db")
 
         database_path = os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}.db")
-        dump_file_name = f'job_data_{expid}.sql'
-        dump_file_path = os.path.join(BasicConfig.JOBDATA_DIR, dump_file_name)
-        bash_command = f'cat {dump_file_path} | sqlite3 {database_path}'
+        backup_path = os.path.join(BasicConfig.JOBDATA_DIR, f"job_data_{expid}_backup.db")
+        dump_file_path = os.path.join(BasicConfig.JOBDATA_DIR, f'job_data_{expid}.sql')
         try:
-            if  os.path.exists(database_path):
-                os.popen(f"mv {database_path} {corrupted_db_path}").read()
-                time.sleep(1)
+            connection_pool.close(database_path)
+            if os.path.exists(database_path):
+                os.replace(database_path, corrupted_db_path)
+                for suffix in ("-wal", "-shm"):
+                    if os.path.exists(database_path + suffix):
+                        os.replace(database_path + suffix, corrupted_db_path + suffix)
                 Log.info("Original database moved.")
             try:
+                if os.path.exists(backup_path):
+                    Log.info("Restoring from backup")
+                    restore_database(backup_path, database_path)
+                else:
+                    Log.info("Restoring from sql")
+                    restore_database_from_dump(dump_file_path, database_path)
                 exp_history = ExperimentHistory(expid, jobdata_dir_path=BasicConfig.JOBDATA_DIR,
                                                 historiclog_dir_path=BasicConfig.HISTORICAL_LOG_DIR)
-                Log.info("Restoring from sql")
-                os.popen(bash_command).read()
                 exp_history.initialize_database()
 
-            except Exception:
-                Log.warning("It was not possible to restore the jobs_data.db file... , a new blank db will be created")
-                result = os.popen(f"rm {database_path}").read()
+            except Exception as e:
+                Log.warning(f"It was not possible to restore the jobs_data.db file: {str(e)}, a new blank db will "
+                            f"be created")
+                if os.path.exists(database_path):
+                    os.remove(database_path)
 
                 exp_history = ExperimentHistory(expid, jobdata_dir_path=BasicConfig.JOBDATA_DIR,
                                                 historiclog_dir_path=BasicConfig.HISTORICAL_LOG_DIR)
@@ -5220,7 +5295,7 @@ class Autosubmit:
                 output_type = as_conf.get_output_type()
                 # Getting db connections
                 # To be added in a function that checks which platforms must be connected to
-                job_list = Autosubmit.load_job_list(expid, as_conf, notransitive=notransitive, monitor=True, new=False)
+                job_list = Autosubmit.load_job_list(expid, as_conf, notransitive=notransitive, monitor=True, new=False, lazy=True)
                 submitter = Autosubmit._get_submitter(as_conf)
                 submitter.load_platforms(as_conf)
                 hpcarch = as_conf.get_platform()
@@ -5567,6 +5642,8 @@ class Autosubmit:
             return JobListPersistencePkl()
         elif storage_type == 'db':
             return JobListPersistenceDb(expid)
+        elif storage_type == 'journal':
+            return JobListPersistenceJournal()
         raise AutosubmitCritical('Storage type not known', 7014)
 
     @staticmethod
@@ -5663,7 +5740,7 @@ class Autosubmit:
 
     # TODO: To be moved to utils
     @staticmethod
-    def load_job_list(expid, as_conf, notransitive=False, monitor=False, new=True) -> JobList:
+    def load_job_list(expid, as_conf, notransitive=False, monitor=False, new=True, lazy=False) -> JobList:
         rerun = as_conf.get_rerun()
         job_list = JobList(expid, as_conf, YAMLParserFactory(),
                            Autosubmit._get_job_list_persistence(expid, as_conf))
@@ -5685,7 +5762,7 @@ class Autosubmit:
         job_list.generate(as_conf, date_list, as_conf.get_member_list(), as_conf.get_num_chunks(), as_conf.get_chunk_ini(),
                           as_conf.experiment_data, date_format, as_conf.get_retrials(),
                           as_conf.get_default_job_type(), wrapper_jobs,
-                          new=new, run_only_members=run_only_members,monitor=monitor)
+                          new=new, run_only_members=run_only_members,monitor=monitor, lazy=lazy)
 
         if str(rerun).lower() == "true":
             rerun_jobs = as_conf.get_rerun_jobs()
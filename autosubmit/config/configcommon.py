@@ -17,6 +17,7 @@
 
 import collections
 import copy
+import hashlib
 import json
 import locale
 import numbers
@@ -59,10 +60,19 @@ class AutosubmitConfig(object):
             raise IOError(f"Experiment {expid} does not exist")
         self.parser_factory = parser_factory
         self.experiment_data = {}
+        # Increased when reload changes experiment_data or when it's modified in place, see invalidate_parameters
+        self.data_version = 0
+        self._parameters_cache: Optional[tuple] = None
+        # Digest of the experiment data written by the last save
+        self._saved_data_digest: Optional[str] = None
         self.last_experiment_data = {}
         self.data_loops = set()
 
         self.current_loaded_files = dict()
+        # Parsed YAML files by path, as (mtime_ns, size), content digest and data
+        self._parsed_files: dict[str, tuple[tuple[int, int], str, Any]] = dict()
+        # Stat of the configuration files, started by needs_reload and reused by the reload that follows
+        self._stat_pass: dict[str, Optional[os.stat_result]] = dict()
         self.conf_folder_yaml = Path(BasicConfig.LOCAL_ROOT_DIR, expid, "conf")
         if not Path(BasicConfig.LOCAL_ROOT_DIR, expid, "conf").exists():
             raise IOError(f"Experiment {expid}/conf does not exist")
@@ -508,6 +518,8 @@ class AutosubmitConfig(object):
         """Update a nested dictionary or similar mapping.
         Modify ``source`` in place.
         """
+        if unified_config is self.experiment_data:
+            self.invalidate_parameters()
         if not isinstance(unified_config, collections.abc.Mapping):
             unified_config = {}
         for key in new_dict.keys():
@@ -708,7 +720,7 @@ class AutosubmitConfig(object):
         # check if path is file o folder
         # load yaml file with ruamel.yaml
 
-        new_file = AutosubmitConfig.get_parser(self.parser_factory, yaml_file)
+        new_file = self._parse_config_file(yaml_file)
         new_file.data = self.normalize_variables(new_file.data.copy(),
                                                  must_exists=False)  # TODO Figure out why this .copy is needed
         if new_file.data.get("DEFAULT", {}).get("CUSTOM_CONFIG", None) is not None:
@@ -719,6 +731,84 @@ class AutosubmitConfig(object):
             new_file.data = {}
         return self.unify_conf(current_folder_data, new_file.data)
 
+    def _stat_config_file(self, file_path) -> Optional[os.stat_result]:
+        """Stats a configuration file, only once until needs_reload starts a new stat pass.
+
+        :param file_path: path to the file
+        :return: the stat of the file, or None if it does not exist
+        """
+        file_path = str(file_path)
+        if file_path not in self._stat_pass:
+            try:
+                self._stat_pass[file_path] = os.stat(file_path)
+            except OSError:
+                self._stat_pass[file_path] = None
+        return self._stat_pass[file_path]
+
+    def _config_file_mtime(self, file_path) -> float:
+        """Returns the modification time of a configuration file in the current stat pass.
+
+        :param file_path: path to the file
+        :return: the modification time, or 0 if the file did not exist, so it is checked again in the next pass
+        """
+        stat = self._stat_config_file(file_path)
+        return stat.st_mtime if stat is not None else 0
+
+    def _has_same_content(self, file_path, stat: os.stat_result) -> bool:
+        """Checks if a parsed file has the same content as when it was parsed, even if it was touched.
+
+        :param file_path: path to the file
+        :param stat: current stat of the file
+        :return: True if the content digest did not change
+        """
+        cached = self._parsed_files.get(str(file_path))
+        if cached is None:
+            return False
+        if cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return True
+        try:
+            content = Path(file_path).read_bytes()
+        except OSError:
+            return False
+        if hashlib.sha256(content).hexdigest() != cached[1]:
+            return False
+        self._parsed_files[str(file_path)] = ((stat.st_mtime_ns, stat.st_size), cached[1], cached[2])
+        return True
+
+    def _parse_config_file(self, yaml_file: Path):
+        """Parses a YAML file, reusing the previous result if its content did not change.
+
+        The parsed data is cached by path, and considered valid while the mtime and size of the
+        file are the same, or, if they changed, while the digest of the content is the same.
+
+        :param yaml_file: path to the file
+        :return: parser with the parsed data
+        :rtype: YAMLParser
+        """
+        stat = self._stat_config_file(yaml_file)
+        if stat is None or not Path(yaml_file).is_file():
+            return AutosubmitConfig.get_parser(self.parser_factory, yaml_file)
+        parser = self.parser_factory.create_parser()
+        cache_key = str(yaml_file)
+        if self._has_same_content(yaml_file, stat):
+            parser.data = copy.deepcopy(self._parsed_files[cache_key][2])
+            return parser
+        try:
+            content = Path(yaml_file).read_bytes()
+            data = parser.load(content.decode())
+        except IOError:
+            parser.data = {}
+            return parser
+        except Exception as exp:
+            raise Exception(
+                "{}\n This file and the correctness of its content are necessary.".format(str(exp)))
+        if data is None:
+            data = {}
+        self._parsed_files[cache_key] = ((stat.st_mtime_ns, stat.st_size), hashlib.sha256(content).hexdigest(),
+                                         copy.deepcopy(data))
+        parser.data = data
+        return parser
+
     # noinspection PyMethodMayBeStatic
     def get_yaml_filenames_to_load(self, yaml_folder, ignore_minimal=False):
         """Get all yaml files in a folder and return a list with the filenames
@@ -925,7 +1015,7 @@ class AutosubmitConfig(object):
         if in_the_end:
             dynamic_variables.update(self.special_dynamic_variables)
         if parameters is None:
-            parameters = self.deep_parameters_export(self.experiment_data, self.default_parameters)
+            parameters = self.load_parameters()
 
         if dict_keys_type is None:
             dict_keys_type = self.check_dict_keys_type(parameters)
@@ -1318,7 +1408,7 @@ class AutosubmitConfig(object):
 
         if parser_data.get("STORAGE", None) is None:
             parser_data["STORAGE"] = {}
-        if parser_data["STORAGE"].get('TYPE', "pkl") not in ['pkl', 'db']:
+        if parser_data["STORAGE"].get('TYPE', "pkl") not in ['pkl', 'db', 'journal']:
             self.wrong_config["Autosubmit"] += [['storage',
                                                  "TYPE parameter not found"]]
         wrappers_info = parser_data.get("WRAPPERS", {})
@@ -1334,6 +1424,7 @@ class AutosubmitConfig(object):
                 else:
                     mails = mails.split(' ')
                 self.experiment_data["MAIL"]["TO"] = mails
+                self.invalidate_parameters()
 
                 for mail in self.experiment_data["MAIL"]["TO"]:
                     if not self.is_valid_mail_address(mail):
@@ -1663,7 +1754,7 @@ class AutosubmitConfig(object):
                 Log.warning(f"Yaml file {filename} not found")
             if filename.exists() and str(filename) not in self.current_loaded_files:
                 # Check if this file is already loaded. If not, load it
-                self.current_loaded_files[str(filename)] = filename.stat().st_mtime
+                self.current_loaded_files[str(filename)] = self._config_file_mtime(filename)
                 # Load a folder or a file
                 if not filename.is_file():
                     # Load a folder by calling recursively to this function as a list of files
@@ -1767,17 +1858,23 @@ class AutosubmitConfig(object):
         """
         Check if any configuration file has been modified and needs to be reloaded.
 
+        A file that was touched, but whose content is the same as when it was parsed, does
+        not need a reload. Each call starts a new stat pass, the only place where it is reset,
+        and ``reload`` calls it first, so the files are stat once per reload.
+
         Returns:
             bool: True if a reload is needed, False otherwise.
         """
+        self._stat_pass = dict()
         if len(self.current_loaded_files) == 0:
             return True
         if self.experiment_data.get("CONFIG", {}).get("RELOAD_WHILE_RUNNING", True):
-            for file in self.current_loaded_files.keys():
-                if os.path.exists(file):
-                    mod_time = os.path.getmtime(file)
-                    if mod_time > self.current_loaded_files[file]:
+            for file, loaded_mod_time in list(self.current_loaded_files.items()):
+                stat = self._stat_config_file(file)
+                if stat is not None and stat.st_mtime > loaded_mod_time:
+                    if not self._has_same_content(file, stat):
                         return True
+                    self.current_loaded_files[file] = stat.st_mtime
         return False
 
     def reload(self, force_load=False, only_experiment_data=False):
@@ -1788,7 +1885,10 @@ class AutosubmitConfig(object):
         # Check if the files have been modified or if they need a reload.
         # Reload only the files that have been modified.
         # Only reload the data if there are changes or there is no data loaded yet.
-        if force_load or self.needs_reload():
+        # Also with force_load, to start a new stat pass
+        needs_reload = self.needs_reload()
+        if force_load or needs_reload:
+            previous_data = self.experiment_data
             # Load all the files starting from the $expid/conf folder
             starter_conf = {}
             self.current_loaded_files = {}  # reset loaded files
@@ -1801,7 +1901,7 @@ class AutosubmitConfig(object):
             non_minimal_conf = {}
             non_minimal_files = {}
             for filename in self.get_yaml_filenames_to_load(self.conf_folder_yaml, ignore_minimal=True):
-                non_minimal_files[str(filename)] = Path(filename).stat().st_mtime
+                non_minimal_files[str(filename)] = self._config_file_mtime(filename)
                 non_minimal_conf = self.unify_conf(non_minimal_conf,
                                                    self.load_config_file(non_minimal_conf, Path(filename)))
             non_minimal_conf = self.load_common_parameters(non_minimal_conf)
@@ -1838,6 +1938,11 @@ class AutosubmitConfig(object):
                                                  self.load_config_file(self.misc_data, Path(filename), load_misc=True))
             self.load_current_hpcarch_parameters()
             self.load_workflow_commit()
+            if self.experiment_data == previous_data:
+                # Keeps the same object, so everything computed from it is still valid
+                self.experiment_data = previous_data
+            else:
+                self.data_version += 1
 
     def _add_autosubmit_dict(self) -> None:
         """Add the AUTOSUBMIT namespace to the experiment data."""
@@ -1871,26 +1976,43 @@ class AutosubmitConfig(object):
             self.experiment_data[f"HPC{name}"] = value
         self.experiment_data["HPCARCH"] = hpcarch
 
+    def _experiment_data_digest(self) -> str:
+        """Returns a digest of the structure and values of the experiment data."""
+        return hashlib.sha256(repr(self.experiment_data).encode()).hexdigest()
+
     def save(self) -> None:
-        """Saves the experiment data into the ``experiment_folder/conf/metadata`` folder as a YAML file."""
+        """Saves the experiment data into the ``experiment_folder/conf/metadata`` folder as a YAML file.
+
+        Nothing is written if the experiment data did not change since the last save and the file
+        is still there. The file is written to a temporary file first and then renamed, so a
+        reader never sees a partial file.
+        """
         if self.is_current_logged_user_owner:
+            experiment_data_file = self.metadata_folder.joinpath("experiment_data.yml")
+            digest = self._experiment_data_digest()
+            if digest == self._saved_data_digest and experiment_data_file.exists():
+                return
             if not self.metadata_folder.exists():
                 self.metadata_folder.mkdir(parents=True, exist_ok=True)
                 self.metadata_folder.chmod(0o755)
 
-            if self.metadata_folder.joinpath("experiment_data.yml").exists():
-                shutil.copy(self.metadata_folder.joinpath("experiment_data.yml"),
-                            self.metadata_folder.joinpath("experiment_data.yml.bak"))
+            if experiment_data_file.exists():
+                shutil.copy(experiment_data_file, self.metadata_folder.joinpath("experiment_data.yml.bak"))
 
+            temporary_file = self.metadata_folder.joinpath("experiment_data.yml.tmp")
             try:
-                with open(self.metadata_folder.joinpath("experiment_data.yml"), 'w') as stream:
+                with open(temporary_file, 'w') as stream:
                     # Not using typ="safe" to preserve the readability of the file
                     YAML().dump(self.experiment_data, stream)
-                self.metadata_folder.joinpath("experiment_data.yml").chmod(0o755)
+                temporary_file.chmod(0o755)
+                os.replace(temporary_file, experiment_data_file)
+                self._saved_data_digest = digest
             except Exception as e:
                 Log.warning(f"Failed to save experiment_data.yml: {str(e)}")
-                if self.metadata_folder.joinpath("experiment_data.yml").exists():
-                    os.remove(self.metadata_folder.joinpath("experiment_data.yml"))
+                for file in [temporary_file, experiment_data_file]:
+                    if file.exists():
+                        os.remove(file)
+                self._saved_data_digest = None
                 self.data_changed = True
                 self.last_experiment_data = {}
 
@@ -2004,10 +2126,28 @@ class AutosubmitConfig(object):
 
     def load_parameters(self):
         """Load all experiment data
+
+        The flattened data is cached until ``data_version`` changes, or ``experiment_data``
+        or ``default_parameters`` are replaced or get new keys. Code that modifies
+        ``experiment_data`` in place must call ``invalidate_parameters``. Each call returns a new
+        dictionary, with copies of the lists and dictionaries, so the cache can't be modified.
+
         :return: a dictionary containing tuples [parameter_name, parameter_value]
         :rtype: dict
         """
-        return self.deep_parameters_export(self.experiment_data, self.default_parameters)
+        key = (self.data_version, id(self.experiment_data), len(self.experiment_data),
+               id(self.default_parameters), len(self.default_parameters))
+        cache = self._parameters_cache
+        if cache is None or cache[0] != key:
+            cache = (key, self.deep_parameters_export(self.experiment_data, self.default_parameters),
+                     self.experiment_data, self.default_parameters)
+            self._parameters_cache = cache
+        return {key: copy.deepcopy(value) if isinstance(value, (list, dict, set)) else value
+                for key, value in cache[1].items()}
+
+    def invalidate_parameters(self) -> None:
+        """Discards the parameters computed from ``experiment_data``, to be called after modifying it in place."""
+        self.data_version += 1
 
     def load_platform_parameters(self):
         """Load parameters from platform config files.
@@ -2532,6 +2672,30 @@ class AutosubmitConfig(object):
         """
         return int(self.get_section(['CONFIG', 'SAFETYSLEEPTIME'], 10))
 
+    def get_min_safetysleeptime(self) -> int:
+        """Returns the minimum sleep time between the checks of the jobs from autosubmit's config file.
+
+        :return: minimum sleep time, by default the safety sleep time
+        :rtype: int
+        """
+        return int(self.get_section(['CONFIG', 'MIN_SAFETYSLEEPTIME'], self.get_safetysleeptime()))
+
+    def get_max_safetysleeptime(self) -> int:
+        """Returns the maximum sleep time between the checks of the jobs from autosubmit's config file.
+
+        :return: maximum sleep time, by default the safety sleep time
+        :rtype: int
+        """
+        return int(self.get_section(['CONFIG', 'MAX_SAFETYSLEEPTIME'], self.get_safetysleeptime()))
+
+    def get_platform_check_timeout(self) -> int:
+        """Returns the seconds to wait for the concurrent check of the platforms from autosubmit's config file.
+
+        :return: timeout, 0 to check the platforms one after another
+        :rtype: int
+        """
+        return int(self.get_section(['CONFIG', 'PLATFORM_CHECK_TIMEOUT'], 0))
+
     def get_retrials(self):
         """Returns max number of retrials for job from autosubmit's config file.
 
@@ -2791,7 +2955,7 @@ class AutosubmitConfig(object):
 
     def is_valid_storage_type(self) -> bool:
         storage_type = self.get_storage_type()
-        return storage_type in ['pkl', 'db']
+        return storage_type in ['pkl', 'db', 'journal']
 
     def is_valid_jobs_in_wrapper(self, wrapper=None) -> bool:
         if wrapper is None:
@@ -0,0 +1,140 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Backup and restore of SQLite databases with the online backup API of SQLite."""
+
+import os
+import sqlite3
+from contextlib import closing, suppress
+from pathlib import Path
+from typing import List, Union
+
+# Pages copied in each step of a backup. The source database is not locked between steps.
+BACKUP_PAGES = 1024
+# Seconds to wait between the steps of a backup
+BACKUP_SLEEP = 0.0
+# Seconds to wait for a lock held by another connection
+TIMEOUT = 60
+# Minimum seconds between the backups taken after each iteration of a running experiment
+BACKUP_INTERVAL = 600
+
+
+def check_integrity(database_path: Union[str, os.PathLike], quick: bool = False) -> List[str]:
+    """
+    Checks the integrity of a database.
+
+    :param database_path: Path of the database.
+    :param quick: Run ``PRAGMA quick_check``, which does not check that the indexes match their tables.
+    :return: Problems found, empty if the database is correct.
+    """
+    if not os.path.isfile(database_path):
+        return [f"{database_path} does not exist"]
+    try:
+        with closing(sqlite3.connect(f"{Path(database_path).absolute().as_uri()}?mode=ro", uri=True,
+                                     timeout=TIMEOUT)) as conn:
+            pragma = "quick_check" if quick else "integrity_check"
+            problems = [row[0] for row in conn.execute(f"PRAGMA {pragma}").fetchall()]
+    except sqlite3.DatabaseError as e:
+        return [str(e)]
+    return [] if problems == ["ok"] else problems
+
+
+def _copy(source_path: str, target_path: str, pages: int, sleep: float) -> None:
+    """
+    Copies a database to a new file next to the target, checks it, and replaces the target with it.
+    The copy is checked with ``quick_check``: the backup API copies whole pages, so the pages are
+    what could be damaged, and a full ``integrity_check`` is much slower on large databases.
+
+    :raises sqlite3.DatabaseError: If the copy is not correct. The target is not modified.
+    """
+    temporary_path = f"{target_path}.tmp"
+    with suppress(FileNotFoundError):
+        os.remove(temporary_path)
+    try:
+        with closing(sqlite3.connect(source_path, timeout=TIMEOUT)) as source, \
+                closing(sqlite3.connect(temporary_path, timeout=TIMEOUT)) as target:
+            source.backup(target, pages=pages, sleep=sleep)
+            # A single file, without WAL, that can be moved
+            target.execute("PRAGMA journal_mode=DELETE").fetchall()
+        problems = check_integrity(temporary_path, quick=True)
+        if problems:
+            raise sqlite3.DatabaseError(f"The copy of {source_path} is not correct: {'; '.join(problems[:10])}")
+        os.replace(temporary_path, target_path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(temporary_path)
+
+
+def backup_database(database_path: Union[str, os.PathLike], backup_path: Union[str, os.PathLike],
+                    pages: int = BACKUP_PAGES, sleep: float = BACKUP_SLEEP) -> None:
+    """
+    Backs up a database while it is in use. The pages are copied a few at a time, so other
+    connections can write between the steps, and the copy is checked before replacing the
+    previous backup.
+
+    :param database_path: Path of the database.
+    :param backup_path: Path of the backup, replaced only if the new backup is correct.
+    :param pages: Pages copied in each step, all of them in one step if 0 or less.
+    :param sleep: Seconds to wait between the steps.
+    :raises sqlite3.DatabaseError: If the database can't be read, or the backup is not correct.
+    """
+    database_path = os.fspath(database_path)
+    if not os.path.isfile(database_path):
+        raise sqlite3.DatabaseError(f"{database_path} does not exist")
+    _copy(database_path, os.fspath(backup_path), pages, sleep)
+
+
+def restore_database(backup_path: Union[str, os.PathLike], database_path: Union[str, os.PathLike]) -> None:
+    """
+    Restores a database from its backup. The backup is checked first, and the database is
+    replaced at once, so it is never left half restored.
+
+    :param backup_path: Path of the backup.
+    :param database_path: Path of the database, replaced by the backup.
+    :raises sqlite3.DatabaseError: If the backup is not correct.
+    """
+    backup_path = os.fspath(backup_path)
+    database_path = os.fspath(database_path)
+    problems = check_integrity(backup_path)
+    if problems:
+        raise sqlite3.DatabaseError(f"The backup {backup_path} is not correct: {'; '.join(problems[:10])}")
+    # The WAL files of the previous database do not belong to the restored one, SQLite would apply them
+    for suffix in ("-wal", "-shm"):
+        with suppress(FileNotFoundError):
+            os.remove(f"{database_path}{suffix}")
+    _copy(backup_path, database_path, pages=-1, sleep=0)
+
+
+def restore_database_from_dump(dump_path: Union[str, os.PathLike], database_path: Union[str, os.PathLike]) -> None:
+    """
+    Restores a database from a SQL dump, e.g. written by ``sqlite3 <database> .dump``.
+
+    :param dump_path: Path of the SQL dump.
+    :param database_path: Path of the database, replaced by the restored one.
+    :raises sqlite3.DatabaseError: If the dump can't be executed, or the restored database is not correct.
+    """
+    database_path = os.fspath(database_path)
+    temporary_path = f"{database_path}.dump.tmp"
+    with suppress(FileNotFoundError):
+        os.remove(temporary_path)
+    try:
+        with open(dump_path, "r", errors="replace") as dump, closing(sqlite3.connect(temporary_path)) as conn:
+            conn.executescript(dump.read())
+        restore_database(temporary_path, database_path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(temporary_path)
@@ -21,6 +21,8 @@ import sqlite3
 import os
 from typing import Any, Dict, Iterable, List, Protocol, Union, cast
 
+from autosubmit.database.db_backup import backup_database, restore_database
+
 class DbManager(object):
     """
     Class to manage an SQLite database.
@@ -34,10 +36,25 @@ class DbManager(object):
         self.connection = sqlite3.connect(self._get_db_filepath())
         if is_new:
             self._initialize_database()
+
     def backup(self):
-        pass
+        """
+        Backs up the database next to it, while it stays available to other connections.
+
+        """
+        self.connection.commit()
+        backup_database(self._get_db_filepath(), self._get_backup_filepath())
+
     def restore(self):
-        pass
+        """
+        Restores the database from its backup, and reconnects to it.
+
+        """
+        self.connection.close()
+        try:
+            restore_database(self._get_backup_filepath(), self._get_db_filepath())
+        finally:
+            self.connection = sqlite3.connect(self._get_db_filepath())
 
     def disconnect(self):
         """
@@ -94,6 +111,42 @@ class DbManager(object):
         cursor.executemany(insert_many_command, data)
         self.connection.commit()
 
+    def create_index(self, table_name: str, index_name: str, columns: List[str], unique: bool = False):
+        """
+        Creates an index on the given columns of a table, if it does not exist
+        :param table_name: str
+        :param index_name: str
+        :param columns: [str]
+        :param unique: bool
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(self.generate_create_index_command(table_name, index_name, columns, unique))
+        self.connection.commit()
+
+    def sync_rows(self, table_name: str, columns: List[str], key_column: str, inserted: List[tuple],
+                  updated: List[tuple], deleted: List[Any]):
+        """
+        Inserts, updates and deletes rows of the given table in a single transaction.
+        Rows are matched by ``key_column``, which should be indexed.
+        :param table_name: str
+        :param columns: [str] all the columns of the table, in order
+        :param key_column: str
+        :param inserted: [()] new rows, with a value for every column
+        :param updated: [()] changed rows, with a value for every column
+        :param deleted: [] key values of the rows to delete
+        """
+        with self.connection:
+            cursor = self.connection.cursor()
+            if inserted:
+                cursor.executemany(self.generate_insert_many_command(table_name, len(columns)), inserted)
+            if updated:
+                key_position = columns.index(key_column)
+                cursor.executemany(self.generate_update_command(table_name, columns, key_column),
+                                   [row + (row[key_position],) for row in updated])
+            if deleted:
+                cursor.executemany(f'DELETE FROM {table_name} WHERE {key_column} = ?',
+                                   [(key,) for key in deleted])
+
     def delete_where(self, table_name: str, where: list[str]):
         """
         Deletes the rows of the given table that matches the given where conditions
@@ -161,6 +214,14 @@ class DbManager(object):
         """
         return os.path.join(self.root_path, self.db_name) + '.db'
 
+    def _get_backup_filepath(self) -> str:
+        """
+        Returns the path of the backup of the .db file
+        :return path: str
+
+        """
+        return os.path.join(self.root_path, self.db_name) + '_backup.db'
+
     def _initialize_database(self):
         """
         Initialize the database with an option's table
@@ -225,6 +286,18 @@ class DbManager(object):
         insert_command += ')'
         return insert_command
 
+    @staticmethod
+    def generate_update_command(table_name: str, columns: List[str], key_column: str) -> str:
+        update_command = 'UPDATE ' + table_name + ' SET ' + ', '.join(column + ' = ?' for column in columns)
+        update_command += ' WHERE ' + key_column + ' = ?'
+        return update_command
+
+    @staticmethod
+    def generate_create_index_command(table_name: str, index_name: str, columns: List[str], unique: bool) -> str:
+        create_command = 'CREATE UNIQUE INDEX' if unique else 'CREATE INDEX'
+        create_command += ' IF NOT EXISTS ' + index_name + ' ON ' + table_name + ' (' + ', '.join(columns) + ')'
+        return create_command
+
     @staticmethod
     def generate_count_command(table_name: str) -> str:
         count_command = 'SELECT count(*) FROM ' + table_name
@@ -261,6 +334,9 @@ class DatabaseManager(Protocol):
     def drop_table(self, table_name: str): ...
     def insert(self, table_name: str, columns: List[str], values: List[str]): ...
     def insertMany(self, table_name: str, data: List[Union[Iterable, Dict]]): ...
+    def create_index(self, table_name: str, index_name: str, columns: List[str], unique: bool = False): ...
+    def sync_rows(self, table_name: str, columns: List[str], key_column: str, inserted: List[tuple],
+                  updated: List[tuple], deleted: List[Any]): ...
     def delete_where(self, table_name: str, where: List[str]): ...
     def select_first(self, table_name: str) -> List[Any]: ...
     def select_first_where(self, table_name: str, where: List[str]) -> List[Any]: ...
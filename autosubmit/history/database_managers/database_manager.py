@@ -15,10 +15,13 @@
 # You should have received a copy of the GNU General Public License
 # along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
 
+import atexit
 import os
 import sqlite3
 import traceback
 from abc import ABCMeta
+from contextlib import contextmanager
+from threading import Lock, RLock
 
 import autosubmit.history.database_managers.database_models as Models
 import autosubmit.history.utils as HUtils
@@ -29,6 +32,141 @@ DEFAULT_HISTORICAL_LOGS_DIR = os.path.join('/esarchive', 'autosubmit', 'as_metad
 DEFAULT_LOCAL_ROOT_DIR = os.path.join('/esarchive', 'autosubmit')
 
 
+class _PooledConnection(object):
+    """ A connection of the pool, with the lock that serializes its use and the file it was opened on. """
+
+    def __init__(self, connection, identity):
+        # type : (sqlite3.Connection, Tuple[int, int]) -> None
+        self.connection = connection
+        self.identity = identity
+        self.lock = RLock()
+
+
+class ConnectionPool(object):
+    """
+    Keeps one connection open per database file and process, shared by its threads.
+
+    Opening a connection, and reading the schema again, costs more than most of the statements
+    run on the history databases, which are written several times per job. The connections are
+    opened in WAL mode, so readers do not block the writer, e.g. the main process and the log
+    recovery process. A connection is opened again if its file was removed or replaced, and the
+    connections inherited from a parent process are not used.
+    """
+
+    # Seconds to wait for a lock held by another connection
+    TIMEOUT = 60
+    PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        # Durable at each checkpoint instead of each transaction, which is enough in WAL mode
+        "PRAGMA synchronous=NORMAL",
+        # 8 MiB of page cache
+        "PRAGMA cache_size=-8192",
+        "PRAGMA mmap_size=67108864",
+    ]
+
+    def __init__(self):
+        self._connections = dict()  # type: Dict[str, _PooledConnection]
+        self._lock = Lock()
+        # Connections of the parent process, kept so they are not closed by the garbage collector
+        self._inherited = []  # type: List[_PooledConnection]
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forget_parent_connections)
+
+    def _forget_parent_connections(self):
+        # type : () -> None
+        self._inherited.extend(self._connections.values())
+        self._connections = dict()
+        self._lock = Lock()
+
+    @staticmethod
+    def _identity(path):
+        # type : (str) -> Optional[Tuple[int, int]]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _open(self, path):
+        # type : (str) -> sqlite3.Connection
+        connection = sqlite3.connect(path, timeout=self.TIMEOUT, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            try:
+                connection.execute(pragma).fetchall()
+            except sqlite3.DatabaseError as exp:
+                Log.debug(f"Could not set {pragma} on {path}: {str(exp)}")
+        return connection
+
+    def _get(self, path, create_file):
+        # type : (str, Callable[[str], None]) -> _PooledConnection
+        path = os.path.realpath(path)
+        with self._lock:
+            pooled = self._connections.get(path)
+            identity = self._identity(path)
+            if pooled is not None and pooled.identity != identity:
+                del self._connections[path]
+                self._close(pooled)
+                pooled = None
+            if pooled is None:
+                if identity is None:
+                    create_file(path)
+                connection = self._open(path)
+                pooled = _PooledConnection(connection, self._identity(path))
+                self._connections[path] = pooled
+            return pooled
+
+    @contextmanager
+    def connection(self, path, create_file):
+        # type : (str, Callable[[str], None]) -> Iterator[sqlite3.Connection]
+        """
+        Lends the connection of a database file to one thread at a time. The transaction is
+        committed at the end, or rolled back if an exception is raised.
+
+        :param path: Database file.
+        :param create_file: Creates the database file when it does not exist.
+        """
+        pooled = self._get(path, create_file)
+        with pooled.lock:
+            try:
+                yield pooled.connection
+                pooled.connection.commit()
+            except BaseException:
+                pooled.connection.rollback()
+                raise
+
+    @staticmethod
+    def _close(pooled, checkpoint=False):
+        # type : (_PooledConnection, bool) -> None
+        with pooled.lock:
+            try:
+                if checkpoint:
+                    pooled.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+                pooled.connection.close()
+            except sqlite3.Error as exp:
+                Log.debug(f"Error closing a database connection: {str(exp)}")
+
+    def close(self, path=None):
+        # type : (Optional[str]) -> None
+        """
+        Writes the changes in the WAL file to the database file, and closes the connections.
+
+        :param path: Database file whose connection is closed, all of them if None.
+        """
+        with self._lock:
+            if path is None:
+                pooled_connections = list(self._connections.values())
+                self._connections = dict()
+            else:
+                pooled = self._connections.pop(os.path.realpath(path), None)
+                pooled_connections = [pooled] if pooled is not None else []
+        for pooled in pooled_connections:
+            self._close(pooled, checkpoint=True)
+
+
+connection_pool = ConnectionPool()
+atexit.register(connection_pool.close)
+
+
 class DatabaseManager(metaclass=ABCMeta):
     """ Simple database manager. Needs expid. """
     AS_TIMES_DB_NAME = "as_times.db"  # default AS_TIMES location
@@ -54,35 +192,26 @@ class DatabaseManager(metaclass=ABCMeta):
         # type : (str) -> None
         """ creates a database files with full permissions """
         os.umask(0)
-        os.open(path, os.O_WRONLY | os.O_CREAT, 0o776)
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o776))
 
 
     def execute_statement_on_dbfile(self, path, statement):
         # type : (str, str) -> None
         """ Executes a statement on a database file specified by path. """
-        conn = self.get_connection(path)
-        cursor = conn.cursor()
-        cursor.execute(statement)
-        conn.commit()
-        conn.close()
+        with connection_pool.connection(path, self._create_database_file) as conn:
+            conn.execute(statement)
 
     def execute_statement_with_arguments_on_dbfile(self, path, statement, arguments):
         # type : (str, str, Tuple) -> None
         """ Executes a statement with arguments on a database file specified by path. """
-        conn = self.get_connection(path)
-        cursor = conn.cursor()
-        cursor.execute(statement, arguments)
-        conn.commit()
-        conn.close()
+        with connection_pool.connection(path, self._create_database_file) as conn:
+            conn.execute(statement, arguments)
 
     def execute_many_statement_with_arguments_on_dbfile(self, path, statement, arguments_list):
         # type : (str, str, List[Tuple]) -> None
         """ Executes many statements from a list of arguments specified by a path. """
-        conn = self.get_connection(path)
-        cursor = conn.cursor()
-        cursor.executemany(statement, arguments_list)
-        conn.commit()
-        conn.close()
+        with connection_pool.connection(path, self._create_database_file) as conn:
+            conn.executemany(statement, arguments_list)
 
     def execute_many_statements_on_dbfile(self, path, statements):
         # type : (str, List[str]) -> None
@@ -101,36 +230,20 @@ class DatabaseManager(metaclass=ABCMeta):
     def get_from_statement(self, path, statement):
         # type : (str, str) -> List[Tuple]
         """ Get the rows from a statement with no arguments """
-        conn = self.get_connection(path)
-        conn.text_factory = str
-        cursor = conn.cursor()
-        cursor.execute(statement)
-        statement_rows = cursor.fetchall()
-        conn.close()
-        return statement_rows
+        with connection_pool.connection(path, self._create_database_file) as conn:
+            return conn.execute(statement).fetchall()
 
     def get_from_statement_with_arguments(self, path, statement, arguments):
         # type : (str, str, Tuple) -> List[Tuple]
         """ Get the rows from a statement with arguments """
-        conn = self.get_connection(path)
-        conn.text_factory = str
-        cursor = conn.cursor()
-        cursor.execute(statement, arguments)
-        statement_rows = cursor.fetchall()
-        conn.close()
-        return statement_rows
+        with connection_pool.connection(path, self._create_database_file) as conn:
+            return conn.execute(statement, arguments).fetchall()
 
     def insert_statement_with_arguments(self, path, statement, arguments):
         # type : (str, str, Tuple) -> int
         """ Insert statement with arguments into path """
-        conn = self.get_connection(path)
-        conn.text_factory = str
-        cursor = conn.cursor()
-        cursor.execute(statement, arguments)
-        lastrow_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return lastrow_id
+        with connection_pool.connection(path, self._create_database_file) as conn:
+            return conn.execute(statement, arguments).lastrowid
 
     def get_built_select_statement(self, table_name, conditions=None):
         # type : (str, namedtuple, str) -> str
@@ -24,11 +24,12 @@ import re
 import textwrap
 import time
 from collections import OrderedDict
+from contextlib import suppress
 from functools import reduce
 from pathlib import Path
 from threading import Thread
 from time import sleep
-from typing import List, Optional, Tuple, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from bscearth.utils.date import date2str, parse_date, previous_day, chunk_end_date, chunk_start_date, Log, subs_dates
 
@@ -40,6 +41,8 @@ from autosubmit.job import job_utils
 from autosubmit.job.job_common import StatisticsSnippetBash, StatisticsSnippetPython
 from autosubmit.job.job_common import StatisticsSnippetR, StatisticsSnippetEmpty
 from autosubmit.job.job_common import Status, Type, increase_wallclock_by_chunk
+from autosubmit.job.job_parameters import get_section_parameters
+from autosubmit.job.job_template import ScriptFile, TemplateContent, template_cache, write_scripts
 from autosubmit.job.job_utils import get_job_package_code, get_split_size_unit, get_split_size
 from autosubmit.job.metrics_processor import UserMetricProcessor
 from autosubmit.log.log import Log, AutosubmitCritical
@@ -53,7 +56,32 @@ Log.get_logger("Autosubmit")
 
 # A wrapper for encapsulate threads , TODO: Python 3+ to be replaced by the < from concurrent.futures >
 
-EXCLUDED = ["_platform", "_children", "_parents", "submitter"]
+EXCLUDED = ["_platform", "_children", "_parents", "submitter", "_status_index", "_lazy_state"]
+
+# Attributes that are not read from the persistence until they are accessed, when a job list is loaded lazily
+LAZY_ATTRIBUTES = (
+    "edge_info", "parameters", "_local_logs", "_remote_logs", "script_name", "stat_file", "file",
+    "additional_files", "ext_header_path", "ext_tailer_path", "undefined_variables", "_script"
+)
+
+
+class LazyJobState(dict):
+    """
+    Stored state of a job without the ``LAZY_ATTRIBUTES``.
+
+    A ``Job`` created from it leaves these attributes unset, and calls ``loader`` with the job
+    name to get them the first time any of them is accessed.
+    """
+
+    def __init__(self, stub: dict, loader: Optional[Callable[[str], dict]] = None):
+        super().__init__(stub)
+        self.loader = loader
+
+    def deferred_state(self) -> dict:
+        """Returns the stored values of the deferred attributes, or an empty dict if there is no loader."""
+        if self.loader is None:
+            return {}
+        return {key: value for key, value in self.loader(self['_name']).items() if key in LAZY_ATTRIBUTES}
 
 
 def threaded(fn):
@@ -162,13 +190,43 @@ class Job(object):
         'ec_queue', 'platform_name', '_serial_platform',
         'submitter', '_shape', '_x11', '_x11_options', '_hyperthreading',
         '_scratch_free_space', '_delay_retrials', '_custom_directives',
-        '_log_recovered', 'packed_during_building', 'workflow_commit'
+        '_log_recovered', 'packed_during_building', 'workflow_commit', '_status_index',
+        '_lazy_state'
     )
 
     def __setstate__(self, state):
         for slot, value in state.items():
             if slot in self.__slots__:
                 setattr(self, slot, value)
+        if isinstance(state, LazyJobState):
+            # Keeps the defaults in case the loader does not know the job, and unsets the
+            # deferred attributes so accessing them goes through ``__getattr__``
+            deferred = [attribute for attribute in LAZY_ATTRIBUTES if attribute not in state]
+            defaults = {attribute: getattr(self, attribute, None) for attribute in deferred}
+            for attribute in deferred:
+                with suppress(AttributeError):
+                    delattr(self, attribute)
+            self._lazy_state = (state, defaults)
+
+    def __getattr__(self, name):
+        # Only called when the attribute is not set, i.e. it was deferred by a lazy load
+        if name in LAZY_ATTRIBUTES and getattr(self, '_lazy_state', None) is not None:
+            self._hydrate()
+            return getattr(self, name)
+        # Repeats the lookup to raise the original error, e.g. the one raised inside a property
+        return object.__getattribute__(self, name)
+
+    def _hydrate(self) -> None:
+        """Sets the attributes deferred by a lazy load, unless they were assigned since then."""
+        state, defaults = self._lazy_state
+        self._lazy_state = None
+        values = dict(defaults)
+        values.update(state.deferred_state())
+        for attribute, value in values.items():
+            try:
+                object.__getattribute__(self, attribute)
+            except AttributeError:
+                setattr(self, attribute, value)
 
     def __getstate__(self):
         return dict([(k, getattr(self, k, None)) for k in self.__slots__ if k not in EXCLUDED])
@@ -241,6 +299,8 @@ class Job(object):
         self._remote_logs = ('', '')
         self.script_name = self.name + ".cmd"
         self.stat_file = f"{self.script_name[:-4]}_STAT_"
+        self._status_index = None
+        self._lazy_state = None
         self._status = None
         self.status = status
         self.prev_status = status
@@ -807,8 +867,12 @@ class Job(object):
     @status.setter
     def status(self, status):
         """
-        Sets the status of the job
+        Sets the status of the job, keeping the ``JobList`` status index up to date
         """
+        # Jobs restored through ``__setstate__`` or copied don't have the index slot set
+        status_index = getattr(self, '_status_index', None)
+        if status_index is not None and status != self._status:
+            status_index.move(self, self._status, status)
         self._status = status
 
     @property
@@ -1279,6 +1343,42 @@ class Job(object):
                     log_recovered = False
         return log_recovered
 
+    def get_log_and_stat_files(self) -> Dict[str, str]:
+        """
+        Returns the remote log and STAT files of the last run, to be retrieved in bulk by the platform.
+
+        :return: For each file, the path inside the tmp folder where it is retrieved to.
+        :rtype: Dict[str, str]
+        """
+        self.remote_logs = self.get_new_remotelog_name()
+        if not self.remote_logs:
+            return {}
+        log_dir = f"LOG_{self.expid}"
+        return {self.remote_logs[0]: log_dir, self.remote_logs[1]: log_dir, f"{self.stat_file}{self.fail_count}": ""}
+
+    def retrieve_fetched_logfiles(self, missing: Set[str]) -> bool:
+        """
+        Finishes the recovery of the logs of the last run, once its files in ``get_log_and_stat_files``
+        were retrieved by the platform.
+
+        :param missing: Files not found on the platform.
+        :type missing: Set[str]
+        :return: True if the logs were recovered, False if they must be retrieved one by one.
+        :rtype: bool
+        """
+        if not self.remote_logs or self.remote_logs[0] in missing or self.remote_logs[1] in missing:
+            return False
+        fetched_logs = self.remote_logs
+        self.synchronize_logs(self.platform, self.remote_logs, self.local_logs)
+        log_dir = os.path.join(self._tmp_path, f"LOG_{self.expid}")
+        for fetched_log, local_log in zip(fetched_logs, self.local_logs):
+            os.replace(os.path.join(log_dir, fetched_log), os.path.join(log_dir, local_log))
+        self.write_stats(0, stat_fetched=True)
+        Log.result(
+            f"{self.platform.name}(log_recovery) Successfully recovered log for job '{self.name}' and retry '{self.fail_count}'.")
+        self.log_recovered = True
+        return True
+
     def retrieve_internal_retrials_logfiles(self) -> Tuple[int, bool]:
         """
         Retrieves internal retrials log files for the given platform.
@@ -1317,13 +1417,15 @@ class Job(object):
     def update_stat_file(self):
         self.stat_file = f"{self.script_name[:-4]}_STAT_"
 
-    def write_stats(self, last_retrial: int) -> None:
+    def write_stats(self, last_retrial: int, stat_fetched: bool = False) -> None:
         """
         Gathers the stat file, writes statistics into the job_data.db, and updates the total_stat file.
         Considers whether the job is a vertical wrapper and the number of retrials to gather.
 
         :param last_retrial: The last retrial count.
         :type last_retrial: int
+        :param stat_fetched: True if the stat file of the last run was already retrieved.
+        :type stat_fetched: bool
         """
         # Write stats for vertical wrappers
         if self.wrapper_type == "vertical":  # Disable AS retrials for vertical wrappers to use internal ones
@@ -1342,7 +1444,8 @@ class Job(object):
         else:
             # Update local logs without updating the submit time
             self.update_local_logs(update_submit_time=False)
-            self.platform.get_stat_file(self)
+            if not stat_fetched:
+                self.platform.get_stat_file(self)
             self.write_submit_time()
             self.write_start_time(count=self.fail_count)
             self.write_end_time(self.status == Status.COMPLETED, self.fail_count)
@@ -1572,10 +1675,12 @@ class Job(object):
             else:
                 return default_status
 
-    def get_metric_folder(self, as_conf: AutosubmitConfig = None) -> str:
+    def get_metric_folder(self, as_conf: AutosubmitConfig = None, job_name: str = None) -> str:
         """
         Returns the default metric folder for the job.
 
+        :param job_name: Name used for the last component of the folder, by default the one of the job.
+
         :return: The metric folder path.
         :rtype: str
         """
@@ -1594,11 +1699,11 @@ class Job(object):
             Log.printlog(f"Failed to get metric folder from config: {exc}", code=6019)
 
         # Construct the metric folder path by adding the job name
-        metric_folder = base_path.joinpath(self.name)
+        metric_folder = base_path.joinpath(self.name if job_name is None else job_name)
 
         return str(metric_folder)
 
-    def update_current_parameters(self, as_conf: AutosubmitConfig, parameters: dict) -> dict:
+    def update_current_parameters(self, as_conf: AutosubmitConfig, parameters: dict, job_name: str = None) -> dict:
         """
         Update the %CURRENT_*% parameters with the current platform and jobs.
 
@@ -1606,6 +1711,8 @@ class Job(object):
         :type as_conf: AutosubmitConfig
         :param parameters: The dictionary to update with current parameters.
         :type parameters: dict
+        :param job_name: Name used in %CURRENT_METRIC_FOLDER%, by default the one of the job.
+        :type job_name: str
         :return: The updated parameter's dictionary.
         :rtype: dict
         """
@@ -1615,7 +1722,7 @@ class Job(object):
         for key, value in as_conf.jobs_data[self.section].items():
             parameters[f"CURRENT_{key.upper()}"] = value
 
-        parameters["CURRENT_METRIC_FOLDER"] = self.get_metric_folder(as_conf=as_conf)
+        parameters["CURRENT_METRIC_FOLDER"] = self.get_metric_folder(as_conf=as_conf, job_name=job_name)
 
         return parameters
 
@@ -2270,13 +2377,13 @@ class Job(object):
                 self.start_time = datetime.datetime.now()
             # Parameters that affect to all the rest of parameters
             self.update_dict_parameters(as_conf)
-        parameters = as_conf.load_parameters()
-        parameters.update(as_conf.default_parameters)
-        parameters = as_conf.substitute_dynamic_variables(parameters, max_deep=25, in_the_end=True)
-        parameters = self.update_platform_parameters(as_conf, parameters)
-        parameters = self.update_current_parameters(as_conf, parameters)
-        parameters = as_conf.deep_read_loops(parameters)
-        parameters = as_conf.substitute_dynamic_variables(parameters, max_deep=25, in_the_end=True)
+        section_parameters = get_section_parameters(as_conf)
+        if section_parameters is not None:
+            # Sets the platform, if needed, before looking for the parameters of its section and platform
+            self.update_platform_parameters(as_conf, {})
+            parameters = section_parameters.parameters(self, as_conf)
+        else:
+            parameters = self.substitute_section_parameters(as_conf)
         parameters = self.update_job_parameters(as_conf, parameters, set_attributes)
         parameters = self.update_platform_associated_parameters(as_conf, parameters, parameters['CHUNK'], set_attributes)
         parameters = self.update_wrapper_parameters(as_conf, parameters)
@@ -2288,13 +2395,35 @@ class Job(object):
         return parameters
 
 
+    def substitute_section_parameters(self, as_conf: AutosubmitConfig, job_name: str = None) -> dict:
+        """
+        Returns the experiment parameters with the platform and %CURRENT_*% parameters, substituted.
+
+        Apart from the job name in %CURRENT_METRIC_FOLDER%, the result only depends on the section
+        and the platform of the job.
+
+        :param as_conf: The Autosubmit configuration object.
+        :type as_conf: AutosubmitConfig
+        :param job_name: Name used in %CURRENT_METRIC_FOLDER%, by default the one of the job.
+        :type job_name: str
+        :return: The substituted parameters.
+        :rtype: dict
+        """
+        parameters = as_conf.load_parameters()
+        parameters.update(as_conf.default_parameters)
+        parameters = as_conf.substitute_dynamic_variables(parameters, max_deep=25, in_the_end=True)
+        parameters = self.update_platform_parameters(as_conf, parameters)
+        parameters = self.update_current_parameters(as_conf, parameters, job_name)
+        parameters = as_conf.deep_read_loops(parameters)
+        return as_conf.substitute_dynamic_variables(parameters, max_deep=25, in_the_end=True)
+
     def update_content_extra(self,as_conf,files):
         additional_templates = []
         for file in files:
             if as_conf.get_project_type().lower() == "none":
                 template = "%DEFAULT.EXPID%"
             else:
-                template = open(os.path.join(as_conf.get_project_dir(), file), 'r').read()
+                template = template_cache.read(os.path.join(as_conf.get_project_dir(), file))
             additional_templates += [template]
         return additional_templates
 
@@ -2314,7 +2443,7 @@ class Job(object):
         else:
             try:
                 if as_conf.get_project_type().lower() != "none" and len(as_conf.get_project_type()) > 0:
-                    template_file = open(os.path.join(as_conf.get_project_dir(), self.file), 'r')
+                    template_file_content = template_cache.read(os.path.join(as_conf.get_project_dir(), self.file))
                     template = ''
                     if as_conf.get_remote_dependencies() == "true":
                         if self.type == Type.BASH:
@@ -2325,8 +2454,7 @@ class Job(object):
                             template = 'time.sleep(5)' + "\n"
                         elif self.type == Type.R:
                             template = 'Sys.sleep(5)' + "\n"
-                    template += template_file.read()
-                    template_file.close()
+                    template += template_file_content
                 else:
                     if self.type == Type.BASH:
                         template = 'sleep 5'
@@ -2373,12 +2501,13 @@ class Job(object):
 
     def _get_paramiko_template(self, snippet, template, parameters):
         current_platform = self._platform
-        return ''.join([
+        # The header embeds values of the job, the template and the tailer are shared by the section
+        return TemplateContent([
             snippet.as_header(
                 current_platform.get_header(self, parameters), self.executable),
             template,
             snippet.as_tailer()
-        ])
+        ], cached=(False, True, True))
 
     def queuing_reason_cancel(self, reason):
         try:
@@ -2418,80 +2547,60 @@ class Job(object):
         lang = locale.getlocale()[1] or locale.getdefaultlocale()[1] or 'UTF-8'
         parameters = self.update_parameters(as_conf, set_attributes=False)
         template_content, additional_templates = self.update_content(as_conf, parameters)
+        tmp_path = Path(self._tmp_path)
 
+        scripts = []
         for additional_file, additional_template_content in zip(self.additional_files, additional_templates):
-            processed_content = self._substitute_placeholders(additional_template_content, parameters, as_conf)
-            self._write_additional_file(additional_file, processed_content, lang)
+            additional_path = tmp_path / self.construct_real_additional_file_name(additional_file)
+            scripts.append(self._get_script_file(str(additional_path), additional_template_content, parameters,
+                                                 as_conf, lang))
 
-        template_content = self._substitute_placeholders(
-            template_content, parameters, as_conf, self.undefined_variables
-        )
         script_name = f'{self.name}.cmd'
         self.script_name = script_name
-        script_path = Path(self._tmp_path) / script_name
-        with open(script_path, 'wb') as f:
-            f.write(template_content.encode(lang))
-        Path(script_path).chmod(0o755)
+        scripts.append(self._get_script_file(str(tmp_path / script_name), template_content, parameters, as_conf,
+                                             lang, self.undefined_variables, executable=True))
+        write_scripts(scripts)
         return script_name
 
-    def _substitute_placeholders(
+    def _get_script_file(
             self,
+            path: str,
             content: str,
             parameters: dict,
             as_conf: AutosubmitConfig,
-            undefined_variables: list[str] = None
-    ) -> str:
+            lang: str,
+            undefined_variables: list[str] = None,
+            executable: bool = False
+    ) -> ScriptFile:
         """
-        Replace placeholders in the template content.
+        Prepare a script file whose placeholders are substituted when it is written.
 
+        :param path: Path of the file.
+        :type path: str
         :param content: Template content with placeholders.
         :type content: str
         :param parameters: Dictionary of parameters for substitution.
         :type parameters: dict
         :param as_conf: Autosubmit configuration object.
         :type as_conf: AutosubmitConfig
+        :param lang: Encoding language.
+        :type lang: str
         :param undefined_variables: List of undefined variable names to remove.
         :type undefined_variables: list[str], optional
-        :return: Content with placeholders substituted.
-        :rtype: str
+        :param executable: Whether the file must be executable.
+        :type executable: bool
+        :return: Script file to write.
+        :rtype: ScriptFile
         """
         # TODO quick fix for 4.1.15 release, to see why it is needed
         if as_conf.dynamic_variables:
             parameters = as_conf.substitute_dynamic_variables(parameters, max_deep=25, in_the_end=True)
+        return ScriptFile.build(path, content, parameters, self._get_skipped_placeholders(as_conf),
+                                undefined_variables, lang, executable)
 
-        placeholders = re.findall(r'%(?<!%%)[a-zA-Z0-9_.-]+%(?!%%)', content, flags=re.IGNORECASE)
-        for placeholder in placeholders:
-            if placeholder in as_conf.default_parameters.values():
-                continue
-            key = placeholder[1:-1]
-            value = str(parameters.get(key.upper(), ""))
-            if not value:
-                content = re.sub(r'%(?<!%%)' + key + r'%(?!%%)', '', content, flags=re.I)
-            else:
-                if "\\" in value:
-                    value = re.escape(value)
-                content = re.sub(r'%(?<!%%)' + key + r'%(?!%%)', value, content, flags=re.I)
-        if undefined_variables:
-            for variable in undefined_variables:
-                content = re.sub(r'%(?<!%%)' + variable + r'%(?!%%)', '', content, flags=re.I)
-        return content.replace("%%", "%")
-
-    def _write_additional_file(self, additional_file: str, content: str, lang: str) -> None:
-        """
-        Write additional file with processed content.
-
-        :param additional_file: Path to the additional file.
-        :type additional_file: str
-        :param content: Content to write.
-        :type content: str
-        :param lang: Encoding language.
-        :type lang: str
-        :return: None
-        """
-        tmp_path = Path(self._tmp_path)
-        full_path = tmp_path.joinpath(self.construct_real_additional_file_name(additional_file))
-        with full_path.open('wb') as f:
-            f.write(content.encode(lang))
+    @staticmethod
+    def _get_skipped_placeholders(as_conf: AutosubmitConfig) -> frozenset:
+        return frozenset(value for value in as_conf.default_parameters.values() if isinstance(value, str))
 
     def construct_real_additional_file_name(self, file_name: str) -> str:
         """
@@ -2946,10 +3055,7 @@ class WrapperJob(Job):
         """
         reason = str()
         if self._platform.type == 'slurm':
-            self._platform.send_command(
-                self._platform.get_queue_status_cmd(self.id))
-            reason = self._platform.parse_queue_reason(
-                self._platform._ssh_output, self.id)
+            reason = self._platform.get_queue_reason(self.id)
             if self._queuing_reason_cancel(reason):
                 Log.printlog("Job {0} will be cancelled and set to FAILED as it was queuing due to {1}".format(
                     self.name, reason), 6009)
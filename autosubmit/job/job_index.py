@@ -0,0 +1,177 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Status index used by ``JobList`` to avoid scanning every job in its getters."""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from autosubmit.job.job import Job
+
+
+class JobStatusIndex(object):
+    """
+    Keeps the jobs of a ``JobList`` bucketed by status.
+
+    Each indexed job holds a reference to the index, and the ``Job.status`` setter
+    calls ``move`` so the buckets stay up to date as the workflow runs.
+
+    ``JobList`` invalidates the index in every method that replaces, reorders or
+    removes jobs from its list, and so must any other code that does it. As the
+    list is a plain ``list`` that is also filled in place (e.g. in the tests), the
+    index also remembers which list object it was built from, its length and its
+    first and last jobs, and is rebuilt before being read if any of them changed.
+    That does not see a job replaced in the middle of the list, or a sort that
+    keeps both ends, which is why the explicit invalidation is needed.
+
+    It also records which jobs changed status, so ``JobList.update_list`` can
+    re-evaluate only the jobs affected by those changes, and the journal persistence
+    can save only those jobs.
+    """
+
+    def __init__(self):
+        self._source: Optional[list] = None
+        self._source_token = None
+        self._buckets: Dict[Any, Dict['Job', None]] = dict()
+        self._positions: Dict['Job', int] = dict()
+        self._changed: Set['Job'] = set()
+        self._full_pass_needed = True
+        # Jobs changed since the previous save, None if they are unknown
+        self._unsaved: Optional[Dict['Job', None]] = None
+
+    def invalidate(self) -> None:
+        """Forces a rebuild the next time the index is read."""
+        self._source = None
+
+    @staticmethod
+    def _token(job_list: list) -> tuple:
+        if not job_list:
+            return 0, None, None
+        return len(job_list), id(job_list[0]), id(job_list[-1])
+
+    def is_valid(self, job_list: list) -> bool:
+        return self._source is job_list and self._source_token == self._token(job_list)
+
+    def rebuild(self, job_list: list) -> None:
+        """
+        Builds the buckets from scratch and attaches the index to every job in the list.
+
+        :param job_list: List of jobs to index.
+        :type job_list: list
+        """
+        for job in self._positions:
+            if getattr(job, '_status_index', None) is self:
+                job._status_index = None
+        self._buckets = dict()
+        self._positions = dict()
+        for position, job in enumerate(job_list):
+            previous_index = getattr(job, '_status_index', None)
+            if previous_index is not None and previous_index is not self:
+                # A job can only report to one index, the other one has to rebuild itself.
+                previous_index.invalidate()
+            job._status_index = self
+            self._positions[job] = position
+            self._buckets.setdefault(job.status, dict())[job] = None
+        self._source = job_list
+        self._source_token = self._token(job_list)
+        # Changes done while the index was not valid are lost
+        self._changed = set()
+        self._full_pass_needed = True
+        self._unsaved = None
+
+    def move(self, job: 'Job', old_status: Any, new_status: Any) -> None:
+        """
+        Moves a job between buckets. Called by ``Job.status`` setter.
+
+        :param job: Job whose status changed.
+        :param old_status: Previous status.
+        :param new_status: New status.
+        """
+        if job not in self._positions:
+            return
+        bucket = self._buckets.get(old_status)
+        if bucket is not None:
+            bucket.pop(job, None)
+        self._buckets.setdefault(new_status, dict())[job] = None
+        self._changed.add(job)
+        if self._unsaved is not None:
+            self._unsaved[job] = None
+
+    def get(self, job_list: list, statuses: Iterable[Any]) -> List['Job']:
+        """
+        Returns the jobs with any of the given statuses, in the same order as in the job list.
+
+        :param job_list: List of jobs the index refers to, rebuilt if it changed.
+        :param statuses: Statuses to retrieve.
+        :return: Jobs with those statuses.
+        """
+        if not self.is_valid(job_list):
+            self.rebuild(job_list)
+        jobs = []
+        for status in statuses:
+            jobs.extend(self._buckets.get(status, ()))
+        jobs.sort(key=self._positions.__getitem__)
+        return jobs
+
+    def order(self, job_list: list, jobs: Iterable['Job']) -> List['Job']:
+        """
+        Returns the given jobs that belong to the job list, in the same order as in the job list.
+
+        :param job_list: List of jobs the index refers to, rebuilt if it changed.
+        :param jobs: Jobs to sort.
+        :return: Sorted jobs.
+        """
+        if not self.is_valid(job_list):
+            self.rebuild(job_list)
+        return sorted((job for job in jobs if job in self._positions), key=self._positions.__getitem__)
+
+    def mark_changed(self, jobs: Iterable['Job']) -> None:
+        """Records jobs to be re-evaluated even if their status did not change."""
+        self._changed.update(job for job in jobs if job in self._positions)
+
+    def take_changed(self, job_list: list) -> Optional[Set['Job']]:
+        """
+        Returns the jobs that changed status since the previous call and starts tracking again.
+
+        :param job_list: List of jobs the index refers to, rebuilt if it changed.
+        :return: Changed jobs, or None if they are unknown and every job must be re-evaluated.
+        """
+        if not self.is_valid(job_list):
+            self.rebuild(job_list)
+        changed = None if self._full_pass_needed else self._changed
+        self._changed = set()
+        self._full_pass_needed = False
+        return changed
+
+    def mark_unsaved(self, jobs: Iterable['Job']) -> None:
+        """Records jobs to be saved even if their status did not change."""
+        if self._unsaved is not None:
+            self._unsaved.update((job, None) for job in jobs if job in self._positions)
+
+    def take_unsaved(self, job_list: list) -> Optional[List['Job']]:
+        """
+        Returns the jobs that changed since the previous call and starts tracking again.
+        Tracked separately from ``take_changed``, for the persistence of the job list.
+
+        :param job_list: List of jobs the index refers to, rebuilt if it changed.
+        :return: Changed jobs, or None if they are unknown and every job must be saved.
+        """
+        if not self.is_valid(job_list):
+            self.rebuild(job_list)
+        unsaved = None if self._unsaved is None else list(self._unsaved)
+        self._unsaved = dict()
+        return unsaved
@@ -37,6 +37,8 @@ from autosubmit.helpers.data_transfer import JobRow
 from autosubmit.job.job import Job
 from autosubmit.job.job_common import Status, bcolors
 from autosubmit.job.job_dict import DicJobs
+from autosubmit.job.job_index import JobStatusIndex
+from autosubmit.job.job_list_persistence import JobListPersistenceJournal, JobListPersistencePkl
 from autosubmit.job.job_package_persistence import JobPackagePersistence
 from autosubmit.job.job_packages import JobPackageThread
 from autosubmit.job.job_utils import Dependency, _get_submitter
@@ -57,6 +59,7 @@ class JobList(object):
         self._persistence_file = "job_list_" + expid
         self._job_list = list()
         self._base_job_list = list()
+        self._status_index = JobStatusIndex()
         self.jobs_edges = {}
         self._expid = expid
         self._config = config
@@ -112,6 +115,7 @@ class JobList(object):
                 if job.member is not None and len(str(job.member)) > 0:
                     found_member = True
             self._job_list = processed_job_list
+            self._status_index.invalidate()
 
     def create_dictionary(self, date_list, member_list, num_chunks, chunk_ini,
                           date_format, default_retrials, wrapper_jobs, as_conf):
@@ -136,6 +140,7 @@ class JobList(object):
                         "true".casefold()):
                     self._job_list.remove(job)
                     self.graph.remove_node(job.name)
+        self._status_index.invalidate()
 
     @staticmethod
     def check_split_set_to_auto(as_conf):
@@ -147,9 +152,12 @@ class JobList(object):
 
     def generate(self, as_conf, date_list, member_list, num_chunks, chunk_ini, parameters,
                  date_format, default_retrials, default_job_type, wrapper_jobs=dict(), new=True,
-                 run_only_members=[], show_log=True, monitor=False, force=False, create=False):
+                 run_only_members=[], show_log=True, monitor=False, force=False, create=False, lazy=False):
         """
         Creates all jobs needed for the current workflow.
+        :param lazy: if True, the attributes of the loaded jobs in ``LAZY_ATTRIBUTES`` are only read from the
+            persistence when accessed. Meant for commands that only look at the status of the workflow.
+        :type lazy: bool
         :param create:
         :type create: bool
         :param force:
@@ -187,12 +195,7 @@ class JobList(object):
             force = True
         if force:
             Log.debug("Resetting the workflow graph to a zero state")
-            persistence_pkl_path = Path(self._persistence_path, self._persistence_file + ".pkl")
-            if persistence_pkl_path.exists():
-                persistence_pkl_path.unlink()
-            persistence_pkl_path = Path(self._persistence_path, self._persistence_file + "_backup.pkl")
-            if persistence_pkl_path.exists():
-                persistence_pkl_path.unlink()
+            self._remove_persistence_files()
         self._parameters = parameters
         self._date_list = date_list
         self._member_list = member_list
@@ -202,7 +205,7 @@ class JobList(object):
                                  default_retrials, as_conf)
 
         try:
-            loaded_job_list = self.load(create)
+            loaded_job_list = self.load(create, lazy=lazy)
             Log.result("Load finished")
         except BaseException as e:
             Log.warning(f"Couldn't load the old job_list {e}")
@@ -219,10 +222,7 @@ class JobList(object):
             Log.info(
                 "Removing previous pkl file due to empty graph, "
                 "likely due using an Autosubmit 4.0.XXX version")
-            with suppress(FileNotFoundError):
-                os.remove(os.path.join(self._persistence_path, self._persistence_file + ".pkl"))
-            with suppress(FileNotFoundError):
-                os.remove(os.path.join(self._persistence_path, self._persistence_file + "_backup.pkl"))
+            self._remove_persistence_files()
         if loaded_job_list:
             self._dic_jobs._job_list = loaded_job_list
 
@@ -252,6 +252,7 @@ class JobList(object):
                 job for job in old_job_list if
                 job.member is None or job.member in run_only_members or job.status
                 not in [Status.WAITING, Status.READY]]
+            self._status_index.invalidate()
             for job in self._job_list:
                 for jobp in job.parents:
                     if jobp in self._job_list:
@@ -1776,6 +1777,21 @@ class JobList(object):
         if len(self._ordered_jobs_by_date_member) > 0:
             return self._ordered_jobs_by_date_member[section]
 
+    def _get_jobs_by_status(self, platform, *statuses) -> List[Job]:
+        """
+        Returns the jobs with any of the given statuses using the status index.
+
+        :param platform: job platform, all platforms if None
+        :type platform: Platform
+        :param statuses: statuses to retrieve
+        :return: jobs in list order
+        :rtype: list
+        """
+        jobs = self._status_index.get(self._job_list, statuses)
+        if platform is None:
+            return jobs
+        return [job for job in jobs if job.platform.name == platform.name]
+
     def get_completed(self, platform=None, wrapper=False):
         """
         Returns a list of completed jobs
@@ -1787,8 +1803,7 @@ class JobList(object):
         :rtype: list
         """
 
-        completed_jobs = [job for job in self._job_list if (platform is None or
-                                                            job.platform.name == platform.name) and job.status == Status.COMPLETED]
+        completed_jobs = self._get_jobs_by_status(platform, Status.COMPLETED)
         if wrapper:
             return [job for job in completed_jobs if job.packed is False]
         return completed_jobs
@@ -1803,10 +1818,8 @@ class JobList(object):
         :rtype: List[Job]
         """
 
-        completed_failed_jobs = [job for job in self._job_list if
-                                 (platform is None or job.platform.name == platform.name) and
-                                 (job.status == Status.COMPLETED or job.status == Status.FAILED) and
-                                 job.updated_log is False]
+        completed_failed_jobs = [job for job in self._get_jobs_by_status(platform, Status.COMPLETED, Status.FAILED)
+                                 if job.updated_log is False]
 
         return completed_failed_jobs
 
@@ -1839,14 +1852,9 @@ class JobList(object):
         :return: submitted jobs
         :rtype: list
         """
-        submitted = list()
+        submitted = self._get_jobs_by_status(platform, Status.SUBMITTED)
         if hold:
-            submitted = [job for job in self._job_list if (platform is None or
-                                                           job.platform.name == platform.name) and job.status == Status.SUBMITTED
-                         and job.hold == hold]
-        else:
-            submitted = [job for job in self._job_list if (platform is None or
-                                                           job.platform.name == platform.name) and job.status == Status.SUBMITTED]
+            submitted = [job for job in submitted if job.hold == hold]
         if wrapper:
             return [job for job in submitted if job.packed is False]
         return submitted
@@ -1861,8 +1869,7 @@ class JobList(object):
         :return: running jobs
         :rtype: list
         """
-        running = [job for job in self._job_list if (platform is None or
-                                                     job.platform.name == platform.name) and job.status == Status.RUNNING]
+        running = self._get_jobs_by_status(platform, Status.RUNNING)
         if wrapper:
             return [job for job in running if job.packed is False]
         return running
@@ -1877,8 +1884,7 @@ class JobList(object):
         :return: queuedjobs
         :rtype: list
         """
-        queuing = [job for job in self._job_list if (platform is None or
-                                                     job.platform.name == platform.name) and job.status == Status.QUEUING]
+        queuing = self._get_jobs_by_status(platform, Status.QUEUING)
         if wrapper:
             return [job for job in queuing if job.packed is False]
         return queuing
@@ -1893,8 +1899,7 @@ class JobList(object):
         :return: failed jobs
         :rtype: list
         """
-        failed = [job for job in self._job_list if (platform is None or
-                                                    job.platform.name == platform.name) and job.status == Status.FAILED]
+        failed = self._get_jobs_by_status(platform, Status.FAILED)
         if wrapper:
             return [job for job in failed if job.packed is False]
         return failed
@@ -2084,9 +2089,9 @@ class JobList(object):
         :return: ready jobs
         :rtype: list
         """
-        ready = [job for job in self._job_list if
-                 (platform is None or platform == "" or job.platform.name == platform.name) and
-                 job.status == Status.READY and job.hold is hold]
+        if platform == "":
+            platform = None
+        ready = [job for job in self._get_jobs_by_status(platform, Status.READY) if job.hold is hold]
 
         if wrapper:
             return [job for job in ready if job.packed is False]
@@ -2101,8 +2106,7 @@ class JobList(object):
         :return: prepared jobs
         :rtype: list
         """
-        prepared = [job for job in self._job_list if (platform is None or
-                                                      job.platform.name == platform.name) and job.status == Status.PREPARED]
+        prepared = self._get_jobs_by_status(platform, Status.PREPARED)
         return prepared
 
     def get_delayed(self, platform=None):
@@ -2114,8 +2118,7 @@ class JobList(object):
         :return: delayed jobs
         :rtype: list
         """
-        delayed = [job for job in self._job_list if (platform is None or
-                                                     job.platform.name == platform.name) and job.status == Status.DELAYED]
+        delayed = self._get_jobs_by_status(platform, Status.DELAYED)
         return delayed
 
     def get_waiting(self, platform=None, wrapper=False):
@@ -2128,8 +2131,7 @@ class JobList(object):
         :return: waiting jobs
         :rtype: list
         """
-        waiting_jobs = [job for job in self._job_list if (platform is None or
-                                                          job.platform.name == platform.name) and job.status == Status.WAITING]
+        waiting_jobs = self._get_jobs_by_status(platform, Status.WAITING)
         if wrapper:
             return [job for job in waiting_jobs if job.packed is False]
         return waiting_jobs
@@ -2143,8 +2145,8 @@ class JobList(object):
         :rtype: list
 
         """
-        waiting_jobs = [job for job in self._job_list if (
-                job.platform.type == platform_type and job.status == Status.WAITING)]
+        waiting_jobs = [job for job in self._get_jobs_by_status(None, Status.WAITING)
+                        if job.platform.type == platform_type]
         return waiting_jobs
 
     def get_held_jobs(self, platform=None):
@@ -2156,8 +2158,7 @@ class JobList(object):
         :return: jobs in platforms
         :rtype: list
         """
-        return [job for job in self._job_list if (platform is None or
-                                                  job.platform.name == platform.name) and job.status == Status.HELD]
+        return self._get_jobs_by_status(platform, Status.HELD)
 
     def get_unknown(self, platform=None, wrapper=False):
         """
@@ -2169,8 +2170,7 @@ class JobList(object):
         :return: unknown state jobs
         :rtype: list
         """
-        submitted = [job for job in self._job_list if (platform is None or
-                                                       job.platform.name == platform.name) and job.status == Status.UNKNOWN]
+        submitted = self._get_jobs_by_status(platform, Status.UNKNOWN)
         if wrapper:
             return [job for job in submitted if job.packed is False]
         return submitted
@@ -2311,20 +2311,21 @@ class JobList(object):
         """
         return sorted(self._job_list, key=lambda k: k.status)
 
-    def load(self, create=False, backup=False):
+    def load(self, create=False, backup=False, lazy=False):
         """
         Recreates a stored job list from the persistence
 
+        :param lazy: if True, the persistence may return light job states that load the rest on first access
         :return: loaded job list object
         :rtype: JobList
         """
         try:
             if not backup:
                 Log.info("Loading JobList")
-                return self._persistence.load(self._persistence_path, self._persistence_file)
+                return self._persistence.load(self._persistence_path, self._persistence_file, lazy)
             else:
                 return self._persistence.load(self._persistence_path,
-                                              self._persistence_file + "_backup")
+                                              self._persistence_file + "_backup", lazy)
         except ValueError as e:
             if not create:
                 raise AutosubmitCritical(
@@ -2342,7 +2343,7 @@ class JobList(object):
         except BaseException as e:
             if not backup:
                 Log.debug("Autosubmit will use a backup to recover the job_list")
-                return self.load(create, True)
+                return self.load(create, True, lazy)
             else:
                 if not create:
                     raise AutosubmitCritical(f"JobList could not be loaded due: "
@@ -2365,17 +2366,30 @@ class JobList(object):
                         job_list.append(job)
             self.update_status_log()
 
+            changed_jobs = self._status_index.take_unsaved(self._job_list)
             try:
                 self._persistence.save(self._persistence_path, self._persistence_file,
                                        self._job_list if self.run_members is None or
-                                                         job_list is None else job_list, self.graph)
+                                                         job_list is None else job_list, self.graph,
+                                       changed_jobs=changed_jobs)
             except BaseException as e:
+                # The changes taken are lost, the next save has to write every job
+                self._status_index.invalidate()
                 raise AutosubmitError(str(e), 6040, "Failure while saving the job_list")
         except AutosubmitError as e:
             raise
         except BaseException as e:
             raise AutosubmitError(str(e), 6040, "Unknown failure while saving the job_list")
 
+    def _remove_persistence_files(self):
+        """
+        Removes the pkl files of the job list, with the journal and the stubs written next to them
+        """
+        for extension in [".pkl", "_backup.pkl", JobListPersistenceJournal.JOURNAL_EXT,
+                          JobListPersistencePkl.STUBS_EXT]:
+            with suppress(FileNotFoundError):
+                os.remove(os.path.join(self._persistence_path, self._persistence_file + extension))
+
     def backup_save(self):
         """
         Persists the job list
@@ -2549,6 +2563,7 @@ class JobList(object):
         # No need to check for log files as there are none
         if hasattr(job, "x11") and job.x11:
             job.updated_log = True
+            self._status_index.mark_unsaved([job])
             return
         log_recovered = self.check_if_log_is_recovered(job)
         if log_recovered:
@@ -2561,6 +2576,8 @@ class JobList(object):
             # we only want the last one
             job.local_logs = (log_recovered.name, log_recovered.name[:-4] + ".err")
             job.updated_log = True
+            # Its status did not change, but it has to be saved
+            self._status_index.mark_unsaved([job])
         elif new_run and not job.updated_log and str(
                 as_conf.platforms_data.get(job.platform.name, {}).get('DISABLE_RECOVERY_THREADS',
                                                                       "false")).lower() == "false":
@@ -2591,13 +2608,35 @@ class JobList(object):
                     return log_recovered
         return None
 
+    def _get_waiting_to_update(self, changed_jobs: set) -> List[Job]:
+        """
+        Returns the WAITING jobs that may change in this update, those that changed status
+        themselves or have a parent that changed status since the previous update.
+
+        :param changed_jobs: Jobs whose status changed since the previous update.
+        :type changed_jobs: set
+        :return: WAITING jobs to re-evaluate, in job list order.
+        :rtype: list
+        """
+        waiting_jobs = set()
+        for job in changed_jobs:
+            if job.status == Status.WAITING:
+                waiting_jobs.add(job)
+            for child in job.children:
+                if child.status == Status.WAITING:
+                    waiting_jobs.add(child)
+        return self._status_index.order(self._job_list, waiting_jobs)
+
     def update_list(self, as_conf: AutosubmitConfig, store_change: bool = True,
                     fromSetStatus: bool = False, submitter: object = None,
-                    first_time: bool = False) -> bool:
+                    first_time: bool = False, incremental: bool = False) -> bool:
         """
         Updates job list, resetting failed jobs and changing to READY
         all WAITING jobs with all parents COMPLETED
 
+        :param incremental: if True, only the WAITING jobs affected by the status changes
+            since the previous update are re-evaluated. Falls back to all the WAITING jobs
+            when these changes are unknown (e.g. jobs were added to the list).
         :param first_time:
         :param submitter:
         :param fromSetStatus:
@@ -2665,9 +2704,8 @@ class JobList(object):
                     job.status = Status.FAILED
                     save = True
         else:
-            for job in [job for job in self._job_list if job.status in
-                                                         [Status.WAITING, Status.READY, Status.DELAYED,
-                                                          Status.PREPARED]]:
+            for job in self._get_jobs_by_status(None, Status.WAITING, Status.READY, Status.DELAYED,
+                                                Status.PREPARED):
                 job.fail_count = 0
         # Check checkpoint jobs, the status can be Any
         for job in self.check_special_status():
@@ -2707,7 +2745,14 @@ class JobList(object):
             for job in self.get_delayed():
                 if datetime.datetime.now() >= job.delay_end:
                     job.status = Status.READY
-            for job in self.get_waiting():
+            changed_jobs = self._status_index.take_changed(self._job_list)
+            if incremental and changed_jobs is not None:
+                waiting_jobs = self._get_waiting_to_update(changed_jobs)
+            else:
+                waiting_jobs = self.get_waiting()
+            evaluated = 0
+            for job in waiting_jobs:
+                evaluated += 1
                 tmp = [parent for parent in job.parents if
                        parent.status == Status.COMPLETED or parent.status == Status.SKIPPED]
                 tmp2 = [parent for parent in job.parents if
@@ -2753,6 +2798,8 @@ class JobList(object):
                                     Log.debug(f"Setting job: {job.name} status to: READY"
                                               " (conditional jobs are completed/failed)...")
                                     break
+            # The loop above can stop early, the jobs left must be checked in the next update
+            self._status_index.mark_changed(waiting_jobs[evaluated:])
             if as_conf.get_remote_dependencies() == "true":
                 for job in self.get_prepared():
                     tmp = [
@@ -2872,6 +2919,7 @@ class JobList(object):
         # update job list view as transitive_Reduction also fills
         # job._parents and job._children if recreate is set
         self._job_list = [job["job"] for job in self.graph.nodes().values()]
+        self._status_index.invalidate()
         try:
             DbStructure.save_structure(self.graph, self.expid, self._config.experiment_data["STRUCTURES_DIR"])
         except Exception as exp:
@@ -2944,6 +2992,7 @@ class JobList(object):
             parent.children.remove(job)
 
         self._job_list.remove(job)
+        self._status_index.invalidate()
 
     def rerun(self, job_list_unparsed, as_conf, monitor=False):
         """
@@ -19,12 +19,15 @@ import gc
 import os
 import pickle
 import shutil
+import struct
 from contextlib import suppress
 from pathlib import Path
 from sys import setrecursionlimit, getrecursionlimit
+from typing import Any, Dict, Optional, Tuple
 
 from autosubmit.config.basicconfig import BasicConfig
 from autosubmit.database.db_manager import create_db_manager
+from autosubmit.job.job import LAZY_ATTRIBUTES, LazyJobState
 from autosubmit.log.log import Log
 
 
@@ -34,21 +37,23 @@ class JobListPersistence(object):
 
     """
 
-    def save(self, persistence_path, persistence_file, job_list , graph):
+    def save(self, persistence_path, persistence_file, job_list , graph, changed_jobs=None):
         """
         Persists a job list
         :param job_list: JobList
         :param persistence_file: str
         :param persistence_path: str
+        :param changed_jobs: jobs that changed since the previous save, None if they are unknown
 
         """
         raise NotImplementedError
 
-    def load(self, persistence_path, persistence_file):
+    def load(self, persistence_path, persistence_file, lazy=False):
         """
         Loads a job list from persistence
         :param persistence_file: str
         :param persistence_path: str
+        :param lazy: if True, the persistence may return ``LazyJobState`` stubs instead of full job states
 
         """
         raise NotImplementedError
@@ -61,14 +66,31 @@ class JobListPersistencePkl(JobListPersistence):
     """
 
     EXT = '.pkl'
+    # Written next to the pkl file with the states of the jobs without their ``LAZY_ATTRIBUTES``
+    STUBS_EXT = '.stubs.pkl'
 
-    def load(self, persistence_path, persistence_file):
+    @staticmethod
+    def _snapshot_id(snapshot_path: str) -> Tuple[int, int, int]:
+        return JobListPersistencePkl._stat_id(os.stat(snapshot_path))
+
+    @staticmethod
+    def _stat_id(stat: os.stat_result) -> Tuple[int, int, int]:
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load(self, persistence_path, persistence_file, lazy=False):
         """
         Loads a job list from a pkl file
         :param persistence_file: str
         :param persistence_path: str
+        :param lazy: if True, and the stubs file matches the pkl file, returns ``LazyJobState`` stubs
+            that unpickle the pkl file only when a job needs one of its deferred attributes. Otherwise,
+            the full job list is loaded
 
         """
+        if lazy:
+            job_list = self._load_stubs(persistence_path, persistence_file)
+            if job_list is not None:
+                return job_list
         path = os.path.join(persistence_path, persistence_file + '.pkl')
         path_tmp = os.path.join(persistence_path[:-3]+"tmp", persistence_file + f'.pkl.tmp_{os.urandom(8).hex()}')
 
@@ -94,28 +116,204 @@ class JobListPersistencePkl(JobListPersistence):
 
             return job_list
 
-    def save(self, persistence_path, persistence_file, job_list, graph):
+    def _load_stubs(self, persistence_path, persistence_file) -> Optional[Dict[str, LazyJobState]]:
+        """
+        Loads the job stubs, or returns None if the stubs file is missing or belongs to another pkl file
+        :param persistence_file: str
+        :param persistence_path: str
+
+        """
+        path = os.path.join(persistence_path, persistence_file + self.EXT)
+        stubs_path = os.path.join(persistence_path, persistence_file + self.STUBS_EXT)
+        try:
+            with open(stubs_path, 'rb') as fd:
+                stubs = pickle.load(fd)
+            # The pkl file is opened now, so a later save, that replaces it, does not change what the
+            # stubs are hydrated from. It is only read if a deferred attribute is accessed
+            pkl_fd = open(path, 'rb')
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError) as e:
+            Log.debug(f'Job list stubs {stubs_path} could not be loaded, loading the full job list. {e}')
+            return None
+        if stubs.get('snapshot') != self._stat_id(os.fstat(pkl_fd.fileno())):
+            pkl_fd.close()
+            Log.debug(f'Job list stubs {stubs_path} do not belong to {path}, loading the full job list')
+            return None
+
+        states = {}
+
+        def loader(name: str) -> Dict[str, Any]:
+            if not pkl_fd.closed:
+                with pkl_fd:
+                    current_limit = getrecursionlimit()
+                    setrecursionlimit(100000)
+                    states.update(pickle.load(pkl_fd))
+                    setrecursionlimit(current_limit)
+            return states.get(name, {})
+
+        return {name: LazyJobState(stub, loader) for name, stub in stubs['jobs'].items()}
+
+    def save(self, persistence_path, persistence_file, job_list, graph, changed_jobs=None):
         """
-        Persists a job list in a pkl file
+        Persists a job list in a pkl file, and the job states without their ``LAZY_ATTRIBUTES`` in
+        the stubs file, tagged with the pkl file they belong to
         :param job_list: JobList
         :param persistence_file: str
         :param persistence_path: str
+        :param changed_jobs: ignored, the whole job list is written
 
         """
 
-        path = os.path.join(persistence_path, persistence_file + '.pkl' + '.tmp')
-        with suppress(FileNotFoundError, PermissionError):
-            os.remove(path)
+        path = os.path.join(persistence_path, persistence_file + self.EXT)
+        stubs_path = os.path.join(persistence_path, persistence_file + self.STUBS_EXT)
+        # Unique names, so commands saving at the same time do not write the same files
+        tmp_suffix = f'.tmp_{os.urandom(8).hex()}'
         Log.debug("Saving JobList: " + path)
-        with open(path, 'wb') as fd:
+        with open(path + tmp_suffix, 'wb') as fd:
+            current_limit = getrecursionlimit()
+            setrecursionlimit(100000)
+            states = {job.name: job.__getstate__() for job in job_list}
+            pickle.dump(states, fd, pickle.HIGHEST_PROTOCOL)
+            setrecursionlimit(current_limit)
+            fd.flush()
+            # Renaming the file keeps its inode and modification time
+            snapshot_id = self._stat_id(os.fstat(fd.fileno()))
+        stubs = {
+            'snapshot': snapshot_id,
+            'jobs': {name: {key: value for key, value in state.items() if key not in LAZY_ATTRIBUTES}
+                     for name, state in states.items()}
+        }
+        del states
+        gc.collect()  # Tracemalloc show leaks without this
+        os.replace(path + tmp_suffix, path)
+        try:
+            with open(stubs_path + tmp_suffix, 'wb') as fd:
+                pickle.dump(stubs, fd, pickle.HIGHEST_PROTOCOL)
+            os.replace(stubs_path + tmp_suffix, stubs_path)
+        except OSError as e:
+            # The stubs left do not match the new pkl file, so the next lazy load is a full one
+            Log.debug(f'Job list stubs {stubs_path} could not be saved. {e}')
+            with suppress(OSError):
+                os.remove(stubs_path + tmp_suffix)
+        Log.debug(f'JobList saved in {path}')
+
+
+class JobListPersistenceJournal(JobListPersistencePkl):
+    """
+    Class to manage the persistence of the job lists as a pkl snapshot plus an append-only journal.
+
+    The first save done by an instance, and every ``COMPACT_EVERY`` saves (or when the
+    journal grows over ``COMPACT_SIZE`` bytes, the number of jobs changes, or the changed
+    jobs are unknown), writes a full pkl snapshot like ``JobListPersistencePkl``. The
+    other saves only append the states of the jobs that changed since the previous save,
+    as recorded by the status index of the ``JobList``, to the journal.
+
+    The journal is a sequence of length-prefixed pickled frames. The first frame
+    identifies the snapshot it applies to, so a journal left by a crash during the
+    compaction is ignored instead of being replayed on a newer snapshot. A truncated
+    last frame (crash while appending) is ignored too.
+
+    Tools reading the pkl file directly see the job list as of the last compaction.
+    """
+
+    JOURNAL_EXT = '.journal'
+    COMPACT_EVERY = 50
+    COMPACT_SIZE = 16 * 1024 * 1024
+    _FRAME_HEADER = struct.Struct('>I')
+
+    def __init__(self):
+        self._saved_count = 0
+        self._saves_since_compaction = 0
+        self._baseline: Optional[Tuple[str, str]] = None
+
+    def _write_frame(self, fd, data: Any) -> None:
+        payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        fd.write(self._FRAME_HEADER.pack(len(payload)) + payload)
+
+    def _read_frames(self, journal_path: str):
+        with open(journal_path, 'rb') as fd:
+            while True:
+                header = fd.read(self._FRAME_HEADER.size)
+                if len(header) < self._FRAME_HEADER.size:
+                    return
+                payload = fd.read(self._FRAME_HEADER.unpack(header)[0])
+                try:
+                    yield pickle.loads(payload)
+                except (EOFError, pickle.UnpicklingError):
+                    Log.warning(f'Ignoring the truncated end of the job list journal {journal_path}')
+                    return
+
+    def load(self, persistence_path, persistence_file, lazy=False):
+        """
+        Loads a job list from a pkl snapshot and replays its journal
+        :param persistence_file: str
+        :param persistence_path: str
+        :param lazy: if True, the snapshot is loaded as ``LazyJobState`` stubs, the journal changes
+            are applied to the stubs and take precedence over the deferred attributes
+
+        """
+        job_list = super().load(persistence_path, persistence_file, lazy)
+        snapshot_path = os.path.join(persistence_path, persistence_file + self.EXT)
+        journal_path = os.path.join(persistence_path, persistence_file + self.JOURNAL_EXT)
+        if not os.path.exists(journal_path):
+            return job_list
+        frames = self._read_frames(journal_path)
+        if next(frames, None) != self._snapshot_id(snapshot_path):
+            Log.debug(f'Job list journal {journal_path} does not belong to the current snapshot, ignoring it')
+            return job_list
+        for changes in frames:
+            for name, changed_state in changes.items():
+                if name in job_list:
+                    job_list[name].update(changed_state)
+        return job_list
+
+    def save(self, persistence_path, persistence_file, job_list, graph, changed_jobs=None):
+        """
+        Persists the changes of a job list in the journal, or a full pkl snapshot when needed
+        :param job_list: JobList
+        :param persistence_file: str
+        :param persistence_path: str
+        :param changed_jobs: jobs that changed since the previous save, None if they are unknown
+
+        """
+        journal_path = os.path.join(persistence_path, persistence_file + self.JOURNAL_EXT)
+        if (changed_jobs is None or
+                self._baseline != (persistence_path, persistence_file) or
+                self._saves_since_compaction >= self.COMPACT_EVERY or
+                len(job_list) != self._saved_count or
+                not os.path.exists(journal_path) or
+                os.path.getsize(journal_path) > self.COMPACT_SIZE):
+            self.compact(persistence_path, persistence_file, job_list)
+            return
+        self._saves_since_compaction += 1
+        if not changed_jobs:
+            return
+        with open(journal_path, 'ab') as fd:
             current_limit = getrecursionlimit()
             setrecursionlimit(100000)
-            pickle.dump({job.name: job.__getstate__() for job in job_list}, fd, pickle.HIGHEST_PROTOCOL)
+            self._write_frame(fd, {job.name: job.__getstate__() for job in changed_jobs})
             setrecursionlimit(current_limit)
-            gc.collect()  # Tracemalloc show leaks without this
-        os.replace(path, path[:-4])
-        Log.debug(f'JobList saved in {path[:-4]}')
+            fd.flush()
+            os.fsync(fd.fileno())
+        Log.debug(f'JobList changes of {len(changed_jobs)} jobs saved in {journal_path}')
+
+    def compact(self, persistence_path, persistence_file, job_list):
+        """
+        Writes a full pkl snapshot and starts an empty journal for it
+        :param job_list: JobList
+        :param persistence_file: str
+        :param persistence_path: str
 
+        """
+        super().save(persistence_path, persistence_file, job_list, None)
+        snapshot_path = os.path.join(persistence_path, persistence_file + self.EXT)
+        journal_path = os.path.join(persistence_path, persistence_file + self.JOURNAL_EXT)
+        tmp_suffix = f'.tmp_{os.urandom(8).hex()}'
+        with open(journal_path + tmp_suffix, 'wb') as fd:
+            self._write_frame(fd, self._snapshot_id(snapshot_path))
+        os.replace(journal_path + tmp_suffix, journal_path)
+        self._saved_count = len(job_list)
+        self._saves_since_compaction = 0
+        self._baseline = (persistence_path, persistence_file)
 
 
 class JobListPersistenceDb(JobListPersistence):
@@ -143,7 +341,12 @@ class JobListPersistenceDb(JobListPersistence):
         "wrapper_type",
     ]
 
-    def __init__(self, expid: str):
+    def __init__(self, expid: str, delta: bool = True):
+        """
+        :param expid: experiment identifier
+        :param delta: if True, after the first save only the rows that changed since the
+            previous save are written, otherwise the table is rewritten on every save
+        """
         options = {
             "root_path": str(Path(BasicConfig.LOCAL_ROOT_DIR, expid, "pkl")),
             "db_name": f"job_list_{expid}",
@@ -151,32 +354,58 @@ class JobListPersistenceDb(JobListPersistence):
             "schema": expid
         }
         self.expid = expid
+        self.delta = delta
         self.db_manager = create_db_manager(BasicConfig.DATABASE_BACKEND, **options)
+        # Rows as they were written in the last save, by job name
+        self._saved_rows: Optional[Dict[str, tuple]] = None
 
-    def load(self, persistence_path, persistence_file):
+    def load(self, persistence_path, persistence_file, lazy=False):
         """
         Loads a job list from a database
         :param persistence_file: str
         :param persistence_path: str
+        :param lazy: ignored, the rows only hold light attributes already
 
         """
         return self.db_manager.select_all(self.JOB_LIST_TABLE)
 
-    def save(self, persistence_path, persistence_file, job_list, graph):
+    def save(self, persistence_path, persistence_file, job_list, graph, changed_jobs=None):
         """
         Persists a job list in a database
         :param job_list: JobList
         :param persistence_file: str
         :param persistence_path: str
+        :param changed_jobs: ignored, the rows are compared with the ones of the previous save
 
         """
-        self._reset_table()
         jobs_data = [(job.name, job.id, job.status,
                       job.priority, job.section, job.date,
                       job.member, job.chunk, job.split,
                       job.local_logs[0], job.local_logs[1],
                       job.remote_logs[0], job.remote_logs[1],job.wrapper_type) for job in job_list]
-        self.db_manager.insertMany(self.JOB_LIST_TABLE, jobs_data)
+        if self.delta and self._saved_rows is not None:
+            self._save_changes(jobs_data)
+            return
+        self._reset_table()
+        if jobs_data:
+            self.db_manager.insertMany(self.JOB_LIST_TABLE, jobs_data)
+        self._saved_rows = {row[0]: row for row in jobs_data}
+
+    def _save_changes(self, jobs_data):
+        """
+        Writes only the rows that were added, changed or removed since the previous save, in one transaction
+        :param jobs_data: [()] rows of the current job list
+
+        """
+        rows = {row[0]: row for row in jobs_data}
+        inserted = [row for name, row in rows.items() if name not in self._saved_rows]
+        updated = [row for name, row in rows.items()
+                   if name in self._saved_rows and self._saved_rows[name] != row]
+        deleted = [name for name in self._saved_rows if name not in rows]
+        if inserted or updated or deleted:
+            self.db_manager.sync_rows(self.JOB_LIST_TABLE, self.TABLE_FIELDS, "name", inserted, updated, deleted)
+            Log.debug(f"JobList saved: {len(inserted)} inserted, {len(updated)} updated, {len(deleted)} deleted jobs")
+        self._saved_rows = rows
 
     def _reset_table(self):
         """
@@ -185,3 +414,4 @@ class JobListPersistenceDb(JobListPersistence):
         """
         self.db_manager.drop_table(self.JOB_LIST_TABLE)
         self.db_manager.create_table(self.JOB_LIST_TABLE, self.TABLE_FIELDS)
+        self.db_manager.create_index(self.JOB_LIST_TABLE, f"{self.JOB_LIST_TABLE}_name", ["name"])
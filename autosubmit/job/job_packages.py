@@ -31,7 +31,6 @@ from bscearth.utils.date import sum_str_hours
 from threading import Thread, Lock
 from typing import List, Dict
 import multiprocessing
-import tarfile
 import datetime
 import re
 import locale
@@ -215,6 +214,11 @@ class JobPackageBase(object):
     def _create_scripts(self, configuration):
         raise Exception('Not implemented')
 
+    @property
+    def _submitted_now(self) -> bool:
+        """True if the package is submitted right away, not in the submit script of the platform."""
+        return str(self.x11).lower() == "true"
+
     def _send_files(self):
         """ Send local files to the platform. """
 
@@ -247,11 +251,15 @@ class JobPackageSimple(JobPackageBase):
 
     def _send_files(self):
         # TODO: pytests when the slurm container is avaliable
+        self.platform.send_files(self._files_to_send(), deferrable=not self._submitted_now)
+
+    def _files_to_send(self) -> List[str]:
+        filenames = []
         for job in self.jobs:
-            self.platform.send_file(self._job_scripts[job.name])
+            filenames.append(self._job_scripts[job.name])
             for f in job.additional_files:
-                real_name = job.construct_real_additional_file_name(f)
-                self.platform.send_file(real_name)
+                filenames.append(job.construct_real_additional_file_name(f))
+        return filenames
 
 
 
@@ -276,9 +284,9 @@ class JobPackageSimple(JobPackageBase):
                 os.remove(log_completed)
             if os.path.exists(log_stat):
                 os.remove(log_stat)
-            self.platform.remove_stat_file(job)
-            self.platform.remove_completed_file(job.name)
+        self.platform.remove_stat_and_completed_files(self.jobs)
 
+        for job in self.jobs:
             # Submit job to the platform
             job.id = self.platform.submit_job(job, job_scripts[job.name], hold=hold, export = self.export)
             if job.id is None or not job.id:
@@ -304,10 +312,11 @@ class JobPackageSimpleWrapped(JobPackageSimple):
         for job in self.jobs:
             self._job_wrapped_scripts[job.name] = job.create_wrapped_script(configuration)
 
-    def _send_files(self):
-        super(JobPackageSimpleWrapped, self)._send_files()
+    def _files_to_send(self) -> List[str]:
+        filenames = super(JobPackageSimpleWrapped, self)._files_to_send()
         for job in self.jobs:
-            self.platform.send_file(self._job_wrapped_scripts[job.name])
+            filenames.append(self._job_wrapped_scripts[job.name])
+        return filenames
 
     def _do_submission(self, job_scripts=None, hold=False):
         if job_scripts is None or not job_scripts:
@@ -360,10 +369,12 @@ class JobPackageArray(JobPackageBase):
         return filename
 
     def _send_files(self):
+        filenames = []
         for job in self.jobs:
-            self.platform.send_file(self._job_scripts[job.name])
-            self.platform.send_file(self._job_inputs[job.name])
-        self.platform.send_file(self._common_script)
+            filenames.append(self._job_scripts[job.name])
+            filenames.append(self._job_inputs[job.name])
+        filenames.append(self._common_script)
+        self.platform.send_files(filenames, deferrable=not self._submitted_now)
 
     def _do_submission(self, job_scripts: Dict[str, str] = None, hold: bool = False) -> None:
         """
@@ -376,8 +387,7 @@ class JobPackageArray(JobPackageBase):
         """
         for job in self.jobs:
             job.update_local_logs()
-            self.platform.remove_stat_file(job)
-            self.platform.remove_completed_file(job.name)
+        self.platform.remove_stat_and_completed_files(self.jobs)
 
         package_id = self.platform.submit_job(None, self._common_script, hold=hold, export = self.export)
 
@@ -578,28 +588,10 @@ class JobPackageThread(JobPackageBase):
     def _send_files(self):
         Log.debug("Check remote dir")
         self.platform.check_remote_log_dir()
-        compress_type = "w"
-        output_filepath = '{0}.tar'.format("wrapper_scripts")
-        if callable(getattr(self.platform, 'remove_multiple_files')):
-            filenames = str()
-            for job in self.jobs:
-                filenames += " " + self.platform.remote_log_dir + "/" + job.name + ".cmd"
-            self.platform.remove_multiple_files(filenames)
-        tar_path = os.path.join(self._tmp_path, output_filepath)
-        Log.debug("Compressing multiple_files")
-        with tarfile.open(tar_path, compress_type) as tar:
-            for job in self.jobs:
-                jfile = os.path.join(self._tmp_path,self._job_scripts[job.name])
-                with open(jfile, 'rb') as f:
-                    info = tar.gettarinfo(jfile,self._job_scripts[job.name])
-                    tar.addfile(info, f)
-        tar.close()
-        os.chmod(tar_path, 0o755)
-        self.platform.send_file(tar_path, check=False)
-        Log.debug("Uncompress - send_command")
-        self.platform.send_command("cd {0}; tar -xvf {1}".format(self.platform.get_files_path(),output_filepath))
-        Log.debug("Send_file: common_script")
-        self.platform.send_file(self._common_script)
+        # Sent in one tar archive, streamed to the platform
+        filenames = [self._job_scripts[job.name] for job in self.jobs]
+        filenames.append(self._common_script)
+        self.platform.send_files(filenames, deferrable=not self._submitted_now)
 
 
     def _do_submission(self, job_scripts: Dict[str, str] = None, hold: bool = False) -> None:
@@ -622,10 +614,9 @@ class JobPackageThread(JobPackageBase):
         else:
             for job in self.jobs:
                 job.update_local_logs()
-                self.platform.remove_stat_file(job)
-                self.platform.remove_completed_file(job.name)
                 if hold:
                     job.hold = hold
+            self.platform.remove_stat_and_completed_files(self.jobs)
 
 
         package_id = self.platform.submit_job(None, self._common_script, hold=hold, export = self.export)
@@ -695,9 +686,9 @@ class JobPackageThreadWrapped(JobPackageThread):
         return script_file
 
     def _send_files(self):
-        for job in self.jobs:
-            self.platform.send_file(self._job_scripts[job.name])
-        self.platform.send_file(self._common_script)
+        filenames = [self._job_scripts[job.name] for job in self.jobs]
+        filenames.append(self._common_script)
+        self.platform.send_files(filenames, deferrable=not self._submitted_now)
 
     def _do_submission(self, job_scripts: Dict[str, str] = None, hold: bool = False) -> None:
         """
@@ -710,10 +701,9 @@ class JobPackageThreadWrapped(JobPackageThread):
         """
         for job in self.jobs:
             job.update_local_logs()
-            self.platform.remove_stat_file(job)
-            self.platform.remove_completed_file(job.name)
             if hold:
                 job.hold = hold
+        self.platform.remove_stat_and_completed_files(self.jobs)
 
 
         package_id = self.platform.submit_job(None, self._common_script, hold=hold, export = self.export)
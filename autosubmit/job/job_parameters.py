@@ -0,0 +1,146 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Per section cache of the substituted parameters used by ``Job.update_parameters``."""
+
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from autosubmit.config.configcommon import AutosubmitConfig
+    from autosubmit.job.job import Job
+    from autosubmit.platforms.platform import Platform
+
+# Stands for the job name while the parameters of a section are compiled. It can't be mistaken
+# for a placeholder, so the dynamic variables substitution copies it around like any other text.
+JOB_VALUE = '\x00JOBNAME\x00'
+
+
+class SectionParametersTemplate(object):
+    """
+    Substituted parameters of a section, where the values that depend on the job are split in segments.
+
+    Rendering joins the segments with the value of the job, instead of running the dynamic
+    variables substitution again. The containers (lists and dicts) are copied for each job, so
+    changing the parameters of a job in place does not change those of the rest of the section.
+    """
+
+    def __init__(self, platform: 'Platform', parameters: Dict[str, Any], dynamic_variables: Dict[str, Any]):
+        self.platform = platform
+        self._parameters = parameters
+        self._job_parameters = self._compile(parameters)
+        self._dynamic_variables = dynamic_variables
+        self._job_dynamic_variables = self._compile(dynamic_variables)
+
+    @staticmethod
+    def _compile(values: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the values that contain ``JOB_VALUE``, as lists of literal segments (or lists of them)."""
+        compiled = {}
+        for key, value in values.items():
+            if isinstance(value, str) and JOB_VALUE in value:
+                compiled[key] = value.split(JOB_VALUE)
+            elif isinstance(value, list) and any(isinstance(item, str) and JOB_VALUE in item for item in value):
+                compiled[key] = [item.split(JOB_VALUE) if isinstance(item, str) else [item] for item in value]
+        return compiled
+
+    @staticmethod
+    def _render(values: Dict[str, Any], compiled: Dict[str, Any], job_value: str) -> Dict[str, Any]:
+        rendered = {key: deepcopy(value) if isinstance(value, (dict, list, set)) and key not in compiled else value
+                    for key, value in values.items()}
+        for key, segments in compiled.items():
+            if isinstance(values[key], str):
+                rendered[key] = job_value.join(segments)
+            else:
+                rendered[key] = [job_value.join(item) if len(item) > 1 or isinstance(item[0], str) else
+                                 deepcopy(item[0]) for item in segments]
+        return rendered
+
+    def render(self, job_value: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Returns the parameters and the dynamic variables left to substitute for one job.
+
+        :param job_value: Name of the job.
+        :return: Parameters and dynamic variables.
+        """
+        return (self._render(self._parameters, self._job_parameters, job_value),
+                self._render(self._dynamic_variables, self._job_dynamic_variables, job_value))
+
+
+class SectionParameters(object):
+    """
+    Substitutes the experiment parameters once per job section and platform.
+
+    Until ``Job.update_job_parameters``, the parameters of a job only depend on the
+    configuration, its section and its platform, except for the job name at the end of
+    ``CURRENT_METRIC_FOLDER``. The first job of each section and platform runs the full
+    substitution with ``JOB_VALUE`` as job name, the rest of jobs render the result with
+    their own name.
+
+    Everything is compiled again when ``AutosubmitConfig.data_version`` changes, or
+    ``AutosubmitConfig.experiment_data`` or ``AutosubmitConfig.default_parameters`` are
+    replaced or get new keys.
+    """
+
+    def __init__(self):
+        self._experiment_data: Optional[dict] = None
+        self._default_parameters: Optional[dict] = None
+        self._version = None
+        self._templates: Dict[Tuple[str, str], SectionParametersTemplate] = dict()
+
+    def parameters(self, job: 'Job', as_conf: 'AutosubmitConfig') -> Dict[str, Any]:
+        """
+        Returns the substituted parameters of the job, and sets the dynamic variables left for its scripts.
+
+        :param job: Job whose parameters are needed. Its platform must be set.
+        :param as_conf: Autosubmit configuration object.
+        :return: Parameters of the job.
+        """
+        version = (getattr(as_conf, 'data_version', None), len(as_conf.experiment_data),
+                   len(as_conf.default_parameters))
+        if as_conf.experiment_data is not self._experiment_data or \
+                as_conf.default_parameters is not self._default_parameters or version != self._version:
+            self._experiment_data = as_conf.experiment_data
+            self._default_parameters = as_conf.default_parameters
+            self._version = version
+            self._templates = dict()
+        key = (job.section, job.platform_name)
+        template = self._templates.get(key)
+        if template is None or template.platform is not job.platform:
+            parameters = job.substitute_section_parameters(as_conf, JOB_VALUE)
+            template = SectionParametersTemplate(job.platform, parameters, dict(as_conf.dynamic_variables))
+            self._templates[key] = template
+        parameters, as_conf.dynamic_variables = template.render(job.name)
+        return parameters
+
+
+_section_parameters: 'WeakKeyDictionary[AutosubmitConfig, SectionParameters]' = WeakKeyDictionary()
+
+
+def get_section_parameters(as_conf: 'AutosubmitConfig') -> Optional[SectionParameters]:
+    """
+    Returns the section parameters cache of the configuration, or None if it can't be cached.
+
+    :param as_conf: Autosubmit configuration object.
+    """
+    if not isinstance(as_conf.experiment_data, dict) or not isinstance(as_conf.default_parameters, dict):
+        return None
+    try:
+        return _section_parameters.setdefault(as_conf, SectionParameters())
+    except TypeError:
+        # Not hashable or weak referenceable
+        return None
@@ -0,0 +1,355 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cache of the job templates, read and split in literal and placeholder segments only once, and writing of the scripts."""
+
+import os
+import re
+import string
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+PLACEHOLDER_PATTERN = re.compile(r'%(?<!%%)[a-zA-Z0-9_.-]+%(?!%%)', flags=re.IGNORECASE)
+_NAME_THEN_PERCENT = re.compile(r'([a-zA-Z0-9_.-]*)%')
+_PERCENT_THEN_NAME_AT_END = re.compile(r'%[a-zA-Z0-9_.-]*\Z')
+# Characters that can be part of a placeholder
+_PLACEHOLDER_CHARS = frozenset(string.ascii_letters + string.digits + '_.-%')
+
+
+class TemplateContent(str):
+    """
+    Content of a script that remembers the parts it was joined from.
+
+    The template body of a job is the same for all the jobs of its section, but the platform
+    header embeds values of each job, such as its name. The compiled templates of the shared
+    parts are cached and reused, and only the other parts are compiled for each job.
+    """
+
+    def __new__(cls, parts: Sequence[str], cached: Optional[Sequence[bool]] = None):
+        """
+        :param parts: Parts of the content, in order.
+        :param cached: Whether each part is shared by other jobs, and its compiled template worth
+            caching. By default, all of them.
+        """
+        content = super().__new__(cls, ''.join(parts))
+        content.parts = tuple(parts)
+        content.cached = tuple(cached) if cached is not None else (True,) * len(content.parts)
+        return content
+
+    def __getnewargs__(self):
+        return self.parts, self.cached
+
+
+class ScriptTemplate(object):
+    """
+    Template content split in literal segments and the placeholders between them.
+
+    ``substitute_placeholders`` replaced each placeholder found in the content with
+    ``re.sub``, one after another. Rendering a compiled template gives the same result in
+    one join, unless a substitution could create or break another placeholder. In that
+    case ``render`` returns None and the caller falls back to the sequential substitution.
+    """
+
+    def __init__(self, content: str, skipped_placeholders: FrozenSet[str]):
+        """
+        :param content: Template content.
+        :param skipped_placeholders: Placeholders that are not substituted, e.g. ``%Y%``.
+        """
+        matches = list(PLACEHOLDER_PATTERN.finditer(content))
+        keys = {match.group()[1:-1].upper() for match in matches if match.group() not in skipped_placeholders}
+        self._literals: List[str] = []
+        self._keys: List[str] = []
+        position = 0
+        for match in matches:
+            key = match.group()[1:-1].upper()
+            # A skipped placeholder is still replaced if the same key in another case is not skipped
+            if key not in keys:
+                continue
+            self._literals.append(content[position:match.start()])
+            self._keys.append(key)
+            position = match.end()
+        self._literals.append(content[position:])
+        self._found_keys = {match.group()[1:-1] for match in matches}
+        self._skipped_keys = {match.group()[1:-1].upper() for match in matches
+                              if match.group() in skipped_placeholders}
+        # Neither a placeholder nor the name of one can cross this end of the content
+        self._neutral_start = content[:1] not in _PLACEHOLDER_CHARS
+        self._neutral_end = content[-1:] not in _PLACEHOLDER_CHARS
+        self.safe = self._is_safe(self._found_keys)
+
+    def _is_safe(self, found_keys) -> bool:
+        """Checks that no substitution can change where the other placeholders are."""
+        dotted_keys = [key for key in set(self._keys) if '.' in key]
+        for dotted_key in dotted_keys:
+            # The key is used as a regex, its dots match other placeholders too
+            if any(key.upper() != dotted_key and re.fullmatch(dotted_key, key, flags=re.I) for key in found_keys):
+                return False
+        for index in range(len(self._keys)):
+            after = self._literals[index + 1]
+            if after.startswith('%'):
+                return False
+            name = _NAME_THEN_PERCENT.match(after)
+            if name is None:
+                continue
+            # The closing % and the following text could be another placeholder, or become one
+            if _PERCENT_THEN_NAME_AT_END.search(self._literals[index]):
+                return False
+            if any(re.fullmatch(key, name.group(1), flags=re.I) for key in self._keys):
+                return False
+        return True
+
+    def _names_after(self) -> List[str]:
+        """Names between the closing % of a placeholder and the next %."""
+        names = (_NAME_THEN_PERCENT.match(literal) for literal in self._literals[1:])
+        return [name.group(1) for name in names if name is not None]
+
+    @staticmethod
+    def separable(templates: List['ScriptTemplate']) -> bool:
+        """
+        Checks that rendering the templates of consecutive parts one by one gives the same result
+        as rendering the template of the joined content.
+
+        :param templates: Compiled templates of the parts, in order.
+        """
+        if not all(template.safe for template in templates):
+            return False
+        for previous, following in zip(templates, templates[1:]):
+            if not (previous._neutral_end or following._neutral_start):
+                return False
+        for index, template in enumerate(templates):
+            others = templates[:index] + templates[index + 1:]
+            other_keys = set().union(*(other._keys for other in others))
+            # A skipped placeholder would be replaced because of the key of another part
+            if template._skipped_keys & other_keys:
+                return False
+            other_found_keys = set().union(*(other._found_keys for other in others))
+            # The keys are used as regex, but only the dots match more than one character
+            for dotted_key in (key for key in set(template._keys) if '.' in key):
+                if any(len(key) == len(dotted_key) and key.upper() != dotted_key and
+                       re.fullmatch(dotted_key, key, flags=re.I) for key in other_found_keys):
+                    return False
+            for name in template._names_after():
+                if any(len(key) == len(name) and re.fullmatch(key, name, flags=re.I) for key in other_keys):
+                    return False
+        return True
+
+    @property
+    def keys(self) -> List[str]:
+        """Keys of the placeholders, in upper case, in order of appearance."""
+        return list(self._keys)
+
+    def render(self, parameters: dict) -> Optional[str]:
+        """
+        Joins the literal segments with the values of the placeholders.
+
+        The ``%%`` escapes are kept, as the sequential substitution only replaces them at the end.
+
+        :param parameters: Values of the placeholders, by key in upper case.
+        :return: Rendered content, or None if it may differ from the sequential substitution.
+        """
+        if not self.safe:
+            return None
+        parts = [self._literals[0]]
+        for key, literal in zip(self._keys, self._literals[1:]):
+            value = str(parameters.get(key, ""))
+            if '%' in value or '\\' in value:
+                return None
+            parts.append(value)
+            parts.append(literal)
+        return ''.join(parts)
+
+
+class JoinedTemplate(object):
+    """Templates of consecutive parts, rendered one by one and joined."""
+
+    def __init__(self, templates: List[ScriptTemplate]):
+        self._templates = templates
+
+    def render(self, parameters: dict) -> Optional[str]:
+        """
+        Renders each part and joins them.
+
+        :param parameters: Values of the placeholders, by key in upper case.
+        :return: Rendered content, or None if it may differ from the sequential substitution.
+        """
+        parts = []
+        for template in self._templates:
+            rendered = template.render(parameters)
+            if rendered is None:
+                return None
+            parts.append(rendered)
+        return ''.join(parts)
+
+
+class TemplateCache(object):
+    """
+    Keeps the content of the template files, and the compiled templates of the most recent contents.
+
+    A file is read again when its mtime or size change. It is shared by all the jobs, and
+    can be used from several threads.
+    """
+
+    MAX_COMPILED = 256
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[Tuple[int, int], str]] = dict()
+        self._compiled: 'OrderedDict[Tuple[str, FrozenSet[str]], ScriptTemplate]' = OrderedDict()
+        self._lock = Lock()
+
+    def read(self, path: str) -> str:
+        """
+        Returns the content of a template file.
+
+        :param path: Path to the template file.
+        :return: Content of the file.
+        """
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+        with open(path, 'r') as template_file:
+            content = template_file.read()
+        self._files[path] = (stat_key, content)
+        return content
+
+    def compile(self, content: str, skipped_placeholders: FrozenSet[str]) -> ScriptTemplate:
+        """
+        Returns the compiled template of a content.
+
+        :param content: Template content.
+        :param skipped_placeholders: Placeholders that are not substituted.
+        :return: Compiled template.
+        """
+        key = (content, skipped_placeholders)
+        with self._lock:
+            template = self._compiled.get(key)
+            if template is not None:
+                self._compiled.move_to_end(key)
+                return template
+        template = ScriptTemplate(content, skipped_placeholders)
+        with self._lock:
+            self._compiled[key] = template
+            while len(self._compiled) > self.MAX_COMPILED:
+                self._compiled.popitem(last=False)
+        return template
+
+    def compile_parts(self, content: TemplateContent, skipped_placeholders: FrozenSet[str]) -> Any:
+        """
+        Returns the compiled template of a content joined from several parts.
+
+        Only the parts marked as cached are kept. The whole content is compiled, without caching it,
+        if its parts cannot be rendered separately.
+
+        :param content: Template content, with its parts.
+        :param skipped_placeholders: Placeholders that are not substituted.
+        :return: Compiled template.
+        """
+        templates = [self.compile(part, skipped_placeholders) if cached else ScriptTemplate(part, skipped_placeholders)
+                     for part, cached in zip(content.parts, content.cached)]
+        if ScriptTemplate.separable(templates):
+            return JoinedTemplate(templates)
+        if all(content.cached):
+            return self.compile(str(content), skipped_placeholders)
+        return ScriptTemplate(str(content), skipped_placeholders)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files = dict()
+            self._compiled = OrderedDict()
+
+
+template_cache = TemplateCache()
+
+
+def substitute_placeholders(content: str, parameters: dict, skipped_placeholders: FrozenSet[str],
+                            undefined_variables: Optional[Iterable[str]] = None) -> str:
+    """
+    Replaces the placeholders of a template with the values of the parameters.
+
+    :param content: Template content with placeholders.
+    :param parameters: Values of the placeholders, by key in upper case.
+    :param skipped_placeholders: Placeholders that are not substituted.
+    :param undefined_variables: Names of the variables to remove.
+    :return: Content with the placeholders substituted.
+    """
+    if isinstance(content, TemplateContent):
+        template = template_cache.compile_parts(content, skipped_placeholders)
+    else:
+        template = template_cache.compile(content, skipped_placeholders)
+    rendered = template.render(parameters)
+    if rendered is not None:
+        content = rendered
+        placeholders = []
+    else:
+        placeholders = PLACEHOLDER_PATTERN.findall(content)
+    for placeholder in placeholders:
+        if placeholder in skipped_placeholders:
+            continue
+        key = placeholder[1:-1]
+        value = str(parameters.get(key.upper(), ""))
+        if not value:
+            content = re.sub(r'%(?<!%%)' + key + r'%(?!%%)', '', content, flags=re.I)
+        else:
+            if "\\" in value:
+                value = re.escape(value)
+            content = re.sub(r'%(?<!%%)' + key + r'%(?!%%)', value, content, flags=re.I)
+    if undefined_variables:
+        for variable in undefined_variables:
+            content = re.sub(r'%(?<!%%)' + variable + r'%(?!%%)', '', content, flags=re.I)
+    return content.replace("%%", "%")
+
+
+@dataclass
+class ScriptFile:
+    """
+    A job script, or one of its additional files, ready to be written.
+
+    It only keeps the parameters used by its placeholders.
+    """
+    path: str
+    content: str
+    parameters: Dict[str, Any]
+    skipped_placeholders: FrozenSet[str]
+    undefined_variables: Optional[List[str]]
+    encoding: str
+    executable: bool = False
+
+    @classmethod
+    def build(cls, path: str, content: str, parameters: dict, skipped_placeholders: FrozenSet[str],
+              undefined_variables: Optional[Iterable[str]], encoding: str, executable: bool = False) -> 'ScriptFile':
+        keys = {placeholder[1:-1].upper() for placeholder in PLACEHOLDER_PATTERN.findall(content)}
+        used_parameters = {key: parameters[key] for key in keys if key in parameters}
+        return cls(path, content, used_parameters, skipped_placeholders,
+                   list(undefined_variables) if undefined_variables else None, encoding, executable)
+
+
+def write_scripts(scripts: Iterable[ScriptFile]) -> None:
+    """
+    Substitutes the placeholders of the scripts and writes them.
+
+    :param scripts: Scripts to write.
+    """
+    for script in scripts:
+        content = substitute_placeholders(script.content, script.parameters, script.skipped_placeholders,
+                                          script.undefined_variables)
+        with open(script.path, 'wb') as script_file:
+            script_file.write(content.encode(script.encoding))
+        if script.executable:
+            os.chmod(script.path, 0o755)
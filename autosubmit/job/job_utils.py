@@ -454,7 +454,8 @@ def cancel_jobs(job_list: "JobList", active_jobs_filter=None, target_status=Opti
     It raises ``ValueError`` if the target status is invalid, and returns immediately if the
     filter does not find any "ACTIVE" jobs.
 
-    It will iterate the list of active jobs, sending commands to cancel them (varies per platform).
+    It will iterate the list of active jobs, sending commands to cancel them (varies per platform),
+    all the commands of a platform in one round trip.
     After the command was issued, regardless whether successful or not, it finishes by changing
     the status of the jobs.
 
@@ -483,14 +484,21 @@ def cancel_jobs(job_list: "JobList", active_jobs_filter=None, target_status=Opti
         Log.info(f"No active jobs found for expid {job_list.expid}")
         return
 
+    # Cancel from the remote platforms, the jobs of each platform in one round trip
+    jobs_by_platform = {}
     for job in active_jobs:
-        # Cancel from the remote platform
-        Log.info(f'Cancelling job {job.name} on platform {job.platform.name}')
+        jobs_by_platform.setdefault(job.platform, []).append(job)
+    for platform, platform_jobs in jobs_by_platform.items():
+        for job in platform_jobs:
+            Log.info(f'Cancelling job {job.name} on platform {platform.name}')
         try:
-            job.platform.send_command(f'{job.platform.cancel_cmd} {str(job.id)}', ignore_log=True)
+            platform.send_commands([f'{platform.cancel_cmd} {str(job.id)}' for job in platform_jobs],
+                                   ignore_log=True)
         except Exception as e:
-            Log.warning(f"Failed to cancel job {job.name} on platform {job.platform.name}: {str(e)}")
+            for job in platform_jobs:
+                Log.warning(f"Failed to cancel job {job.name} on platform {platform.name}: {str(e)}")
 
+    for job in active_jobs:
         Log.info(f"Changing status of job {job.name} to {target_status}")
         job.status = Status.KEY_TO_VALUE[target_status]
 
@@ -25,9 +25,13 @@ from autosubmit.config.basicconfig import BasicConfig
 from autosubmit.config.configcommon import AutosubmitConfig
 from autosubmit.config.yamlparser import YAMLParserFactory
 from autosubmit.helpers.utils import restore_platforms
+from autosubmit.history.database_managers.database_manager import connection_pool
 from autosubmit.job.job_utils import _get_submitter
 from autosubmit.log.log import Log, AutosubmitCritical, AutosubmitError
 
+# Files of the history database moved with the experiment: the database, the dump of previous versions and the backup
+JOBDATA_SUFFIXES = (".db", ".sql", "_backup.db")
+
 
 class Migrate:
 
@@ -52,6 +56,7 @@ class Migrate:
             self.experiment_id, self.basic_config, YAMLParserFactory())
         as_conf.reload()
         as_conf.experiment_data["PLATFORMS"] = as_conf.misc_data.get("PLATFORMS",{})
+        as_conf.invalidate_parameters()
         platforms = self.load_platforms_in_use(as_conf)
 
         error = False
@@ -238,37 +243,40 @@ class Migrate:
     def migrate_pickup_jobdata(self):
         # Unarchive job_data_{expid}.tar
         Log.info(f'Unarchiving job_data_{self.experiment_id}.tar')
-        job_data_dir = f"{self.basic_config.JOBDATA_DIR}/job_data_{self.experiment_id}"
-        if os.path.exists(os.path.join(self.basic_config.JOBDATA_DIR, f"{self.experiment_id}_jobdata.tar")):
+        tar_path = os.path.join(self.basic_config.JOBDATA_DIR, f"{self.experiment_id}_jobdata.tar")
+        if os.path.exists(tar_path):
             try:
-                with tarfile.open(os.path.join(self.basic_config.JOBDATA_DIR, f"{self.experiment_id}_jobdata.tar", 'r')) as tar:
-                    tar.extractall(path=job_data_dir)
-                    tar.close()
-                os.remove(os.path.join(self.basic_config.JOBDATA_DIR, f"{self.experiment_id}_jobdata.tar"))
+                with tarfile.open(tar_path, 'r') as tar:
+                    archived = set(tar.getnames())
+                    for suffix in JOBDATA_SUFFIXES:
+                        if f"{self.experiment_id}{suffix}" in archived:
+                            member = tar.getmember(f"{self.experiment_id}{suffix}")
+                            member.name = f"job_data_{self.experiment_id}{suffix}"
+                            tar.extract(member, path=self.basic_config.JOBDATA_DIR)
+                os.remove(tar_path)
             except Exception as e:
                 raise AutosubmitCritical("Can not read tar file", 7012, str(e))
 
     def migrate_offer_jobdata(self):
-        # archive job_data_{expid}.db and job_data_{expid}.sql
-        Log.info(f'Archiving job_data_{self.experiment_id}.db and job_data_{self.experiment_id}.sql')
+        # archive job_data_{expid}.db, job_data_{expid}.sql and job_data_{expid}_backup.db
+        Log.info(f'Archiving job_data_{self.experiment_id}.db, job_data_{self.experiment_id}.sql and '
+                 f'job_data_{self.experiment_id}_backup.db')
         job_data_dir = f"{self.basic_config.JOBDATA_DIR}/job_data_{self.experiment_id}"
         # Creating tar file
         Log.info("Creating tar file ... ")
+        # The changes still in the WAL file are written to the database file before archiving it
+        connection_pool.close(f"{job_data_dir}.db")
         try:
             compress_type = "w"
-            output_filepath = f'{self.experiment_id}_jobdata.tar'
-            db_exists = os.path.exists(f"{job_data_dir}.db")
-            sql_exists = os.path.exists(f"{job_data_dir}.sql")
-            if os.path.exists(os.path.join(self.basic_config.JOBDATA_DIR, output_filepath)) and (db_exists or sql_exists):
-                os.remove(os.path.join(self.basic_config.JOBDATA_DIR, output_filepath))
-            elif db_exists or sql_exists:
-                with tarfile.open(os.path.join(self.basic_config.JOBDATA_DIR, output_filepath), compress_type) as tar:
-                    if db_exists:
-                        tar.add(f"{job_data_dir}.db", arcname=f"{self.experiment_id}.db")
-                    if sql_exists:
-                        tar.add(f"{job_data_dir}.sql", arcname=f"{self.experiment_id}.sql")
-                    tar.close()
-                    os.chmod(os.path.join(self.basic_config.JOBDATA_DIR, output_filepath), 0o775)
+            output_filepath = os.path.join(self.basic_config.JOBDATA_DIR, f'{self.experiment_id}_jobdata.tar')
+            existing_suffixes = [suffix for suffix in JOBDATA_SUFFIXES if os.path.exists(f"{job_data_dir}{suffix}")]
+            if existing_suffixes:
+                if os.path.exists(output_filepath):
+                    os.remove(output_filepath)
+                with tarfile.open(output_filepath, compress_type) as tar:
+                    for suffix in existing_suffixes:
+                        tar.add(f"{job_data_dir}{suffix}", arcname=f"{self.experiment_id}{suffix}")
+                os.chmod(output_filepath, 0o775)
         except Exception as e:
             raise AutosubmitCritical("Can not write tar file", 7012, str(e))
         Log.result("Job data archived successfully")
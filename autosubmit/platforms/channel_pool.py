@@ -0,0 +1,238 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Pool of persistent shell sessions, reused by ``ParamikoPlatform.send_command`` and ``send_commands``."""
+
+import os
+import re
+import select
+import shlex
+import socket
+import time
+from contextlib import suppress
+from threading import BoundedSemaphore, Lock
+from typing import Any, List, Optional, Tuple
+
+from paramiko.ssh_exception import SSHException
+
+
+class PersistentShell(object):
+    """
+    A shell kept open on an SSH channel, that runs the framed commands it receives.
+
+    Each command is run as ``$SHELL -c <command>``, the same as the SSH server does for an
+    exec request, with its standard input closed. Its output and its exit code are
+    followed by a random marker, so the result of each command is known to end there.
+    Several commands can be sent at once, and their results are read in order.
+    """
+
+    def __init__(self, channel: Any, transport: Any = None):
+        """
+        :param channel: Open session channel, or any object with the same API.
+        :param transport: Transport the channel belongs to.
+        """
+        self.channel = channel
+        self.transport = transport
+        self.active = True
+        self.received = False
+        self._stdout = b''
+        self._stderr = b''
+        self.channel.exec_command('/bin/sh')
+
+    @staticmethod
+    def frame(command: str, token: str) -> bytes:
+        """Returns the shell code that runs the command and prints its markers."""
+        return (f'"${{SHELL:-/bin/sh}}" -c {shlex.quote(command)} </dev/null; '
+                f"printf '\\n{token} %d\\n' $?; printf '\\n{token}\\n' >&2\n").encode()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[bytes, bytes, int]:
+        """
+        Runs a command in the shell.
+
+        :param command: Command to run.
+        :param timeout: Seconds to wait for the command, None to wait forever.
+        :return: Output, error output and exit code of the command.
+        :raises socket.timeout: If the command did not finish in time. The shell can't be used anymore.
+        :raises SSHException: If the shell was closed.
+        """
+        return self.run_many([command], timeout)[0]
+
+    def run_many(self, commands: List[str], timeout: Optional[float] = None) -> List[Tuple[bytes, bytes, int]]:
+        """
+        Sends all the commands in one write, and reads their results.
+
+        :param commands: Commands to run, one after another.
+        :param timeout: Seconds to wait for each command, None to wait forever.
+        :return: Output, error output and exit code of each command.
+        :raises socket.timeout: If a command did not finish in time. The shell can't be used anymore.
+        :raises SSHException: If the shell was closed.
+        """
+        tokens = [os.urandom(16).hex() for _ in commands]
+        self.received = False
+        try:
+            self.channel.sendall(b''.join(self.frame(command, token) for command, token in zip(commands, tokens)))
+            return [self._read_result(token.encode(), timeout) for token in tokens]
+        except BaseException:
+            self.close()
+            raise
+
+    def _receive(self) -> bool:
+        got_data = False
+        while self.channel.recv_ready():
+            self._stdout += self.channel.recv(65536)
+            got_data = True
+        while self.channel.recv_stderr_ready():
+            self._stderr += self.channel.recv_stderr(65536)
+            got_data = True
+        self.received = self.received or got_data
+        return got_data
+
+    def _read_result(self, token: bytes, timeout: Optional[float]) -> Tuple[bytes, bytes, int]:
+        stdout_marker = re.compile(b'\n' + token + rb' (-?\d+)\n')
+        stderr_marker = b'\n' + token + b'\n'
+        stdout = stderr = exit_code = None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if stdout is None:
+                match = stdout_marker.search(self._stdout)
+                if match:
+                    stdout, exit_code = self._stdout[:match.start()], int(match.group(1))
+                    self._stdout = self._stdout[match.end():]
+            if stderr is None:
+                position = self._stderr.find(stderr_marker)
+                if position != -1:
+                    stderr = self._stderr[:position]
+                    self._stderr = self._stderr[position + len(stderr_marker):]
+            if stdout is not None and stderr is not None:
+                return stdout, stderr, exit_code
+            if self._receive():
+                continue
+            if self.channel.closed or self.channel.exit_status_ready():
+                raise SSHException("Shell session closed")
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise socket.timeout(f"Command did not finish in {timeout} seconds")
+            select.select([self.channel], [], [], 2 if remaining is None else min(remaining, 2))
+
+    def close(self) -> None:
+        self.active = False
+        with suppress(Exception):
+            self.channel.close()
+
+
+class ChannelPool(object):
+    """
+    Keeps up to ``size`` persistent shells open on the transport of a platform.
+
+    Opening a channel for each command costs a round trip and a new session on the server.
+    The shells are reused instead, one command at a time each, and the pool blocks when all
+    of them are busy. Shells of a previous transport are closed when the transport changes,
+    and shells closed by the server while idle are discarded.
+    """
+
+    def __init__(self, size: int):
+        """
+        :param size: Maximum number of shells open at the same time.
+        """
+        self.size = size
+        self._idle: List[PersistentShell] = []
+        self._lock = Lock()
+        self._slots = BoundedSemaphore(size)
+
+    def __getstate__(self):
+        # Only the size is kept, e.g. when the platform is copied to the log recovery process
+        return {'size': self.size}
+
+    def __setstate__(self, state):
+        self.__init__(state['size'])
+
+    def _take(self, transport: Any) -> Optional[PersistentShell]:
+        with self._lock:
+            usable = [shell for shell in self._idle if self._usable(shell, transport)]
+            stale = [shell for shell in self._idle if not self._usable(shell, transport)]
+            shell = usable.pop() if usable else None
+            self._idle = usable
+        for stale_shell in stale:
+            stale_shell.close()
+        return shell
+
+    @staticmethod
+    def _usable(shell: PersistentShell, transport: Any) -> bool:
+        return shell.active and not shell.channel.closed and shell.transport is transport
+
+    @staticmethod
+    def _open(transport: Any) -> Optional[PersistentShell]:
+        channel = None
+        try:
+            channel = transport.open_session()
+            return PersistentShell(channel, transport)
+        except SSHException:
+            if channel is not None:
+                with suppress(Exception):
+                    channel.close()
+            return None
+
+    def run(self, transport: Any, command: str, timeout: Optional[float] = None) -> Optional[Tuple[bytes, bytes, int]]:
+        """
+        Runs a command in one of the shells of the pool.
+
+        :param transport: Transport where the shells are opened.
+        :param command: Command to run.
+        :param timeout: Seconds to wait for the command, None to wait forever.
+        :return: Output, error output and exit code, or None if no shell could be opened, e.g.
+            because the server limits the sessions per connection.
+        """
+        results = self.run_many(transport, [command], timeout)
+        return None if results is None else results[0]
+
+    def run_many(self, transport: Any, commands: List[str],
+                 timeout: Optional[float] = None) -> Optional[List[Tuple[bytes, bytes, int]]]:
+        """
+        Runs several commands in one of the shells of the pool, sent in a single round trip.
+
+        :param transport: Transport where the shells are opened.
+        :param commands: Commands to run, one after another.
+        :param timeout: Seconds to wait for each command, None to wait forever.
+        :return: Output, error output and exit code of each command, or None if no shell could be opened.
+        """
+        with self._slots:
+            results = None
+            shell = self._take(transport)
+            if shell is not None:
+                try:
+                    results = shell.run_many(commands, timeout)
+                except (SSHException, OSError) as e:
+                    # The server closed the shell before it answered anything, not even the end
+                    # marker of the first command, so the commands are sent again to a new shell
+                    if isinstance(e, socket.timeout) or shell.received:
+                        raise
+                    shell = None
+            if shell is None:
+                shell = self._open(transport)
+                if shell is None:
+                    return None
+                results = shell.run_many(commands, timeout)
+            with self._lock:
+                self._idle.append(shell)
+            return results
+
+    def close(self) -> None:
+        """Closes the idle shells."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for shell in idle:
+            shell.close()
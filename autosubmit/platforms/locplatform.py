@@ -20,7 +20,7 @@ import os
 import subprocess
 from pathlib import Path
 from time import sleep
-from typing import Union, TYPE_CHECKING
+from typing import Any, Dict, List, Union, TYPE_CHECKING
 
 from autosubmit.config.basicconfig import BasicConfig
 from autosubmit.log.log import Log, AutosubmitError
@@ -318,6 +318,30 @@ class LocalPlatform(ParamikoPlatform):
         """
         return
 
+    def get_files_in_bulk(self, files: Dict[str, str]) -> List[str]:
+        """
+        Overriding the parent's implementation.
+        The files are copied one by one, as they are already in the local platform.
+
+        :param files: for each file name, the path inside the tmp folder to copy it to
+        :type files: dict
+        :return: names of the files not found
+        :rtype: list
+        """
+        return super(ParamikoPlatform, self).get_files_in_bulk(files)
+
+    def retrieve_logfiles_in_bulk(self, jobs: List[Any]) -> List[Any]:
+        """
+        Overriding the parent's implementation.
+        Do nothing because the log files are already in the local platform, and the jobs recover them one by one.
+
+        :param jobs: Jobs whose logs are retrieved.
+        :type jobs: List[Job]
+        :return: The same jobs.
+        :rtype: List[Job]
+        """
+        return jobs
+
     def check_completed_files(self, sections: str = None) -> str:
         """
         Checks for completed files in the remote log directory.
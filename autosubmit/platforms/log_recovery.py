@@ -0,0 +1,269 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Pool of threads that recovers the logs of the jobs, used by ``Platform.recover_platform_job_logs``."""
+
+import heapq
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import count
+from threading import Thread
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from autosubmit.log.log import Log
+from autosubmit.platforms.polling import backoff_time
+
+if TYPE_CHECKING:
+    from autosubmit.config.configcommon import AutosubmitConfig
+    from autosubmit.job.job import Job
+    from autosubmit.platforms.platform import Platform
+
+
+class LogRecoveryPool(object):
+    """
+    Recovers the logs of the jobs sent by the main process, with a bounded number of threads.
+
+    It waits for events instead of polling: a job in the recovery queue, the end of the
+    recovery of some jobs, a retry that is due, the cleanup signal, or the keep alive deadline.
+    The jobs received together are recovered in bulk, split among the threads, which share
+    the connection of the platform. A job already being recovered is not recovered twice, and
+    a job whose logs could not be recovered is retried later, with an exponential backoff.
+    """
+
+    # Seconds to wait for more jobs after receiving one, to recover them together
+    BATCH_WINDOW = 1.0
+
+    def __init__(self, platform: 'Platform', as_conf: 'AutosubmitConfig', workers: int,
+                 keep_alive_timeout: float, max_retries: int = 5):
+        """
+        :param platform: Platform of the log recovery process, with its recovery queue and events.
+        :param as_conf: Autosubmit configuration object.
+        :param workers: Maximum number of threads recovering logs at the same time.
+        :param keep_alive_timeout: Seconds to wait for the keep alive signal of the main process.
+        :param max_retries: Maximum number of times the recovery of the logs of a job is retried.
+        """
+        self.platform = platform
+        self.as_conf = as_conf
+        self.workers = max(1, workers)
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_retries = max_retries
+        self.identifier = f"{platform.name.lower()}(log_recovery):"
+        self._events: queue.Queue = queue.Queue()
+        self._in_flight: Set[Tuple[str, int]] = set()
+        self._running = 0
+        self._retries: Dict[Tuple[str, int], int] = dict()
+        self._retry_timers: List[Tuple[float, int, 'Job']] = []
+        self._retry_order = count()
+        self._reconnect = False
+        self._cleanup = False
+
+    @staticmethod
+    def _key(job: 'Job') -> Tuple[str, int]:
+        return job.name, job.fail_count
+
+    def _feed_jobs(self) -> None:
+        """Moves the jobs of the recovery queue to the events, blocking until each one arrives."""
+        while True:
+            try:
+                loaded_data = self.platform.recovery_queue.get()
+            except (EOFError, OSError):  # The main process is gone
+                self._events.put(('cleanup', None))
+                return
+            # An empty item is sent when the cleanup event is set
+            self._events.put(('job', loaded_data) if loaded_data is not None else ('wake', None))
+
+    def _load_job(self, loaded_data: Any) -> 'Job':
+        from autosubmit.job.job import Job
+        job = Job(loaded_data=loaded_data)
+        job.platform_name = self.platform.name  # Change the original platform to this process platform.
+        job.platform = self.platform
+        job._log_recovery_retries = 0
+        return job
+
+    def _receive(self, loaded_data: List[Any]) -> None:
+        """Recovers the logs of the jobs received, except the ones already being recovered."""
+        jobs = []
+        for data in loaded_data:
+            job = self._load_job(data)
+            key = self._key(job)
+            if key in self._in_flight:
+                Log.debug(f"{self.identifier} The log of job '{job.name}' and retry '{job.fail_count}' is already "
+                          f"being recovered")
+                continue
+            self._in_flight.add(key)
+            self._retries[key] = 0
+            jobs.append(job)
+        self._dispatch(jobs)
+
+    def _dispatch(self, jobs: List['Job']) -> None:
+        """Splits the jobs among the threads."""
+        if len(jobs) == 0:
+            return
+        if self._reconnect and self._running == 0:
+            self._restore_connection()
+        size = -(-len(jobs) // self.workers)
+        for start in range(0, len(jobs), size):
+            batch = jobs[start:start + size]
+            self._running += 1
+            future = self._executor.submit(self._recover, batch)
+            future.add_done_callback(lambda done, batch=batch: self._events.put(('done', (batch, done))))
+
+    def _recover(self, jobs: List['Job']) -> List['Job']:
+        """Recovers the logs of the jobs, and returns the ones that failed."""
+        try:
+            pending = self.platform.retrieve_logfiles_in_bulk(jobs)
+        except Exception as e:
+            Log.debug(f"{self.identifier} Failed to recover the logs in bulk, recovering them one by one: {str(e)}")
+            pending = jobs
+        failed = []
+        for job in pending:
+            try:
+                job.retrieve_logfiles(raise_error=True)
+            except Exception:
+                failed.append(job)
+        return failed
+
+    def _finish(self, jobs: List['Job'], done: Future) -> None:
+        """Schedules the retries of the jobs whose logs could not be recovered."""
+        self._running -= 1
+        try:
+            failed = done.result()
+        except Exception as e:
+            Log.debug(f"{self.identifier} {str(e)}")
+            failed = jobs
+        failed_keys = set(self._key(job) for job in failed)
+        for job in jobs:
+            key = self._key(job)
+            if key not in failed_keys:
+                if self._retries.get(key):
+                    Log.result(f"{self.identifier} (Retry) Successfully recovered log for job '{job.name}' and "
+                               f"retry '{job.fail_count}'.")
+                self._forget(key)
+                continue
+            self._reconnect = True
+            retries = self._retries.get(key, 0) + 1
+            job._log_recovery_retries = retries
+            if retries > self.max_retries:
+                Log.warning(f"{self.identifier} Failed to recover log for job '{job.name}' and retry "
+                            f"'{job.fail_count}', giving up after {self.max_retries} retries.")
+                self._forget(key)
+                continue
+            Log.warning(f"{self.identifier} (Retry) Failed to recover log for job '{job.name}' and retry "
+                        f"'{job.fail_count}'.")
+            self._retries[key] = retries
+            due = time.monotonic() + (0 if self._cleanup else backoff_time(retries - 1))
+            heapq.heappush(self._retry_timers, (due, next(self._retry_order), job))
+
+    def _forget(self, key: Tuple[str, int]) -> None:
+        self._in_flight.discard(key)
+        self._retries.pop(key, None)
+
+    def _retry_due(self) -> None:
+        now = time.monotonic()
+        jobs = []
+        while self._retry_timers and (self._cleanup or self._retry_timers[0][0] <= now):
+            jobs.append(heapq.heappop(self._retry_timers)[2])
+        self._dispatch(jobs)
+
+    def _restore_connection(self) -> None:
+        self._reconnect = False
+        try:
+            self.platform.restore_connection(self.as_conf, log_recovery_process=True)
+        except Exception as e:
+            Log.warning(f"{self.identifier} Could not restore the connection: {str(e)}")
+
+    def _next_timeout(self, keep_alive_deadline: float) -> Optional[float]:
+        deadlines = [] if self._cleanup else [keep_alive_deadline]
+        if self._retry_timers:
+            deadlines.append(self._retry_timers[0][0])
+        if len(deadlines) == 0:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _drain_events(self) -> List[Any]:
+        """Returns the jobs already received. Other events are put back."""
+        loaded_data = []
+        others = []
+        while True:
+            try:
+                kind, data = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'job':
+                loaded_data.append(data)
+            else:
+                others.append((kind, data))
+        for event in others:
+            self._events.put(event)
+        return loaded_data
+
+    def _collect_batch(self, loaded_data: List[Any]) -> List[Any]:
+        """Waits a little for more jobs, to recover them together. Other events are put back."""
+        others = []
+        deadline = time.monotonic() + self.BATCH_WINDOW
+        while not self._cleanup:
+            try:
+                kind, data = self._events.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if kind == 'job':
+                loaded_data.append(data)
+            else:
+                others.append((kind, data))
+                if kind != 'done':
+                    break
+        for event in others:
+            self._events.put(event)
+        return loaded_data
+
+    def run(self) -> None:
+        """
+        Recovers logs until the cleanup signal arrives, or the main process stops sending the
+        keep alive signal. On cleanup, the jobs still in the recovery queue are recovered too.
+        """
+        Thread(target=self._feed_jobs, name=f"{self.platform.name}_log_recovery_queue", daemon=True).start()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix=f"{self.platform.name}_log_recovery")
+        keep_alive_deadline = time.monotonic() + self.keep_alive_timeout
+        try:
+            while True:
+                self._retry_due()
+                if self._cleanup and self._running == 0 and not self._retry_timers:
+                    break
+                if not self._cleanup and time.monotonic() >= keep_alive_deadline:
+                    if not self.platform.work_event.is_set():
+                        Log.info(f"{self.identifier} No keep alive signal in {self.keep_alive_timeout} seconds.")
+                        break
+                    self.platform.work_event.clear()
+                    keep_alive_deadline = time.monotonic() + self.keep_alive_timeout
+                    continue
+                try:
+                    kind, data = self._events.get(timeout=self._next_timeout(keep_alive_deadline))
+                except queue.Empty:
+                    continue
+                if kind == 'job':
+                    self._receive(self._collect_batch([data]))
+                elif kind == 'done':
+                    self._finish(*data)
+                elif not self._cleanup and (kind == 'cleanup' or self.platform.cleanup_event.is_set()):
+                    # The main process is waiting for this process to end. The jobs it sent before are
+                    # already received, as they were queued before the wake up.
+                    self._cleanup = True
+                    self._receive(self._drain_events())
+        finally:
+            self._executor.shutdown(wait=True)
@@ -22,15 +22,18 @@ import os
 import random
 import re
 import select
+import shlex
+import shutil
 import socket
 import sys
+import tarfile
 import threading
 import time
 from contextlib import suppress
 from pathlib import Path
 from threading import Thread
 from time import sleep
-from typing import List, TYPE_CHECKING, Union
+from typing import Dict, List, Optional, TYPE_CHECKING, Union
 
 import Xlib.support.connect as xlib_connect
 import paramiko
@@ -40,7 +43,9 @@ from paramiko.ssh_exception import (SSHException)
 from autosubmit.job.job_common import Status
 from autosubmit.job.job_common import Type
 from autosubmit.log.log import AutosubmitError, AutosubmitCritical, Log
+from autosubmit.platforms.channel_pool import ChannelPool
 from autosubmit.platforms.platform import Platform
+from autosubmit.platforms.polling import backoff_time
 
 if TYPE_CHECKING:
     # Avoid circular imports
@@ -69,12 +74,37 @@ def _create_ssh_client() -> paramiko.SSHClient:
     return ssh
 
 
+class _ChannelWriter(object):
+    """Writes to a channel, as the file object of a streamed tar archive."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def write(self, data: bytes) -> int:
+        self.channel.sendall(data)
+        return len(data)
+
+
+class _ChannelReader(object):
+    """Reads from a channel, as the file object of a streamed tar archive."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def read(self, size: int = 65536) -> bytes:
+        return self.channel.recv(size)
+
+
 # noinspection PyMethodParameters
 class ParamikoPlatform(Platform):
     """
     Class to manage the connections to the different platforms with the Paramiko library.
     """
 
+    # Files removed by each command of delete_files, to keep the command line short
+    DELETE_FILES_BATCH = 500
+    GET_FILES_BATCH = 500
+
     def __init__(self, expid, name, config, auth_password = None):
         """
 
@@ -99,6 +129,9 @@ class ParamikoPlatform(Platform):
         self._ftpChannel = None
         self.transport = None
         self.channels = {}
+        # Persistent shells reused by send_command, disabled with CHANNEL_POOL_SIZE: 0
+        channel_pool_size = int(self.config.get("PLATFORMS", {}).get(self.name.upper(), {}).get("CHANNEL_POOL_SIZE", 0))
+        self._channel_pool = ChannelPool(channel_pool_size) if channel_pool_size > 0 else None
         if sys.platform != "linux":
             self.poller = select.kqueue()
         else:
@@ -485,6 +518,103 @@ class ParamikoPlatform(Platform):
                 'Send file failed. Connection seems to no be active', 6004)
 
 
+    def _upload_files(self, filenames: List[str]) -> None:
+        """
+        Sends the files in a tar archive streamed to ``tar -x`` on the platform, through one channel,
+        instead of one SFTP put and chmod per file. The permissions of the files are kept. If the
+        archive can't be extracted, e.g. because ``tar`` is not available, the files are sent one by one.
+
+        :param filenames: names of the files to send, relative to the local tmp folder
+        :type filenames: list
+        """
+        if len(filenames) == 0:
+            return
+        try:
+            self._stream_files(filenames)
+            return
+        except (AttributeError, OSError, SSHException, AutosubmitError) as e:
+            Log.debug(f'Could not send the files in a tar archive, sending them one by one: {str(e)}')
+        super()._upload_files(filenames)
+
+    def _stream_files(self, filenames: List[str]) -> None:
+        files_path = shlex.quote(self.get_files_path())
+        channel = self.transport.open_session()
+        try:
+            channel.settimeout(60 * 2)
+            channel.exec_command(f'mkdir -p {files_path} && cd {files_path} && tar -xpf -')
+            with tarfile.open(fileobj=_ChannelWriter(channel), mode='w|') as tar:
+                for filename in filenames:
+                    tar.add(os.path.join(self.tmp_path, filename), arcname=os.path.basename(filename),
+                            recursive=False)
+            channel.shutdown_write()
+            exit_status = channel.recv_exit_status()
+            error = b''
+            while channel.recv_stderr_ready():
+                error += channel.recv_stderr(65536)
+        finally:
+            channel.close()
+        if exit_status != 0:
+            raise AutosubmitError(f'Could not extract the files in {self.get_files_path()}', 6004,
+                                  error.decode(errors='replace'))
+
+    def get_files_in_bulk(self, files: Dict[str, str]) -> List[str]:
+        """
+        Copies several files from the platform to experiment's tmp folder, in a tar archive created on the
+        platform and streamed through one channel per ``GET_FILES_BATCH`` files, instead of one SFTP request
+        per file. If the archive can't be created, the files are copied one by one.
+
+        :param files: for each file name, relative to the LOG directory of the platform, the path inside
+            the tmp folder to copy it to
+        :type files: dict
+        :return: names of the files not found on the platform, whose local copies are removed
+        :rtype: list
+        """
+        filenames = list(files)
+        missing = []
+        try:
+            for start in range(0, len(filenames), self.GET_FILES_BATCH):
+                missing += self._stream_remote_files({filename: files[filename] for filename
+                                                      in filenames[start:start + self.GET_FILES_BATCH]})
+        except (AttributeError, OSError, SSHException, tarfile.TarError, AutosubmitError) as e:
+            Log.debug(f'Could not get the files in a tar archive, getting them one by one: {str(e)}')
+            return super().get_files_in_bulk(files)
+        return missing
+
+    def _stream_remote_files(self, files: Dict[str, str]) -> List[str]:
+        quoted_filenames = ' '.join(shlex.quote(filename) for filename in files)
+        # Only the files that exist are archived, the rest are missing
+        command = (f'cd {shlex.quote(self.get_files_path())} && set -- && for f in {quoted_filenames}; do '
+                   f'if [ -f "$f" ]; then set -- "$@" "$f"; fi; done; '
+                   f'if [ $# -gt 0 ]; then tar -cf - -- "$@"; else tar -cf - -T /dev/null; fi')
+        found = set()
+        channel = self.transport.open_session()
+        try:
+            channel.settimeout(60 * 2)
+            channel.exec_command(command)
+            with tarfile.open(fileobj=_ChannelReader(channel), mode='r|') as tar:
+                for member in tar:
+                    if not member.isfile() or member.name not in files:
+                        continue
+                    local_path = os.path.join(self.tmp_path, files[member.name])
+                    os.makedirs(local_path, exist_ok=True)
+                    with tar.extractfile(member) as source, open(os.path.join(local_path, member.name), 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                    found.add(member.name)
+            exit_status = channel.recv_exit_status()
+            error = b''
+            while channel.recv_stderr_ready():
+                error += channel.recv_stderr(65536)
+        finally:
+            channel.close()
+        if exit_status != 0:
+            raise AutosubmitError(f'Could not archive the files in {self.get_files_path()}', 6004,
+                                  error.decode(errors='replace'))
+        missing = [filename for filename in files if filename not in found]
+        for filename in missing:
+            with suppress(FileNotFoundError):
+                os.remove(os.path.join(self.tmp_path, files[filename], filename))
+        return missing
+
     def get_list_of_files(self):
         return self._ftpChannel.get(self.get_files_path)
 
@@ -557,6 +687,34 @@ class ParamikoPlatform(Platform):
                 raise AutosubmitCritical(
                     "Wrong User or invalid .ssh/config. Or invalid user in the definition of PLATFORMS in YAML or public key not set ", 7051, str(e))
 
+    def delete_files(self, filenames: List[str]) -> Dict[str, bool]:
+        """
+        Deletes several files from this platform with one ``rm -f`` per ``DELETE_FILES_BATCH`` files,
+        instead of one SFTP request per file
+
+        :param filenames: file names, relative to the remote log directory
+        :type filenames: list
+        :return: for each file, True if it was removed, False if it did not exist or could not be removed
+        :rtype: dict
+        """
+        if not filenames:
+            return {}
+        files_path = shlex.quote(self.get_files_path())
+        commands = []
+        for start in range(0, len(filenames), self.DELETE_FILES_BATCH):
+            quoted_filenames = ' '.join(shlex.quote(filename)
+                                        for filename in filenames[start:start + self.DELETE_FILES_BATCH])
+            # Only the files that existed are printed
+            commands.append(f'cd {files_path} && for f in {quoted_filenames}; do '
+                            f'if [ -e "$f" ] || [ -L "$f" ]; then rm -f -- "$f" && printf \'%s\\n\' "$f"; fi; done')
+        try:
+            outputs = self.send_commands(commands, ignore_log=True)
+        except AutosubmitError as e:
+            Log.debug(f'Could not remove the files in one command, removing them one by one: {e.message}')
+            return super().delete_files(filenames)
+        removed = {line for output in outputs for line in output.splitlines()}
+        return {filename: filename in removed for filename in filenames}
+
     def move_file(self, src, dest, must_exist=False):
         """
         Moves a file on the platform (includes .err and .out)
@@ -675,7 +833,17 @@ class ParamikoPlatform(Platform):
         """
         raise NotImplementedError
 
-    def job_is_over_wallclock(self, job, job_status, cancel=False):
+    def job_is_over_wallclock(self, job, job_status, cancel=False, jobs_to_cancel=None):
+        """
+        Checks the completion of a job over its wallclock, and cancels it if it failed.
+
+        :param job: Job to check.
+        :param job_status: Current status of the job.
+        :param cancel: Cancel the job if it is over its wallclock and failed.
+        :param jobs_to_cancel: If given, the job is added to it instead, so the caller cancels
+            all of them in one round trip with ``cancel_jobs``.
+        :return: Status of the job.
+        """
         if job.is_over_wallclock():
             try:
                 job.platform.get_completed_files(job.name)
@@ -684,7 +852,9 @@ class ParamikoPlatform(Platform):
                 job_status = Status.FAILED
                 Log.debug(f"Unexpected error checking completed files for a job over wallclock: {str(e)}")
 
-            if cancel and job_status is Status.FAILED:
+            if cancel and job_status is Status.FAILED and jobs_to_cancel is not None:
+                jobs_to_cancel.append(job)
+            elif cancel and job_status is Status.FAILED:
                 try:
                     if self.cancel_cmd is not None:
                         Log.warning(f"Job {job.id} is over wallclock, cancelling job")
@@ -693,6 +863,22 @@ class ParamikoPlatform(Platform):
                     Log.debug(f"Error cancelling job {job.id}: {str(e)}")
         return job_status
 
+    def cancel_jobs(self, jobs: List['Job'], reason: str = '') -> None:
+        """
+        Cancels several jobs in one round trip.
+
+        :param jobs: Jobs to cancel.
+        :param reason: Why they are cancelled, for the log.
+        """
+        if not jobs or self.cancel_cmd is None:
+            return
+        for job in jobs:
+            Log.warning(f"Job {job.id} {reason}, cancelling job" if reason else f"Cancelling job {job.id}")
+        try:
+            self.send_commands([f"{self.cancel_cmd} {job.id}" for job in jobs], ignore_log=True)
+        except Exception as e:
+            Log.debug(f"Error cancelling jobs {', '.join(str(job.id) for job in jobs)}: {str(e)}")
+
     def check_job(self, job, default_status=Status.COMPLETED, retries=5, submit_hold_check=False, is_wrapper=False):
         """
         Checks job running status
@@ -719,16 +905,17 @@ class ParamikoPlatform(Platform):
             Log.error(
                 'check_job() The job id ({0}) is not an integer neither a string.', job_id)
             job.new_status = job_status
-        sleep_time = 5
-        sleep(2)
+        attempt = 0
+        self.wait_for_submitted_jobs(2)
         self.send_command(self.get_checkjob_cmd(job_id))
         while self.get_ssh_output().strip(" ") == "" and retries > 0:
             retries = retries - 1
+            sleep_time = backoff_time(attempt)
+            attempt += 1
             Log.debug('Retrying check job command: {0}', self.get_checkjob_cmd(job_id))
             Log.debug('retries left {0}', retries)
-            Log.debug('Will be retrying in {0} seconds', sleep_time)
+            Log.debug('Will be retrying in {0:.1f} seconds', sleep_time)
             sleep(sleep_time)
-            sleep_time = sleep_time + 5
             self.send_command(self.get_checkjob_cmd(job_id))
         if retries >= 0:
             Log.debug('Successful check job command: {0}', self.get_checkjob_cmd(job_id))
@@ -839,8 +1026,8 @@ class ParamikoPlatform(Platform):
         remote_logs = as_conf.get_copy_remote_logs()
         job_list_cmd = self.parse_joblist(job_list)
         cmd = self.get_checkAlljobs_cmd(job_list_cmd)
-        sleep_time = 5
-        sleep(sleep_time)
+        attempt = 0
+        self.wait_for_submitted_jobs(5)
         slurm_error = False
         e_msg = ""
         try:
@@ -856,33 +1043,38 @@ class ParamikoPlatform(Platform):
                     e_msg = e.error_message
                     slurm_error = True
                     break
+                sleep_time = backoff_time(attempt)
+                attempt += 1
                 Log.debug('Retrying check job command: {0}', cmd)
                 Log.debug('retries left {0}', retries)
-                Log.debug('Will be retrying in {0} seconds', sleep_time)
+                Log.debug('Will be retrying in {0:.1f} seconds', sleep_time)
                 retries -= 1
                 sleep(sleep_time)
-                sleep_time = sleep_time + 5
 
         job_list_status = self.get_ssh_output()
+        jobs_status = self.parse_jobs_status(job_list_status)
         if retries >= 0:
             Log.debug('Successful check job command')
             in_queue_jobs = []
             list_queue_jobid = ""
+            over_wallclock_jobs = []
             for job,job_prev_status in job_list:
                 if not slurm_error:
                     job_id = job.id
-                    job_status = self.parse_Alljobs_output(job_list_status, job_id)
+                    job_status = self._get_job_status(job_list_status, jobs_status, job_id)
                     while len(job_status) <= 0 and retries >= 0:
                         retries -= 1
                         self.send_command(cmd)
                         job_list_status = self.get_ssh_output()
-                        job_status = self.parse_Alljobs_output(job_list_status, job_id)
+                        jobs_status = self.parse_jobs_status(job_list_status)
+                        job_status = self._get_job_status(job_list_status, jobs_status, job_id)
                         if len(job_status) <= 0:
+                            sleep_time = backoff_time(attempt)
+                            attempt += 1
                             Log.debug('Retrying check job command: {0}', cmd)
                             Log.debug('retries left {0}', retries)
-                            Log.debug('Will be retrying in {0} seconds', sleep_time)
+                            Log.debug('Will be retrying in {0:.1f} seconds', sleep_time)
                             sleep(sleep_time)
-                            sleep_time = sleep_time + 5
                     # URi: define status list in HPC Queue Class
                 else:
                     job_status = job.status
@@ -893,7 +1085,8 @@ class ParamikoPlatform(Platform):
                     if job.wallclock == "00:00":
                         wallclock = job.platform.max_wallclock
                     if wallclock != "00:00" and wallclock != "00:00:00" and wallclock != "":
-                        job_status = self.job_is_over_wallclock(job, job_status, cancel=True)
+                        job_status = self.job_is_over_wallclock(job, job_status, cancel=True,
+                                                                jobs_to_cancel=over_wallclock_jobs)
                 if job_status in self.job_status['COMPLETED']:
                     job_status = Status.COMPLETED
                 elif job_status in self.job_status['RUNNING']:
@@ -915,6 +1108,7 @@ class ParamikoPlatform(Platform):
                     Log.error(
                         'check_job() The job id ({0}) status is {1}.', job.id, job_status)
                 job.new_status = job_status
+            self.cancel_jobs(over_wallclock_jobs, 'is over wallclock')
             self.get_queue_status(in_queue_jobs,list_queue_jobid,as_conf)
         else:
             for job, job_prev_status in job_list:
@@ -1130,6 +1324,117 @@ class ParamikoPlatform(Platform):
         thread.start()
         return thread
 
+    def _read_command_output(self, command: str, timeout: Union[int, None], x11: bool, lang: str):
+        """
+        Executes a command in a new channel and reads its output until it finishes.
+
+        :param command: Command to execute.
+        :param timeout: Seconds to wait for data, None to wait forever.
+        :param x11: Whether the command uses X11 forwarding.
+        :param lang: Encoding of the output.
+        :return: Chunks of the output and of the error output.
+        :rtype: tuple[list[bytes], list[bytes]]
+        """
+        stderr_readlines = []
+        stdout_chunks = []
+        stdin, stdout, stderr = self.exec_command(command, x11=x11)
+        channel = stdout.channel
+        if not x11:
+            channel.settimeout(timeout)
+            stdin.close()
+            channel.shutdown_write()
+            stdout_chunks.append(stdout.channel.recv(len(stdout.channel.in_buffer)))
+
+        aux_stderr = []
+        i = 0
+        x11_exit = False
+
+        while (not channel.closed or channel.recv_ready() or channel.recv_stderr_ready() ) and not x11_exit:
+            # stop if channel was closed prematurely, and there is no data in the buffers.
+            got_chunk = False
+            readq, _, _ = select.select([stdout.channel], [], [], 2)
+            for c in readq:
+                if c.recv_ready():
+                    stdout_chunks.append(
+                        stdout.channel.recv(len(c.in_buffer)))
+                    got_chunk = True
+                if c.recv_stderr_ready():
+                    # make sure to read stderr to prevent stall
+                    stderr_readlines.append(
+                        stderr.channel.recv_stderr(len(c.in_stderr_buffer)))
+                    got_chunk = True
+            if x11:
+                if len(stderr_readlines) > 0:
+                    aux_stderr.extend(stderr_readlines)
+                    for stderr_line in stderr_readlines:
+                        stderr_line = stderr_line.decode(lang)
+                        if "salloc" in stderr_line: # salloc is the command to allocate resources in slurm, for pjm it is different
+                            job_id = re.findall(r'\d+', stderr_line)
+                            if job_id:
+                                stdout_chunks.append(job_id[0].encode(lang))
+                                x11_exit = True
+                else:
+                    x11_exit = True
+                if not x11_exit:
+                    stderr_readlines = []
+                else:
+                    stderr_readlines = aux_stderr
+            if not got_chunk and stdout.channel.exit_status_ready() and not stderr.channel.recv_stderr_ready() and not stdout.channel.recv_ready():
+                # indicate that we're not going to read from this channel anymore
+                stdout.channel.shutdown_read()
+                # close the channel
+                stdout.channel.close()
+                break
+        # close all the pseudo files
+        if not x11:
+            stdout.close()
+            stderr.close()
+        return stdout_chunks, stderr_readlines
+
+    def _process_command_output(self, command: str, stdout_chunks: List[bytes], stderr_readlines: List[bytes],
+                                lang: str, ignore_log: bool) -> None:
+        """
+        Stores the output of a command and raises an error if its error output shows that it failed.
+
+        :param command: Command executed.
+        :param stdout_chunks: Chunks of the output.
+        :param stderr_readlines: Chunks of the error output.
+        :param lang: Encoding of the output.
+        :param ignore_log: Do not log the error output.
+        """
+        self._ssh_output = ""
+        self._ssh_output_err = ""
+        for s in stdout_chunks:
+            if s.decode(lang) != '':
+                self._ssh_output += s.decode(lang)
+        for errorLineCase in stderr_readlines:
+            self._ssh_output_err += errorLineCase.decode(lang)
+
+            errorLine = errorLineCase.lower().decode(lang)
+             # to be simplified in the future in a function and using in. The errors should be inside the class of the platform not here
+            if "not active" in errorLine:
+                raise AutosubmitError(
+                    'SSH Session not active, will restart the platforms', 6005)
+            if errorLine.find("command not found") != -1:
+                raise AutosubmitError(
+                    f"A platform command was not found. This may be a temporary issue. "
+                    f"Please verify that the correct scheduler is specified for this platform: '{self.name}.{self.type}'.",
+                    7052,
+                    self._ssh_output_err
+                )
+            elif errorLine.find("syntax error") != -1:
+                raise AutosubmitCritical("Syntax error",7052,self._ssh_output_err)
+            elif errorLine.find("refused") != -1 or errorLine.find("slurm_persist_conn_open_without_init") != -1 or errorLine.find("slurmdbd") != -1 or errorLine.find("submission failed") != -1 or errorLine.find("git clone") != -1 or errorLine.find("sbatch: error: ") != -1 or errorLine.find("not submitted") != -1 or errorLine.find("invalid") != -1 or "[ERR.] PJM".lower() in errorLine:
+                if "salloc: error" in errorLine or "salloc: unrecognized option" in errorLine or "[ERR.] PJM".lower() in errorLine or (self._submit_command_name == "sbatch" and (errorLine.find("policy") != -1 or errorLine.find("invalid") != -1) ) or (self._submit_command_name == "sbatch" and errorLine.find("argument") != -1) or (self._submit_command_name == "bsub" and errorLine.find("job not submitted") != -1) or self._submit_command_name == "ecaccess-job-submit" or self._submit_command_name == "qsub ":
+                    raise AutosubmitError(errorLine, 7014, "Bad Parameters.")
+                raise AutosubmitError(f'Command {command} in {self.host} warning: {self._ssh_output_err}', 6005)
+
+        if not ignore_log:
+            if len(stderr_readlines) > 0:
+                Log.printlog(f'Command {command} in {self.host} warning: {self._ssh_output_err}', 6006)
+            else:
+                pass
+
     def send_command(self, command, ignore_log=False, x11 = False):
         """
         Sends given command to HPC
@@ -1156,92 +1461,17 @@ class ParamikoPlatform(Platform):
         stdout_chunks = []
 
         try:
-            stdin, stdout, stderr = self.exec_command(command, x11=x11)
-            channel = stdout.channel
-            if not x11:
-                channel.settimeout(timeout)
-                stdin.close()
-                channel.shutdown_write()
-                stdout_chunks.append(stdout.channel.recv(len(stdout.channel.in_buffer)))
-
-            aux_stderr = []
-            i = 0
-            x11_exit = False
-
-            while (not channel.closed or channel.recv_ready() or channel.recv_stderr_ready() ) and not x11_exit:
-                # stop if channel was closed prematurely, and there is no data in the buffers.
-                got_chunk = False
-                readq, _, _ = select.select([stdout.channel], [], [], 2)
-                for c in readq:
-                    if c.recv_ready():
-                        stdout_chunks.append(
-                            stdout.channel.recv(len(c.in_buffer)))
-                        got_chunk = True
-                    if c.recv_stderr_ready():
-                        # make sure to read stderr to prevent stall
-                        stderr_readlines.append(
-                            stderr.channel.recv_stderr(len(c.in_stderr_buffer)))
-                        got_chunk = True
-                if x11:
-                    if len(stderr_readlines) > 0:
-                        aux_stderr.extend(stderr_readlines)
-                        for stderr_line in stderr_readlines:
-                            stderr_line = stderr_line.decode(lang)
-                            if "salloc" in stderr_line: # salloc is the command to allocate resources in slurm, for pjm it is different
-                                job_id = re.findall(r'\d+', stderr_line)
-                                if job_id:
-                                    stdout_chunks.append(job_id[0].encode(lang))
-                                    x11_exit = True
-                    else:
-                        x11_exit = True
-                    if not x11_exit:
-                        stderr_readlines = []
-                    else:
-                        stderr_readlines = aux_stderr
-                if not got_chunk and stdout.channel.exit_status_ready() and not stderr.channel.recv_stderr_ready() and not stdout.channel.recv_ready():
-                    # indicate that we're not going to read from this channel anymore
-                    stdout.channel.shutdown_read()
-                    # close the channel
-                    stdout.channel.close()
-                    break
-            # close all the pseudo files
-            if not x11:
-                stdout.close()
-                stderr.close()
-
+            pooled_result = None
+            if self._channel_pool is not None and not x11:
+                pooled_result = self._channel_pool.run(self.transport, command, timeout)
+            if pooled_result is not None:
+                stdout_chunks.append(pooled_result[0])
+                if pooled_result[1]:
+                    stderr_readlines.append(pooled_result[1])
+            else:
+                stdout_chunks, stderr_readlines = self._read_command_output(command, timeout, x11, lang)
 
-            self._ssh_output = ""
-            self._ssh_output_err = ""
-            for s in stdout_chunks:
-                if s.decode(lang) != '':
-                    self._ssh_output += s.decode(lang)
-            for errorLineCase in stderr_readlines:
-                self._ssh_output_err += errorLineCase.decode(lang)
-
-                errorLine = errorLineCase.lower().decode(lang)
-                 # to be simplified in the future in a function and using in. The errors should be inside the class of the platform not here
-                if "not active" in errorLine:
-                    raise AutosubmitError(
-                        'SSH Session not active, will restart the platforms', 6005)
-                if errorLine.find("command not found") != -1:
-                    raise AutosubmitError(
-                        f"A platform command was not found. This may be a temporary issue. "
-                        f"Please verify that the correct scheduler is specified for this platform: '{self.name}.{self.type}'.",
-                        7052,
-                        self._ssh_output_err
-                    )
-                elif errorLine.find("syntax error") != -1:
-                    raise AutosubmitCritical("Syntax error",7052,self._ssh_output_err)
-                elif errorLine.find("refused") != -1 or errorLine.find("slurm_persist_conn_open_without_init") != -1 or errorLine.find("slurmdbd") != -1 or errorLine.find("submission failed") != -1 or errorLine.find("git clone") != -1 or errorLine.find("sbatch: error: ") != -1 or errorLine.find("not submitted") != -1 or errorLine.find("invalid") != -1 or "[ERR.] PJM".lower() in errorLine:
-                    if "salloc: error" in errorLine or "salloc: unrecognized option" in errorLine or "[ERR.] PJM".lower() in errorLine or (self._submit_command_name == "sbatch" and (errorLine.find("policy") != -1 or errorLine.find("invalid") != -1) ) or (self._submit_command_name == "sbatch" and errorLine.find("argument") != -1) or (self._submit_command_name == "bsub" and errorLine.find("job not submitted") != -1) or self._submit_command_name == "ecaccess-job-submit" or self._submit_command_name == "qsub ":
-                        raise AutosubmitError(errorLine, 7014, "Bad Parameters.")
-                    raise AutosubmitError(f'Command {command} in {self.host} warning: {self._ssh_output_err}', 6005)
-
-            if not ignore_log:
-                if len(stderr_readlines) > 0:
-                    Log.printlog(f'Command {command} in {self.host} warning: {self._ssh_output_err}', 6006)
-                else:
-                    pass
+            self._process_command_output(command, stdout_chunks, stderr_readlines, lang, ignore_log)
             return True
         except AttributeError as e:
             raise AutosubmitError(f'Session not active: {str(e)}', 6005)
@@ -1256,6 +1486,42 @@ class ParamikoPlatform(Platform):
                 stderr_readlines = '\n'.join(stderr_readlines)
             raise AutosubmitError(f'Command {command} in {self.host} warning: {stderr_readlines}', 6005, str(e))
 
+    def send_commands(self, commands: List[str], ignore_log: bool = False) -> List[str]:
+        """
+        Sends several commands to HPC. With a channel pool, they are pipelined to one persistent
+        shell and their results come back in a single round trip, otherwise they are sent one by one.
+
+        :param commands: Commands to send, run one after another.
+        :type commands: List[str]
+        :param ignore_log: Do not log the error output of the commands.
+        :type ignore_log: bool
+        :return: Output of each command. The output of the last one is also in ``get_ssh_output``.
+        :rtype: List[str]
+        """
+        lang = locale.getlocale()[1]
+        if lang is None:
+            lang = locale.getdefaultlocale()[1]
+            if lang is None:
+                lang = 'UTF-8'
+        results = None
+        if self._channel_pool is not None and commands:
+            try:
+                results = self._channel_pool.run_many(self.transport, commands, timeout=60 * 2)
+            except AttributeError as e:
+                raise AutosubmitError(f'Session not active: {str(e)}', 6005)
+            except BaseException as e:
+                raise AutosubmitError(f'Commands {"; ".join(commands)} in {self.host} failed', 6005, str(e))
+        outputs = []
+        if results is None:
+            for command in commands:
+                self.send_command(command, ignore_log)
+                outputs.append(self._ssh_output)
+            return outputs
+        for command, (stdout, stderr, _) in zip(commands, results):
+            self._process_command_output(command, [stdout], [stderr] if stderr else [], lang, ignore_log)
+            outputs.append(self._ssh_output)
+        return outputs
+
     def parse_job_output(self, output):
         """
         Parses check job command output, so it can be interpreted by autosubmit
@@ -1279,6 +1545,23 @@ class ParamikoPlatform(Platform):
         """
         raise NotImplementedError
 
+    def parse_jobs_status(self, output: str) -> Optional[Dict[str, str]]:
+        """
+        Parses check jobs command output in one pass, so the status of each job is found without searching it again
+
+        :param output: output to parse
+        :type output: str
+        :return: status by job id, or None if the output can only be parsed with ``parse_Alljobs_output``
+        :rtype: dict
+        """
+        return None
+
+    def _get_job_status(self, output: str, jobs_status: Optional[Dict[str, str]], job_id) -> Union[str, list]:
+        """Returns the status of a job from the parsed output if there is one, otherwise parsing the output again."""
+        if jobs_status is None:
+            return self.parse_Alljobs_output(output, job_id)
+        return jobs_status.get(str(job_id), [])
+
     def generate_submit_script(self):
         pass
 
@@ -1479,6 +1762,8 @@ class ParamikoPlatform(Platform):
 
     def closeConnection(self):
         # Ensure to delete all references to the ssh connection, so that it frees all the file descriptors
+        if self._channel_pool is not None:
+            self._channel_pool.close()
         with suppress(Exception):
             if self._ftpChannel:
                 self._ftpChannel.close()
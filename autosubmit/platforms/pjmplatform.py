@@ -312,29 +312,46 @@ class PJMPlatform(ParamikoPlatform):
             return
         cmd = self.get_queue_status_cmd(list_queue_jobid)
         self.send_command(cmd)
-        queue_status = self._ssh_output
+        queue_reasons = self.parse_queue_reasons(self._ssh_output)
+        # The cancellations are sent together, in one round trip
+        commands = []
+        failed_jobs = []
         for job in in_queue_jobs:
-            reason = self.parse_queue_reason(queue_status, job.id)
+            reason = queue_reasons.get(str(job.id), '')
             if job.queuing_reason_cancel(reason):
                 Log.printlog(f"Job {job.name} will be cancelled and set to FAILED as it was queuing due to {reason}",6000)
-                self.send_command(self.cancel_cmd + " {0}".format(job.id))
-                job.new_status = Status.FAILED
-                job.update_status(as_conf)
+                commands.append(self.cancel_cmd + " {0}".format(job.id))
+                failed_jobs.append(job)
             elif reason.find('ASHOLD') != -1:
                 job.new_status = Status.HELD
                 if not job.hold:
-                    self.send_command("{0} {1}".format(self.cancel_cmd,job.id))
+                    commands.append("{0} {1}".format(self.cancel_cmd,job.id))
                     job.new_status = Status.QUEUING  # If it was HELD and was released, it should be QUEUING next.
+        # Set to FAILED before sending the batch, which stops at the first command that fails
+        for job in failed_jobs:
+            job.new_status = Status.FAILED
+            job.update_status(as_conf)
+        if commands:
+            self.send_commands(commands)
+
+    def parse_jobs_status(self, output):
+        """
+        Parses the pjstat output of all the jobs in one pass, the first line of each job gives its status
+
+        :param output: output to parse
+        :type output: str
+        :return: status by job id
+        :rtype: dict
+        """
+        jobs_status = {}
+        for line in output.splitlines():
+            fields = line.split()
+            if len(fields) > 1:
+                jobs_status.setdefault(fields[0], fields[1])
+        return jobs_status
+
     def parse_Alljobs_output(self, output, job_id):
-        status = ""
-        try:
-            status = [x.split()[1] for x in output.splitlines()
-                      if x.split()[0] == str(job_id)]
-        except BaseException as e:
-            pass
-        if len(status) == 0:
-            return status
-        return status[0]
+        return self.parse_jobs_status(output).get(str(job_id), [])
 
     def parse_joblist(self, job_list):
         """
@@ -420,15 +437,27 @@ class PJMPlatform(ParamikoPlatform):
     #def get_job_energy_cmd(self, job_id):
     #    return 'sacct -n --jobs {0} -o JobId%25,State,NCPUS,NNodes,Submit,Start,End,ConsumedEnergy,MaxRSS%25,AveRSS%25'.format(job_id)
 
-    def parse_queue_reason(self, output, job_id):
+    def parse_queue_reasons(self, output):
+        """
+        Parses the queue reasons of the pjstat output in one pass
+
+        :param output: output to parse
+        :type output: str
+        :return: queue reason by job id
+        :rtype: dict
+        """
         # split() is used to remove the trailing whitespace but also \t and multiple spaces
         # split(" ") is not enough
-        reason = [x.split()[2] for x in output.splitlines()
-                  if x.split()[0] == str(job_id)]
-        # In case of duplicates we take the first one
-        if len(reason) > 0:
-            return reason[0]
-        return reason
+        reasons = {}
+        for line in output.splitlines():
+            fields = line.split()
+            # In case of duplicates we take the first one
+            if len(fields) > 2:
+                reasons.setdefault(fields[0], fields[2])
+        return reasons
+
+    def parse_queue_reason(self, output, job_id):
+        return self.parse_queue_reasons(output).get(str(job_id), [])
 
     def wrapper_header(self, **kwargs):
         wr_header = textwrap.dedent(f"""
@@ -19,22 +19,22 @@ import atexit
 import locale
 import multiprocessing
 import os
-import queue  # only for the exception
 import time
 import traceback
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from multiprocessing import Event
 from multiprocessing.queues import Queue
 # noinspection PyProtectedMember
 from os import _exit  # type: ignore
 from pathlib import Path
-from typing import List, Union, Set, Any, TYPE_CHECKING
+from typing import Dict, Iterator, List, Union, Any, TYPE_CHECKING
 
 import setproctitle
 
 from autosubmit.helpers.parameters import autosubmit_parameter
 from autosubmit.job.job_common import Status
 from autosubmit.log.log import AutosubmitCritical, AutosubmitError, Log
+from autosubmit.platforms.log_recovery import LogRecoveryPool
 
 if TYPE_CHECKING:
     from autosubmit.config.configcommon import AutosubmitConfig
@@ -127,6 +127,40 @@ class CopyQueue(Queue):
         """
         super().put(job.__getstate__(), block, timeout)
 
+    def wake(self) -> None:
+        """Puts an empty item, that wakes up the process waiting for jobs."""
+        super().put(None)
+
+
+class RecoveryEvent(object):
+    """
+    An event shared with the log recovery process, that also wakes the process up when it is set.
+
+    The process never waits on the event itself: a process killed while waiting on a
+    multiprocessing event would block the next ``set`` of the event forever.
+    """
+
+    def __init__(self, ctx: Any, recovery_queue: CopyQueue) -> None:
+        """
+        :param ctx: Multiprocessing context.
+        :type ctx: Context
+        :param recovery_queue: Queue the log recovery process waits on.
+        :type recovery_queue: CopyQueue
+        """
+        self._event = ctx.Event()
+        self._recovery_queue = recovery_queue
+
+    def set(self) -> None:
+        self._event.set()
+        with suppress(Exception):
+            self._recovery_queue.wake()
+
+    def clear(self) -> None:
+        self._event.clear()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
 
 class Platform(object):
     """
@@ -228,6 +262,10 @@ class Platform(object):
             log_queue_size = int(platform_total_jobs) * 2
         self.log_queue_size = log_queue_size
         self.remote_log_dir = None
+        self.last_submission_time = 0.0  # time.monotonic() of the last submission
+        self._queue_snapshot = None
+        self._deferred_uploads = None
+        self._fetched_files: Dict[str, bool] = dict()
 
     @classmethod
     def update_workers(cls, event_worker):
@@ -363,6 +401,20 @@ class Platform(object):
     def process_batch_ready_jobs(self, valid_packages_to_submit, failed_packages, error_message="", hold=False):
         return True, valid_packages_to_submit
 
+    def invalidate_queue_snapshot(self) -> None:
+        """Discards the listing of the queue, so it is listed again the next time it is needed."""
+        self._queue_snapshot = None
+
+    def wait_for_submitted_jobs(self, settle_time: float) -> None:
+        """
+        Waits until some time has passed since the last submission, for the scheduler to list the new jobs.
+
+        :param settle_time: Seconds since the last submission.
+        """
+        remaining = settle_time - (time.monotonic() - self.last_submission_time)
+        if remaining > 0:
+            time.sleep(remaining)
+
     def submit_ready_jobs(self, as_conf, job_list, platforms_to_test, packages_persistence, packages_to_submit,
                           inspect=False, only_wrappers=False, hold=False):
 
@@ -576,25 +628,31 @@ class Platform(object):
         """
         prefix = 'HPC'
 
-        as_conf.experiment_data['{0}ARCH'.format(prefix)] = self.name
-        as_conf.experiment_data['{0}HOST'.format(prefix)] = self.host
-        as_conf.experiment_data['{0}QUEUE'.format(prefix)] = self.queue
-        as_conf.experiment_data['{0}EC_QUEUE'.format(prefix)] = self.ec_queue
-        as_conf.experiment_data['{0}PARTITION'.format(prefix)] = self.partition
-
-        as_conf.experiment_data['{0}USER'.format(prefix)] = self.user
-        as_conf.experiment_data['{0}PROJ'.format(prefix)] = self.project
-        as_conf.experiment_data['{0}BUDG'.format(prefix)] = self.budget
-        as_conf.experiment_data['{0}RESERVATION'.format(prefix)] = self.reservation
-        as_conf.experiment_data['{0}EXCLUSIVITY'.format(prefix)] = self.exclusivity
-        as_conf.experiment_data['{0}TYPE'.format(prefix)] = self.type
-        as_conf.experiment_data['{0}SCRATCH_DIR'.format(prefix)] = self.scratch
-        as_conf.experiment_data['{0}TEMP_DIR'.format(prefix)] = self.temp_dir
+        parameters = dict()
+        parameters['{0}ARCH'.format(prefix)] = self.name
+        parameters['{0}HOST'.format(prefix)] = self.host
+        parameters['{0}QUEUE'.format(prefix)] = self.queue
+        parameters['{0}EC_QUEUE'.format(prefix)] = self.ec_queue
+        parameters['{0}PARTITION'.format(prefix)] = self.partition
+
+        parameters['{0}USER'.format(prefix)] = self.user
+        parameters['{0}PROJ'.format(prefix)] = self.project
+        parameters['{0}BUDG'.format(prefix)] = self.budget
+        parameters['{0}RESERVATION'.format(prefix)] = self.reservation
+        parameters['{0}EXCLUSIVITY'.format(prefix)] = self.exclusivity
+        parameters['{0}TYPE'.format(prefix)] = self.type
+        parameters['{0}SCRATCH_DIR'.format(prefix)] = self.scratch
+        parameters['{0}TEMP_DIR'.format(prefix)] = self.temp_dir
         if self.temp_dir is None:
             self.temp_dir = ''
-        as_conf.experiment_data['{0}ROOTDIR'.format(prefix)] = self.root_dir
+        parameters['{0}ROOTDIR'.format(prefix)] = self.root_dir
 
-        as_conf.experiment_data['{0}LOGDIR'.format(prefix)] = self.get_files_path()
+        parameters['{0}LOGDIR'.format(prefix)] = self.get_files_path()
+        # The cached parameters of the configuration are only discarded if a value changed
+        if any(key not in as_conf.experiment_data or as_conf.experiment_data[key] != value
+               for key, value in parameters.items()):
+            as_conf.experiment_data.update(parameters)
+            as_conf.invalidate_parameters()
 
     def send_file(self, filename, check=True):
         """
@@ -606,6 +664,48 @@ class Platform(object):
         """
         raise NotImplementedError
 
+    def send_files(self, filenames: List[str], deferrable: bool = True) -> None:
+        """
+        Sends several local files to the platform. While uploads are deferred, the files are
+        only queued, and they are sent when ``defer_uploads`` exits.
+
+        :param filenames: names of the files to send
+        :type filenames: list
+        :param deferrable: False if the files are needed right away, e.g. by a job submitted now
+        :type deferrable: bool
+        """
+        if deferrable and self._deferred_uploads is not None:
+            self._deferred_uploads.extend(filenames)
+        else:
+            self._upload_files(filenames)
+
+    def _upload_files(self, filenames: List[str]) -> None:
+        for filename in filenames:
+            self.send_file(filename)
+
+    @contextmanager
+    def defer_uploads(self, enabled: bool = True) -> Iterator[None]:
+        """
+        Queues the files sent with ``send_files``, and sends all of them at once on exit.
+
+        Only for platforms that submit the jobs after this, e.g. with a submit script.
+        Nothing is sent if an exception is raised.
+
+        :param enabled: False to send the files right away, as usual
+        :type enabled: bool
+        """
+        if not enabled or self._deferred_uploads is not None:
+            yield
+            return
+        self._deferred_uploads = []
+        try:
+            yield
+            filenames, self._deferred_uploads = self._deferred_uploads, None
+            if filenames:
+                self._upload_files(list(dict.fromkeys(filenames)))
+        finally:
+            self._deferred_uploads = None
+
     def move_file(self, src, dest):
         """
         Moves a file on the platform
@@ -650,6 +750,19 @@ class Platform(object):
         for filename in files:
             self.get_file(filename, must_exist, relative_path)
 
+    def get_files_in_bulk(self, files: Dict[str, str]) -> List[str]:
+        """
+        Copies several files from the platform to experiment's tmp folder, all at once
+
+        :param files: for each file name, relative to the LOG directory of the platform, the path inside
+            the tmp folder to copy it to
+        :type files: dict
+        :return: names of the files not found on the platform, whose local copies are removed
+        :rtype: list
+        """
+        return [filename for filename, relative_path in files.items()
+                if not self.get_file(filename, False, relative_path, ignore_log=True)]
+
     def delete_file(self, filename):
         """
         Deletes a file from this platform
@@ -661,6 +774,17 @@ class Platform(object):
         """
         raise NotImplementedError
 
+    def delete_files(self, filenames: List[str]) -> Dict[str, bool]:
+        """
+        Deletes several files from this platform
+
+        :param filenames: file names
+        :type filenames: list
+        :return: for each file, True if it was removed, False if it did not exist or could not be removed
+        :rtype: dict
+        """
+        return {filename: bool(self.delete_file(filename)) for filename in filenames}
+
     # Executed when calling from Job
     def get_logs_files(self, exp_id, remote_logs):
         """
@@ -709,6 +833,10 @@ class Platform(object):
         :return: True if successful, false otherwise
         :rtype: bool
         """
+        fetched = self._fetched_files.pop('{0}_COMPLETED'.format(job_name), None)
+        if fetched or (recovery and fetched is not None):
+            # A file just finished may not be visible yet, so only the recovery trusts its absence
+            return fetched
         if recovery:
             retries = 5
             for i in range(retries):
@@ -723,6 +851,21 @@ class Platform(object):
         else:
             return False
 
+    def fetch_completed_files(self, job_names: List[str]) -> None:
+        """
+        Gets the COMPLETED files of several jobs at once. The following calls to ``get_completed_files``
+        of these jobs use the result instead of getting the file again.
+
+        :param job_names: names of the jobs
+        :type job_names: list
+        """
+        filenames = ['{0}_COMPLETED'.format(job_name) for job_name in job_names]
+        self._fetched_files = dict()
+        if len(filenames) == 0:
+            return
+        missing = set(self.get_files_in_bulk({filename: '' for filename in filenames}))
+        self._fetched_files = {filename: filename not in missing for filename in filenames}
+
     def remove_stat_file(self, job: Any) -> bool:
         """
         Removes STAT files from remote.
@@ -737,6 +880,25 @@ class Platform(object):
             return True
         return False
 
+    def remove_stat_and_completed_files(self, jobs: List[Any]) -> Dict[str, bool]:
+        """
+        Removes the STAT and *COMPLETED* files of several jobs from remote, all at once.
+
+        :param jobs: Jobs whose files are removed.
+        :type jobs: list[Job]
+        :return: For each file, True if it was removed, False otherwise.
+        :rtype: dict[str, bool]
+        """
+        filenames = []
+        for job in jobs:
+            filenames.append(f"{job.stat_file[:-1]}{job.fail_count}")
+            filenames.append(f"{job.name}_COMPLETED")
+        removed = self.delete_files(filenames)
+        for filename in filenames:
+            if removed.get(filename):
+                Log.debug(f"{filename} has been removed")
+        return removed
+
     def remove_completed_file(self, job_name):
         """
         Removes *COMPLETED* files from remote
@@ -969,14 +1131,14 @@ class Platform(object):
 
     def prepare_process(self, ctx):
         new_platform = self.create_a_new_copy()
-        self.work_event = ctx.Event()
-        self.cleanup_event = ctx.Event()
-        Platform.update_workers(self.work_event)
-        self.load_process_info(new_platform)
         if self.recovery_queue:
             del self.recovery_queue
         # Retrieval log process variables
         self.recovery_queue = CopyQueue(ctx=ctx)
+        self.work_event = ctx.Event()
+        self.cleanup_event = RecoveryEvent(ctx, self.recovery_queue)
+        Platform.update_workers(self.work_event)
+        self.load_process_info(new_platform)
         # Cleanup will be automatically prompt on control + c or a normal exit
         atexit.register(self.send_cleanup_signal)
         atexit.register(self.closeConnection)
@@ -1026,110 +1188,33 @@ class Platform(object):
             self.cleanup_event.set()
             self.log_recovery_process.join(timeout=60)
 
-    def wait_mandatory_time(self, sleep_time: int = 60) -> bool:
-        """
-        Waits for the work_event to be set or the cleanup_event to be set for a mandatory time.
-
-        :param sleep_time: Minimum time to wait in seconds. Defaults to 60.
-        :type sleep_time: int
-        :return: True if there is work to process, False otherwise.
-        :rtype: bool
-        """
-        process_log = False
-        for remaining in range(sleep_time, 0, -1):
-            time.sleep(1)
-            if self.work_event.is_set() or not self.recovery_queue.empty():
-                process_log = True
-            if self.cleanup_event.is_set():
-                process_log = True
-                break
-        return process_log
-
-    def wait_for_work(self, sleep_time: int = 60) -> bool:
-        """
-        Waits a mandatory time and then waits until there is work, no work to more process or the cleanup event is set.
-
-        :param sleep_time: Maximum time to wait in seconds. Defaults to 60.
-        :type sleep_time: int
-        :return: True if there is work to process, False otherwise.
-        :rtype: bool
-        """
-        process_log = self.wait_mandatory_time(sleep_time)
-        if not process_log:
-            process_log = self.wait_until_timeout(self.keep_alive_timeout - sleep_time)
-        self.work_event.clear()
-        return process_log
-
-    def wait_until_timeout(self, timeout: int = 60) -> bool:
-        """
-        Waits until the timeout is reached or any signal is set to process logs.
-
-        :param sleep_time: Maximum time to wait in seconds. Defaults to 60.
-        :type sleep_time: int
-        :return: True if there is work to process, False otherwise.
-        :rtype: bool
-        """
-        process_log = False
-        for _ in range(timeout, 0, -1):
-            time.sleep(1)
-            if self.work_event.is_set() or not self.recovery_queue.empty() or self.cleanup_event.is_set():
-                process_log = True
-                break
-        return process_log
-
-    def recover_job_log(self, identifier: str, jobs_pending_to_process: Set[Any], as_conf: 'AutosubmitConfig') -> Set[Any]:
-        """
-        Recovers log files for jobs from the recovery queue and retries failed jobs.
-
-        :param identifier: Identifier for logging purposes.
-        :type identifier: str
-        :param jobs_pending_to_process: Set of jobs that had issues during log retrieval.
-        :type jobs_pending_to_process: Set[Any]
-        :param as_conf: The Autosubmit configuration object containing experiment data.
-        :type as_conf: AutosubmitConfig
-        :return: Updated set of jobs pending to process.
-        :rtype: Set[Any]
-        """
-        job = None
-
-        while not self.recovery_queue.empty():
+    def retrieve_logfiles_in_bulk(self, jobs: List[Any]) -> List[Any]:
+        """
+        Retrieves the logs and STAT files of the last run of several jobs at once, with ``get_files_in_bulk``.
+
+        :param jobs: Jobs whose logs are retrieved.
+        :type jobs: List[Job]
+        :return: Jobs whose logs must be retrieved one by one, e.g. the ones not found or in a vertical wrapper.
+        :rtype: List[Job]
+        """
+        pending = [job for job in jobs if job.wrapper_type == "vertical"]
+        jobs = [job for job in jobs if job.wrapper_type != "vertical"]
+        files = dict()
+        for job in jobs:
+            files.update(job.get_log_and_stat_files())
+        if len(files) == 0:
+            return pending + jobs
+        missing = set(self.get_files_in_bulk(files))
+        if missing:
+            Log.debug(f"{self.name}(log_recovery): Files not found: {', '.join(sorted(missing))}")
+        for job in jobs:
             try:
-                from autosubmit.job.job import Job
-                job = Job(loaded_data=self.recovery_queue.get(timeout=1))
-                job.platform_name = self.name  # Change the original platform to this process platform.
-                job.platform = self
-                job._log_recovery_retries = 0  # Reset the log recovery retries.
-                try:
-                    job.retrieve_logfiles(raise_error=True)
-                except Exception:
-                    jobs_pending_to_process.add(job)
-                    job._log_recovery_retries += 1
-                    Log.warning(f"{identifier} (Retry) Failed to recover log for job '{job.name}' and retry:'{job.fail_count}'.")
-            except queue.Empty:
-                pass
-
-        if len(jobs_pending_to_process) > 0: # Restore the connection if there was an issue with one or more jobs.
-            self.restore_connection(as_conf, log_recovery_process=True)
-
-        # This second while is to keep retring the failed jobs.
-        # With the unique queue, the main process won't send the job again, so we have to store it here.
-        while len(jobs_pending_to_process) > 0:  # jobs that had any issue during the log retrieval
-            job = jobs_pending_to_process.pop()
-            job._log_recovery_retries += 1
-            try:
-                job.retrieve_logfiles(raise_error=True)
-                job._log_recovery_retries += 1
-            except:
-                if job._log_recovery_retries < 5:
-                    jobs_pending_to_process.add(job)
-                Log.warning(
-                    f"{identifier} (Retry) Failed to recover log for job '{job.name}' and retry '{job.fail_count}'.")
-            Log.result(
-                f"{identifier} (Retry) Successfully recovered log for job '{job.name}' and retry '{job.fail_count}'.")
-        if len(jobs_pending_to_process) > 0:
-            self.restore_connection(as_conf, log_recovery_process=True)  # Restore the connection if there was an issue with one or more jobs.
-
-        return jobs_pending_to_process
+                if not job.retrieve_fetched_logfiles(missing):
+                    pending.append(job)
+            except Exception as e:
+                Log.debug(f"{self.name}(log_recovery): Failed to recover the fetched logs of job '{job.name}': {str(e)}")
+                pending.append(job)
+        return pending
 
     def recover_platform_job_logs(self, as_conf) -> None:
         """
@@ -1140,18 +1225,16 @@ class Platform(object):
         identifier = f"{self.name.lower()}(log_recovery):"
         try:
             Log.info(f"{identifier} Starting...")
-            jobs_pending_to_process = set()
             self.connected = False
             self.restore_connection(as_conf, log_recovery_process=True)
             Log.result(f"{identifier} successfully connected.")
             log_recovery_timeout = self.config.get("LOG_RECOVERY_TIMEOUT", 60)
-            # Keep alive signal timeout is 5 minutes, but the sleeptime is 60 seconds.
+            # Keep alive signal timeout is 5 minutes
             self.keep_alive_timeout = max(log_recovery_timeout*5, 60*5)
-            while self.wait_for_work(sleep_time=max(log_recovery_timeout, 60)):
-                jobs_pending_to_process = self.recover_job_log(identifier, jobs_pending_to_process, as_conf)
-                if self.cleanup_event.is_set():  # Check if the main process is waiting for this child to end.
-                    self.recover_job_log(identifier, jobs_pending_to_process, as_conf)
-                    break
+            default_workers = self.config.get("CONFIG", {}).get("LOG_RECOVERY_WORKERS", 4)
+            workers = int(self.config.get("PLATFORMS", {}).get(self.name.upper(), {}).get("LOG_RECOVERY_WORKERS",
+                                                                                          default_workers))
+            LogRecoveryPool(self, as_conf, workers, self.keep_alive_timeout).run()
         except Exception as e:
             Log.error(f"{identifier} {e}")
             Log.debug(traceback.format_exc())
@@ -0,0 +1,139 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Concurrent check of the jobs of several platforms, used by ``Autosubmit.run_experiment``."""
+
+import time
+from contextlib import suppress
+from threading import Lock, Thread, current_thread
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+from autosubmit.job.job import Job
+from autosubmit.log.log import Log
+
+if TYPE_CHECKING:
+    from autosubmit.config.configcommon import AutosubmitConfig
+    from autosubmit.platforms.platform import Platform
+
+# Slots of a job that belong to the job list, and are never copied to or from a private job
+_SHARED_SLOTS = ('_status_index', '_lazy_state')
+
+
+def _private_copy(job: Job) -> Job:
+    """Returns a copy of the job, outside the job list, that a check can change freely."""
+    copy = Job.__new__(Job)
+    for slot in Job.__slots__:
+        if slot in _SHARED_SLOTS:
+            continue
+        with suppress(AttributeError):
+            setattr(copy, slot, getattr(job, slot))
+    copy._status_index = None
+    copy._lazy_state = None
+    return copy
+
+
+def _apply_changes(job: Job, copy: Job) -> None:
+    """Sets on the job the attributes that the check changed in its private copy."""
+    for slot in Job.__slots__:
+        if slot in _SHARED_SLOTS:
+            continue
+        value = getattr(copy, slot, None)
+        if value is getattr(job, slot, None):
+            continue
+        if slot == '_status':
+            # Through the property, so the status index of the job list follows
+            job.status = value
+        else:
+            setattr(job, slot, value)
+
+
+class PlatformChecker(object):
+    """
+    Runs ``Platform.check_Alljobs`` of each platform in its own thread.
+
+    A check only talks to its platform, so the checks of different platforms can run at the
+    same time. It runs on private copies of the jobs, and what it changed is only set on the
+    jobs, in the main thread, if it finishes in time. Updating the job list with the results
+    is left to the caller.
+
+    A check that does not finish in time is left running, and its results are discarded. Its
+    platform is busy until it finishes: the caller must not use it meanwhile, neither to check
+    nor to submit jobs.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        :param timeout: Seconds to wait for the checks of all the platforms.
+        """
+        self.timeout = timeout
+        self._threads: Dict['Platform', Thread] = dict()
+        self._errors: Dict[Thread, BaseException] = dict()
+        self._lock = Lock()
+
+    def is_busy(self, platform: 'Platform') -> bool:
+        """Returns True if a previous check of the platform is still running."""
+        thread = self._threads.get(platform)
+        return thread is not None and thread.is_alive()
+
+    def _check(self, platform: 'Platform', platform_jobs: List[Any], as_conf: 'AutosubmitConfig') -> None:
+        try:
+            platform.check_Alljobs(platform_jobs, as_conf)
+        except BaseException as e:
+            with self._lock:
+                self._errors[current_thread()] = e
+
+    def check(self, platforms_jobs: List[Tuple['Platform', List[Any]]],
+              as_conf: 'AutosubmitConfig') -> List[Tuple['Platform', List[Any]]]:
+        """
+        Checks the jobs of all the platforms at the same time.
+
+        :param platforms_jobs: Each platform with its jobs to check, as passed to ``check_Alljobs``.
+        :param as_conf: Autosubmit configuration object.
+        :return: Platforms, with their jobs, whose check finished in time.
+        :raises BaseException: The first error raised by a check, in the order of the platforms.
+        """
+        started = []
+        for platform, platform_jobs in platforms_jobs:
+            if self.is_busy(platform):
+                Log.warning(f"The previous check of platform {platform.name} is still running, it will not be "
+                            f"checked in this iteration")
+                continue
+            with self._lock:
+                # Errors of a check that did not finish in time are discarded with its results
+                self._errors.pop(self._threads.get(platform), None)
+            private_jobs = [[_private_copy(job), job_prev_status] for job, job_prev_status in platform_jobs]
+            thread = Thread(target=self._check, args=(platform, private_jobs, as_conf),
+                            name=f"{platform.name}_check", daemon=True)
+            self._threads[platform] = thread
+            thread.start()
+            started.append((platform, platform_jobs, private_jobs, thread))
+        deadline = time.monotonic() + self.timeout
+        checked = []
+        for platform, platform_jobs, private_jobs, thread in started:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                Log.printlog(f"Platform {platform.name} did not answer in {self.timeout} seconds, its jobs "
+                             f"will be checked again in the next iteration", 6016)
+                continue
+            with self._lock:
+                error = self._errors.pop(thread, None)
+            if error is not None:
+                raise error
+            for (job, _), (private_job, _) in zip(platform_jobs, private_jobs):
+                _apply_changes(job, private_job)
+            checked.append((platform, platform_jobs))
+        return checked
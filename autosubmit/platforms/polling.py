@@ -0,0 +1,112 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Waiting times between the checks of the jobs, and between the retries of a failed check."""
+
+import datetime
+import random
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from autosubmit.job.job_common import Status
+
+if TYPE_CHECKING:
+    from autosubmit.job.job import Job
+
+
+def backoff_time(attempt: int, base: float = 5, cap: float = 60) -> float:
+    """
+    Returns the seconds to wait before retrying, growing exponentially with a random jitter.
+
+    The jitter keeps the retries of several platforms, or several experiments, from hitting
+    the scheduler at the same time.
+
+    :param attempt: Number of retries done so far, starting at 0.
+    :param base: Seconds to wait before the first retry, without jitter.
+    :param cap: Maximum seconds to wait, without jitter.
+    :return: Between half and all of ``min(cap, base * 2 ** attempt)``.
+    """
+    delay = min(cap, base * 2 ** min(attempt, 32))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class PollingScheduler(object):
+    """
+    Chooses how long the main loop of ``autosubmit run`` sleeps before checking the jobs again.
+
+    The sleep is short while a job is submitted, or is running and close to its expected end,
+    and long while the jobs can only be waiting in the queue or far from their end. The
+    expected runtime of a job is the average runtime of the jobs of its section seen
+    completing so far, or its wallclock if none completed yet.
+    """
+
+    def __init__(self):
+        self._running: Dict[str, Tuple['Job', datetime.datetime]] = dict()
+        self._runtimes: Dict[str, Tuple[float, int]] = dict()
+
+    def expected_runtime(self, job: 'Job') -> Optional[float]:
+        """Returns the seconds the job is expected to run, or None if unknown."""
+        if job.section in self._runtimes:
+            total, count = self._runtimes[job.section]
+            return total / count
+        if job.wallclock_in_seconds:
+            return float(job.wallclock_in_seconds)
+        return None
+
+    def _observe(self, jobs: List['Job'], now: datetime.datetime) -> None:
+        """Keeps the jobs that are running, and the runtimes of those that completed since the previous call."""
+        in_queue = set()
+        for job in jobs:
+            in_queue.add(job.name)
+            if job.status != Status.RUNNING:
+                # e.g. a retrial in the queue again
+                self._running.pop(job.name, None)
+            elif job.start_time is not None and job.name not in self._running:
+                self._running[job.name] = (job, job.start_time)
+        for job_name in [job_name for job_name in self._running if job_name not in in_queue]:
+            job, start_time = self._running.pop(job_name)
+            if job.status == Status.COMPLETED:
+                total, count = self._runtimes.get(job.section, (0.0, 0))
+                self._runtimes[job.section] = (total + (now - start_time).total_seconds(), count + 1)
+
+    def next_poll(self, jobs: List['Job'], min_time: float, max_time: float,
+                  now: Optional[datetime.datetime] = None) -> float:
+        """
+        Returns the seconds to sleep before the next check of the jobs.
+
+        :param jobs: Jobs in the queues of the platforms.
+        :param min_time: Minimum seconds to sleep.
+        :param max_time: Maximum seconds to sleep.
+        :param now: Current time, by default ``datetime.datetime.now()``.
+        :return: Seconds between ``min_time`` and ``max_time``.
+        """
+        now = now or datetime.datetime.now()
+        self._observe(jobs, now)
+        if max_time <= min_time:
+            return min_time
+        sleep_time = max_time
+        for job in jobs:
+            if job.status == Status.SUBMITTED:
+                # About to be listed by the scheduler, or to fail at the start
+                return min_time
+            if job.status != Status.RUNNING:
+                continue
+            expected_runtime = self.expected_runtime(job)
+            if expected_runtime is None or job.name not in self._running:
+                continue
+            remaining = expected_runtime - (now - self._running[job.name][1]).total_seconds()
+            sleep_time = min(sleep_time, max(remaining, min_time))
+        return sleep_time
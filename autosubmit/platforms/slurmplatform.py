@@ -22,6 +22,7 @@ This file contains code that interfaces between Autosubmit and a Slurm Platform.
 
 import locale
 import os
+import re
 from contextlib import suppress
 from time import sleep
 from typing import List, Union, Any, TYPE_CHECKING
@@ -37,6 +38,9 @@ if TYPE_CHECKING:
     # Avoid circular imports
     from autosubmit.job.job import Job
 
+# Separates the id of a job from its array task, step or heterogeneous component
+_JOB_ID_SUFFIX = re.compile(r'[_.+]')
+
 
 class SlurmPlatform(ParamikoPlatform):
     """Class to manage jobs to host using SLURM scheduler."""
@@ -143,6 +147,8 @@ class SlurmPlatform(ParamikoPlatform):
             if len(valid_packages_to_submit) > 0:
                 duplicated_jobs_already_checked = False
                 platform = valid_packages_to_submit[0].jobs[0].platform
+                # The duplicated jobs are looked up in the queue as it is after the submission
+                self.invalidate_queue_snapshot()
                 try:
                     jobs_id = self.submit_Script(hold=hold)
                 except AutosubmitError as e:
@@ -155,11 +161,9 @@ class SlurmPlatform(ParamikoPlatform):
                             else:
                                 job_names.append(package_.jobs[0].name)  # job_name
                         Log.error(f'TRACE:{e.trace}\n{e.message} JOBS:{job_names}')
-                        for job_name in job_names:
-                            jobid = self.get_jobid_by_jobname(job_name)
-                            # cancel bad submitted job if jobid is encountered
-                            for id_ in jobid:
-                                self.send_command(self.cancel_job(id_))
+                        # cancel bad submitted jobs if their jobid is encountered
+                        self.send_commands([self.cancel_job(id_) for job_name in job_names
+                                            for id_ in self.get_jobid_by_jobname(job_name)])
                     jobs_id = None
                     self.connected = False
                     if e.trace is not None:
@@ -206,6 +210,8 @@ class SlurmPlatform(ParamikoPlatform):
                 if hold:
                     sleep(10)
                 jobid_index = 0
+                # The cancellations of the duplicated and not held jobs are sent together, after the loop
+                cancel_commands = []
                 for package in valid_packages_to_submit:
                     current_package_id = str(jobs_id[jobid_index])
                     if hold:
@@ -227,8 +233,7 @@ class SlurmPlatform(ParamikoPlatform):
                                     sleep(5)
                                 retries = retries - 1
                             if not can_continue:
-                                package.jobs[0].platform.send_command(
-                                    package.jobs[0].platform.cancel_cmd+f" {current_package_id}")
+                                cancel_commands.append(self.cancel_cmd + f" {current_package_id}")
                                 jobid_index += 1
                                 continue
                             if not self.hold_job(package.jobs[0]):
@@ -247,15 +252,16 @@ class SlurmPlatform(ParamikoPlatform):
                             if package.jobs[0].het:
                                 for i in range(1,package.jobs[0].het.get("HETSIZE",1)): # noqa
                                     ids_to_check.append(str(int(ids_to_check[0]) + i))
-                            # TODO to optimize cancel all jobs at once
-                            for id_ in [jobid for jobid in jobid if jobid not in ids_to_check]:
-                                self.send_command(self.cancel_job(id_))
+                            ids_to_cancel = [jobid for jobid in jobid if jobid not in ids_to_check]
+                            cancel_commands.extend(self.cancel_job(id_) for id_ in ids_to_cancel)
+                            for id_ in ids_to_cancel:
                                 Log.debug(f'Job {id_} with the assigned name: {job_name} has been cancelled')
                             Log.debug(f'Job {package.jobs[0].id} with the assigned name: {job_name} has been submitted')
                     jobid_index += 1
+                cancel_commands.extend(platform.cancel_cmd + f" {job_id}" for job_id in failed_packages)
+                if cancel_commands:
+                    self.send_commands(cancel_commands)
                 if len(failed_packages) > 0:
-                    for job_id in failed_packages:
-                        platform.send_command(platform.cancel_cmd + f" {job_id}")
                     raise AutosubmitError(f"{self.name} submission failed, some hold jobs failed to be held", 6015)
             save = True
         except AutosubmitError:
@@ -315,6 +321,7 @@ class SlurmPlatform(ParamikoPlatform):
         cmd = self.get_submit_cmd(script_name, job, hold=hold, export=export)
         if cmd is None:
             return None
+        self.invalidate_queue_snapshot()
         if self.send_command(cmd, x11=x11):
             job_id = self.get_submitted_job_id(self.get_ssh_output(), x11=x11)
             if job:
@@ -416,11 +423,8 @@ class SlurmPlatform(ParamikoPlatform):
                 return False
             if job_status == Status.FAILED:
                 return False
-            cmd = self.get_queue_status_cmd(job.id)
-            self.send_command(cmd)
-
-            queue_status = self._ssh_output
-            reason = self.parse_queue_reason(queue_status, job.id)
+            self.invalidate_queue_snapshot()
+            reason = self.get_queue_reason(job.id)
             self.send_command(self.get_estimated_queue_time_cmd(job.id))
             estimated_time = self.parse_estimated_time(self._ssh_output)
             if reason == '(JobHeldAdmin)':  # Job is held by the system
@@ -469,6 +473,29 @@ class SlurmPlatform(ParamikoPlatform):
         """
         return output.strip().split(' ')[0].strip()
 
+    def parse_jobs_status(self, output: str) -> dict[str, str]:
+        """
+        Parses the ``sacct`` output of all the jobs in one pass.
+
+        Array tasks (``123_4``, ``123_[5-9]``), steps (``123.batch``) and heterogeneous components
+        (``123+0``) are also found by the id of their job. As when searching the output, the
+        first line of a job gives its status.
+
+        :param output: Output of the status of the jobs.
+        :type output: str
+
+        :return: Status by job ID.
+        :rtype: dict[str, str]
+        """
+        jobs_status = {}
+        for line in output.splitlines():
+            fields = line.split()
+            if len(fields) < 2:
+                continue
+            jobs_status.setdefault(fields[0], fields[1])
+            jobs_status.setdefault(_JOB_ID_SUFFIX.split(fields[0], 1)[0], fields[1])
+        return jobs_status
+
     def parse_Alljobs_output(self, output: str, job_id: int) -> Union[list[str], str]: # noqa
         """
         Filter one or more status of a specific Job ID.
@@ -481,15 +508,7 @@ class SlurmPlatform(ParamikoPlatform):
         :return: All status related to a Job.
         :rtype: Union[list[str], str]
         """
-
-    def parse_Alljobs_output(self, output, job_id):
-        status = ""
-        with suppress(Exception):
-            status = [x.split()[1] for x in output.splitlines()
-                      if x.split()[0][:len(str(job_id))] == str(job_id)]
-        if len(status) == 0:
-            return status
-        return status[0]
+        return self.parse_jobs_status(output).get(str(job_id), [])
 
     def get_submitted_job_id(self, output_lines: str, x11: bool = False) -> Union[list[int], int]:
         """
@@ -600,6 +619,79 @@ class SlurmPlatform(ParamikoPlatform):
         """
         return f'squeue -j {job_id} -o %A,%R'
 
+    def get_queue_snapshot_cmd(self) -> str:
+        """
+        Lists the jobs of the user in the queue, with their ID, queue reason and name.
+
+        :return: squeue command to list the jobs.
+        :rtype: str
+        """
+        return "squeue -h -u $USER -o '%A|%R|%j'"
+
+    @staticmethod
+    def parse_queue_snapshot(output: str) -> tuple[dict[str, str], dict[str, list[str]]]:
+        """
+        Parses the listing of the queue.
+
+        :param output: Output of the command returned by ``get_queue_snapshot_cmd``.
+        :type output: str
+
+        :return: Queue reason by job ID, and job IDs by job name.
+        :rtype: tuple[dict[str, str], dict[str, list[str]]]
+        """
+        reasons = {}
+        job_ids = {}
+        for line in output.splitlines():
+            fields = line.strip().split('|', 2)
+            if len(fields) < 3:
+                continue
+            job_id, reason, job_name = fields
+            reasons[job_id] = reasons.get(job_id, '') + reason
+            job_ids.setdefault(job_name, []).append(job_id)
+        return reasons, job_ids
+
+    def get_queue_snapshot(self) -> tuple[dict[str, str], dict[str, list[str]]]:
+        """
+        Lists the queue once, and reads the same listing until it is invalidated.
+
+        Looking up the jobs by name, their queue reasons and the duplicated submissions then
+        costs one scheduler query. The listing is invalidated at the start of each iteration
+        of ``autosubmit run`` and before each submission.
+
+        :return: Queue reason by job ID, and job IDs by job name.
+        :rtype: tuple[dict[str, str], dict[str, list[str]]]
+        """
+        if self._queue_snapshot is None:
+            self.send_command(self.get_queue_snapshot_cmd())
+            self._queue_snapshot = self.parse_queue_snapshot(self.get_ssh_output())
+        return self._queue_snapshot
+
+    def get_queue_reason(self, job_id: str) -> str:
+        """
+        Gets the queue reason of a job from the listing of the queue.
+
+        :param job_id: ID of a job.
+        :type job_id: str
+
+        :return: queue reason, empty if the job is not in the queue.
+        :rtype: str
+        """
+        return self.get_queue_snapshot()[0].get(str(job_id), '')
+
+    def get_jobid_by_jobname(self, job_name: str, retries: int = 2) -> list[str]:
+        """
+        Gets the IDs of the jobs in the queue with the given name, from the listing of the queue.
+
+        :param job_name: Name given to a job.
+        :type job_name: str
+        :param retries: Unused, kept for compatibility with ``ParamikoPlatform.get_jobid_by_jobname``.
+        :type retries: int
+
+        :return: IDs of the jobs.
+        :rtype: list[str]
+        """
+        return list(self.get_queue_snapshot()[1].get(job_name, []))
+
     def get_jobid_by_jobname_cmd(self, job_name: str) -> str: # noqa
         """
         Looks for a job based on its name.
@@ -639,6 +731,22 @@ class SlurmPlatform(ParamikoPlatform):
         return (f'sacct -n --jobs {job_id} -o JobId%25,State,NCPUS,NNodes,Submit,'
                 f'Start,End,ConsumedEnergy,MaxRSS%25,AveRSS%25')
 
+    def parse_queue_reasons(self, output: str) -> dict[str, str]:
+        """
+        Parses the queue reasons of the output of the command in one pass.
+
+        :param output: output of the command.
+
+        :return: queue reason by job id.
+        :rtype: dict[str, str]
+        """
+        reasons = {}
+        for line in output.splitlines():
+            fields = line.split(',')
+            if len(fields) > 1:
+                reasons[fields[0]] = reasons.get(fields[0], '') + fields[1]
+        return reasons
+
     def parse_queue_reason(self, output: str, job_id: str) -> str:
         """
         Parses the queue reason from the output of the command.
@@ -649,12 +757,7 @@ class SlurmPlatform(ParamikoPlatform):
         :return: queue reason.
         :rtype: str
         """
-        reason = [x.split(',')[1] for x in output.splitlines()
-                  if x.split(',')[0] == str(job_id)]
-        if isinstance(reason,list):
-            # convert reason to str
-            return ''.join(reason)
-        return reason # noqa F501
+        return self.parse_queue_reasons(output).get(str(job_id), '')
 
     def get_queue_status(self, in_queue_jobs: List['Job'], list_queue_jobid: str, as_conf: AutosubmitConfig) -> None:
         """
@@ -671,25 +774,30 @@ class SlurmPlatform(ParamikoPlatform):
         """
         if not in_queue_jobs:
             return
-        cmd = self.get_queue_status_cmd(list_queue_jobid)
-        self.send_command(cmd)
-        queue_status = self._ssh_output
+        queue_reasons = self.get_queue_snapshot()[0]
+        # The cancellations and releases are sent together, in one round trip
+        commands = []
+        failed_jobs = []
         for job in in_queue_jobs:
-            reason = self.parse_queue_reason(queue_status, job.id)
+            reason = queue_reasons.get(str(job.id), '')
             if job.queuing_reason_cancel(reason):  # this should be a platform method to be implemented
                 Log.error(
                     f"Job {job.name} will be cancelled and set to FAILED as it was queuing due to {reason}")
-                self.send_command(
-                    self.cancel_cmd + f" {job.id}")
-                job.new_status = Status.FAILED
-                job.update_status(as_conf)
+                commands.append(self.cancel_cmd + f" {job.id}")
+                failed_jobs.append(job)
             elif reason == '(JobHeldUser)':
                 if not job.hold:
                     # should be self.release_cmd or something like that, but it is not implemented
-                    self.send_command(f"scontrol release {job.id}")
+                    commands.append(f"scontrol release {job.id}")
                     job.new_status = Status.QUEUING  # If it was HELD and was released, it should be QUEUING next.
                 else:
                     job.new_status = Status.HELD
+        # Set to FAILED before sending the batch, which stops at the first command that fails
+        for job in failed_jobs:
+            job.new_status = Status.FAILED
+            job.update_status(as_conf)
+        if commands:
+            self.send_commands(commands)
 
     def wrapper_header(self,**kwargs: Any) -> str:
         """
@@ -0,0 +1,185 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Integration tests for the Slurm platform, against the local emulator of Slurm."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from autosubmit.job.job import Job
+from autosubmit.job.job_common import Status
+from autosubmit.platforms.slurmplatform import SlurmPlatform
+from test.integration.test_utils.fake_slurm import FakeSlurm, parse_time_limit
+
+_EXPID = 't000'
+_PLATFORM_NAME = 'FAKE_SLURM'
+# Jobs submitted and checked by the driver test, e.g. AS_FAKE_SLURM_JOBS=2000 to benchmark the platform
+_DRIVER_JOBS = int(os.environ.get('AS_FAKE_SLURM_JOBS', 20))
+
+
+@pytest.fixture
+def as_conf(autosubmit_config, tmp_path):
+    return autosubmit_config(_EXPID, experiment_data={
+        'PLATFORMS': {
+            _PLATFORM_NAME: {
+                'TYPE': 'slurm',
+                'HOST': 'localhost',
+                'USER': 'user',
+                'PROJECT': 'project',
+                'SCRATCH_DIR': str(tmp_path / 'scratch'),
+                'QUEUE': 'debug',
+                'ADD_PROJECT_TO_HOST': False,
+                'MAX_WALLCLOCK': '00:10',
+                'TEMP_DIR': '',
+            }
+        }
+    })
+
+
+@pytest.fixture
+def platform(as_conf, tmp_path):
+    platform = SlurmPlatform(_EXPID, _PLATFORM_NAME, config=as_conf.experiment_data)
+    platform.scratch, platform.project_dir, platform.user = str(tmp_path / 'scratch'), 'project', 'user'
+    platform.update_cmds()
+    Path(platform.remote_log_dir).mkdir(parents=True)
+    yield platform
+    platform._channel_pool.close()
+
+
+def _slurm(platform, tmp_path, **kwargs) -> FakeSlurm:
+    slurm = FakeSlurm(tmp_path / 'slurm', **kwargs).install()
+    slurm.attach(platform, pool_size=2)
+    return slurm
+
+
+def _write_script(platform, name: str, body: str) -> str:
+    script = f'{name}.cmd'
+    Path(platform.remote_log_dir, script).write_text(
+        f'#!/bin/bash\n#SBATCH -J {name}\n#SBATCH --output={name}.out\n#SBATCH --error={name}.err\n'
+        f'#SBATCH -t 00:01:00\n{body}\n')
+    return script
+
+
+def _submit(platform, scripts, hold=False):
+    command = platform._submit_hold_cmd if hold else platform._submit_cmd
+    outputs = platform.send_commands([f'{command}{script}' for script in scripts])
+    return [job_id for output in outputs for job_id in platform.get_submitted_job_id(output)]
+
+
+def _wait_for_status(platform, job_ids, finished=('COMPLETED', 'FAILED', 'NODE_FAIL', 'TIMEOUT', 'CANCELLED+')):
+    deadline = time.monotonic() + 30
+    while True:
+        platform.send_command(platform.get_checkAlljobs_cmd(','.join(str(job_id) for job_id in job_ids)))
+        jobs_status = platform.parse_jobs_status(platform.get_ssh_output())
+        if all(jobs_status.get(str(job_id)) in finished for job_id in job_ids) or time.monotonic() > deadline:
+            return jobs_status
+        time.sleep(0.2)
+
+
+@pytest.mark.parametrize('value,seconds', [
+    ('10', 600),
+    ('02:30', 150),
+    ('01:00:00', 3600),
+    ('1-02', 93600),
+    ('1-00:01:02', 86462),
+    ('UNLIMITED', 0),
+])
+def test_parse_time_limit(value, seconds):
+    assert parse_time_limit(value) == seconds
+
+
+@pytest.mark.parametrize('quirks', [(), ('sacct_steps', 'sbatch_warning')])
+def test_submit_and_check_jobs(platform, tmp_path, quirks):
+    _slurm(platform, tmp_path, quirks=quirks)
+    scripts = [_write_script(platform, 't000_SIM', 'echo "Job $SLURM_JOB_ID"'),
+               _write_script(platform, 't000_POST', 'exit 3')]
+
+    job_ids = _submit(platform, scripts)
+    jobs_status = _wait_for_status(platform, job_ids)
+
+    assert [jobs_status[str(job_id)] for job_id in job_ids] == ['COMPLETED', 'FAILED']
+    assert platform.parse_Alljobs_output(platform.get_ssh_output(), job_ids[0]) in platform.job_status['COMPLETED']
+    assert Path(platform.remote_log_dir, 't000_SIM.out').read_text() == f'Job {job_ids[0]}\n'
+
+
+def test_queue_snapshot_hold_and_cancel(platform, tmp_path):
+    _slurm(platform, tmp_path)
+    script = _write_script(platform, 't000_SIM', 'sleep 60')
+
+    job_id = _submit(platform, [script], hold=True)[0]
+    reasons, _ = platform.get_queue_snapshot()
+    assert reasons == {str(job_id): '(JobHeldUser)'}
+    assert platform.get_jobid_by_jobname('t000_SIM') == [str(job_id)]
+
+    platform.send_command(f'scontrol release {job_id}')
+    platform.send_command(platform.cancel_job(str(job_id)))
+    jobs_status = _wait_for_status(platform, [job_id])
+
+    assert jobs_status[str(job_id)] in platform.job_status['FAILED']
+    platform.invalidate_queue_snapshot()
+    assert platform.get_queue_snapshot() == ({}, {})
+
+
+def test_queue_delay_and_node_failures(platform, tmp_path):
+    _slurm(platform, tmp_path, queue_delay=60, failure_rate=1.0, seed=1)
+    script = _write_script(platform, 't000_SIM', 'true')
+
+    job_id = _submit(platform, [script])[0]
+    platform.send_command(platform.get_checkjob_cmd(str(job_id)))
+    assert platform.parse_job_output(platform.get_ssh_output()) in platform.job_status['QUEUING']
+
+    FakeSlurm(tmp_path / 'slurm', failure_rate=1.0, seed=1).install()
+    jobs_status = _wait_for_status(platform, [job_id])
+    assert jobs_status[str(job_id)] == 'NODE_FAIL'
+    assert 'NODE_FAIL' in platform.job_status['FAILED']
+
+
+
+def test_submit_and_check_jobs_driver(platform, as_conf, tmp_path):
+    """Submits the jobs in one submit script, and checks them until they end, as ``autosubmit run`` does."""
+    _slurm(platform, tmp_path, queue_delay=0.5, failure_rate=0.05, seed=1)
+    Path(platform._submit_script_path).parent.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for index in range(_DRIVER_JOBS):
+        job = Job(f'{_EXPID}_{index}_SIM', 0, Status.READY, 0)
+        job.platform, job.wallclock = platform, '00:01'
+        platform.submit_job(job, _write_script(platform, job.name, 'sleep 0.1'))
+        jobs.append(job)
+
+    start = time.monotonic()
+    for job, job_id in zip(jobs, platform.submit_Script()):
+        job.id, job.status = job_id, Status.SUBMITTED
+    checks = 0
+    pending = jobs
+    while pending and time.monotonic() - start < 60 + _DRIVER_JOBS / 10:
+        platform.check_Alljobs([[job, job.status] for job in pending], as_conf)
+        checks += 1
+        for job in pending:
+            job.status = job.new_status
+        pending = [job for job in pending if job.status not in (Status.COMPLETED, Status.FAILED)]
+        time.sleep(0.2)
+    elapsed = time.monotonic() - start
+
+    assert pending == []
+    assert {job.status for job in jobs} <= {Status.COMPLETED, Status.FAILED}
+    assert len({job.id for job in jobs}) == _DRIVER_JOBS
+    # The commands are pipelined to the shells of the pool, instead of one SSH session each
+    assert platform.transport.sessions_opened <= 2
+    print(f'{_DRIVER_JOBS} jobs submitted and checked {checks} times in {elapsed:.1f} seconds')
@@ -129,90 +129,6 @@ def test_refresh_log_retry_process(prepare_test, local, as_conf, mocker):
     assert local.log_recovery_process.is_alive() is False
 
 
-@pytest.mark.parametrize("work_event, cleanup_event, recovery_queue_full, result", [
-    (True, False, True, True),
-    (True, False, False, True),
-    (False, True, True, True),
-    (False, True, False, True),
-    (False, False, True, True),
-    (False, False, False, False),
-    (True, True, True, True),
-], ids=["w(T)|c(F)|rq(T)", "w(T)|c(F)|rq(F)", "w(F)|c(T)|rq(T)", "w(F)|c(T)|rq(F)", "w(F)|c(F)|rq(T)",
-        "w(F)|c(F)|rq(F)", "w(T)|c(T)|rq(T)"])
-def test_wait_until_timeout(prepare_test, local, as_conf, mocker, cleanup_event, work_event, recovery_queue_full,
-                            result):
-    mocker.patch('autosubmit.platforms.platform.max', return_value=2)
-    mocker.patch('autosubmit.platforms.platform.Platform.get_mp_context', return_value=mp.get_context('fork'))
-    local.keep_alive_timeout = 2
-    max_items = 1
-    ctx = local.get_mp_context()
-    local.prepare_process(ctx)
-    local.recovery_queue = CopyQueue(ctx=ctx)
-    local.cleanup_event.set() if cleanup_event else local.cleanup_event.clear()
-    local.work_event.set() if work_event else local.work_event.clear()
-    if recovery_queue_full:
-        for i in range(max_items):
-            local.recovery_queue.put(Job('t000', f'000{i}', Status.COMPLETED, 0))
-    process_log = local.wait_until_timeout(2)
-    assert process_log == result
-
-
-@pytest.mark.parametrize("work_event, cleanup_event, recovery_queue_full, result", [
-    (True, False, True, True),
-    (True, False, False, True),
-    (False, True, True, True),
-    (False, True, False, True),
-    (False, False, True, True),
-    (False, False, False, False),
-    (True, True, True, True),
-], ids=["w(T)|c(F)|rq(T)", "w(T)|c(F)|rq(F)", "w(F)|c(T)|rq(T)", "w(F)|c(T)|rq(F)", "w(F)|c(F)|rq(T)",
-        "w(F)|c(F)|rq(F)", "w(T)|c(T)|rq(T)"])
-def test_wait_for_work(prepare_test, local, as_conf, mocker, cleanup_event, work_event, recovery_queue_full,
-                       result):
-    mocker.patch('autosubmit.platforms.platform.max', return_value=2)
-    mocker.patch('autosubmit.platforms.platform.Platform.get_mp_context', return_value=mp.get_context('fork'))
-    local.keep_alive_timeout = 2
-    max_items = 1
-    ctx = local.get_mp_context()
-    local.prepare_process(ctx)
-    local.recovery_queue = CopyQueue(ctx=ctx)
-    local.cleanup_event.set() if cleanup_event else local.cleanup_event.clear()
-    local.work_event.set() if work_event else local.work_event.clear()
-    if recovery_queue_full:
-        for i in range(max_items):
-            local.recovery_queue.put(Job('t000', f'000{i}', Status.COMPLETED, 0))
-    process_log = local.wait_for_work(2)
-    assert process_log == result
-
-
-@pytest.mark.parametrize("work_event, cleanup_event, recovery_queue_full, result", [
-    (True, False, True, True),
-    (True, False, False, True),
-    (False, True, True, True),
-    (False, True, False, True),
-    (False, False, True, True),
-    (False, False, False, False),
-    (True, True, True, True),
-], ids=["w(T)|c(F)|rq(T)", "w(T)|c(F)|rq(F)", "w(F)|c(T)|rq(T)", "w(F)|c(T)|rq(F)", "w(F)|c(F)|rq(T)",
-        "w(F)|c(F)|rq(F)", "w(T)|c(T)|rq(T)"])
-def test_wait_mandatory_time(prepare_test, local, as_conf, mocker, cleanup_event, work_event, recovery_queue_full,
-                             result):
-    mocker.patch('autosubmit.platforms.platform.max', return_value=2)
-    mocker.patch('autosubmit.platforms.platform.Platform.get_mp_context', return_value=mp.get_context('fork'))
-    local.keep_alive_timeout = 2
-    max_items = 1
-    ctx = local.get_mp_context()
-    local.prepare_process(ctx)
-    local.recovery_queue = CopyQueue(ctx=ctx)
-    local.cleanup_event.set() if cleanup_event else local.cleanup_event.clear()
-    local.work_event.set() if work_event else local.work_event.clear()
-    if recovery_queue_full:
-        for i in range(max_items):
-            local.recovery_queue.put(Job('rng', f'000{i}', Status.COMPLETED, 0))
-    process_log = local.wait_mandatory_time(2)
-    assert process_log == result
-
-
 def test_unique_elements(local, mocker):
     mocker.patch('autosubmit.platforms.platform.Platform.get_mp_context', return_value=mp.get_context('fork'))
     max_items = 3
@@ -0,0 +1,725 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Local emulator of a Slurm scheduler, to test and benchmark the Slurm platform without a cluster.
+
+The commands ``sbatch``, ``squeue``, ``sacct``, ``scancel`` and ``scontrol`` are small scripts
+that call this module. The jobs are kept in a SQLite database and run as local processes.
+There is no daemon: each command first starts the pending jobs whose queue delay is over, and
+each running job is watched by its own process, that records how it ended.
+
+A ``SlurmPlatform`` is attached to the emulator with ``FakeSlurm.attach``, which replaces its
+SSH transport by local shells and its SFTP channel by local file operations::
+
+    slurm = FakeSlurm(tmp_path / 'slurm', queue_delay=1, failure_rate=0.01).install()
+    slurm.attach(platform)
+
+The emulator can also be called directly, e.g. ``python fake_slurm.py <state dir> squeue``.
+"""
+
+import getpass
+import json
+import os
+import random
+import re
+import shlex
+import shutil
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import closing, suppress
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+COMMANDS = ['sbatch', 'squeue', 'sacct', 'scancel', 'scontrol']
+
+QUIRKS = {
+    # sacct lists the steps of the jobs even with -X
+    'sacct_steps',
+    # sbatch prints a warning to the error output on each submission
+    'sbatch_warning',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    user TEXT NOT NULL,
+    state TEXT NOT NULL,
+    reason TEXT NOT NULL DEFAULT 'None',
+    script TEXT NOT NULL,
+    workdir TEXT NOT NULL,
+    stdout TEXT NOT NULL,
+    stderr TEXT NOT NULL,
+    time_limit INTEGER NOT NULL DEFAULT 0,
+    held INTEGER NOT NULL DEFAULT 0,
+    submit REAL NOT NULL,
+    eligible REAL NOT NULL,
+    start REAL,
+    end REAL,
+    exit_code INTEGER,
+    pid INTEGER
+)
+"""
+
+# Default width of the fields of sacct
+_SACCT_WIDTHS = {
+    'jobid': 12, 'jobname': 10, 'partition': 10, 'account': 10, 'alloccpus': 10, 'state': 10,
+    'exitcode': 8, 'ncpus': 10, 'nnodes': 8, 'submit': 19, 'start': 19, 'end': 19,
+    'elapsed': 10, 'consumedenergy': 14, 'maxrss': 10, 'averss': 10, 'timelimit': 10,
+}
+_SACCT_DEFAULT_FORMAT = 'JobID,JobName,Partition,Account,AllocCPUS,State,ExitCode'
+
+_SQUEUE_HEADERS = {
+    'A': 'JOBID', 'i': 'JOBID', 'j': 'NAME', 'R': 'NODELIST(REASON)', 'T': 'STATE', 't': 'ST',
+    'u': 'USER', 'M': 'TIME', 'P': 'PARTITION', 'D': 'NODES', 'S': 'START_TIME', 'l': 'TIME_LIMIT',
+}
+_SQUEUE_DEFAULT_FORMAT = '%.18i %.9P %.8j %.8u %.2t %.10M %.6D %R'
+_SQUEUE_FIELD = re.compile(r'%(\.)?(\d*)([a-zA-Z])')
+_SHORT_STATES = {'PENDING': 'PD', 'RUNNING': 'R', 'COMPLETED': 'CD', 'CANCELLED': 'CA', 'FAILED': 'F',
+                 'TIMEOUT': 'TO', 'NODE_FAIL': 'NF'}
+
+# Options of sbatch that take a value, as short and long names
+_SBATCH_OPTIONS = {
+    '-D': 'chdir', '-J': 'job-name', '-o': 'output', '-e': 'error', '-t': 'time', '-p': 'partition',
+    '-A': 'account', '-q': 'qos', '-N': 'nodes', '-n': 'ntasks', '-c': 'cpus-per-task', '-d': 'dependency',
+    '-C': 'constraint', '-w': 'nodelist', '-x': 'exclude', '-a': 'array', '-M': 'clusters',
+}
+_SBATCH_LONG_OPTIONS = set(_SBATCH_OPTIONS.values()) | {
+    'export', 'mem', 'mem-per-cpu', 'ntasks-per-node', 'reservation', 'begin', 'exclusive', 'hint',
+    'distribution', 'threads-per-core', 'tasks-per-node', 'wckey', 'mail-type', 'mail-user', 'comment',
+}
+_SBATCH_FLAGS = {'-H': 'hold', '--hold': 'hold', '--no-requeue': 'no-requeue', '--requeue': 'requeue',
+                 '--parsable': 'parsable', '-W': 'wait', '--wait': 'wait'}
+
+
+class SlurmError(Exception):
+    """Error of a command of the emulator, printed as Slurm does."""
+
+
+def parse_time_limit(value: str) -> int:
+    """
+    Parses a time limit in one of the formats of Slurm: ``M``, ``M:S``, ``H:M:S``, ``D-H``,
+    ``D-H:M`` and ``D-H:M:S``.
+
+    :param value: Time limit.
+    :return: Seconds, 0 if unlimited.
+    """
+    value = value.strip()
+    if value.lower() in ('', 'infinite', 'unlimited', '-1'):
+        return 0
+    days = 0
+    if '-' in value:
+        days_text, value = value.split('-', 1)
+        days = int(days_text)
+        parts = [int(part) for part in value.split(':')] + [0] * 2
+        return days * 86400 + parts[0] * 3600 + parts[1] * 60 + parts[2]
+    parts = [int(part) for part in value.split(':')]
+    if len(parts) == 1:
+        return parts[0] * 60
+    if len(parts) == 2:
+        return parts[0] * 60 + parts[1]
+    return parts[0] * 3600 + parts[1] * 60 + parts[2]
+
+
+def _format_date(timestamp: Optional[float]) -> str:
+    if timestamp is None:
+        return 'Unknown'
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp))
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    text = f'{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}'
+    return f'{days}-{text}' if days else text
+
+
+def _fit(value: str, width: int, right: bool = True) -> str:
+    """Fits a value to a column of sacct, truncated with ``+`` as sacct does."""
+    if len(value) > width:
+        value = value[:width - 1] + '+'
+    return value.rjust(width) if right else value.ljust(width)
+
+
+def _split_ids(values: Iterable[str]) -> List[int]:
+    ids = []
+    for value in values:
+        for job_id in value.replace(',', ' ').split():
+            # Steps and array tasks refer to their job
+            ids.append(int(re.split(r'[._+]', job_id, 1)[0]))
+    return ids
+
+
+class FakeSlurm(object):
+    """
+    A Slurm scheduler emulated with local processes, kept in a state directory.
+
+    The commands write their output like Slurm, including the alignment and truncation of
+    the fields of ``sacct`` and ``squeue``, so the parsers of the platform are exercised.
+    """
+
+    def __init__(self, state_dir: Union[str, Path], queue_delay: float = 0.0, failure_rate: float = 0.0,
+                 max_running: int = 0, sacct_lag: float = 0.0, quirks: Iterable[str] = (),
+                 seed: Optional[int] = None):
+        """
+        :param state_dir: Directory of the database and the commands of the emulator.
+        :param queue_delay: Seconds a job waits in the queue before it can start.
+        :param failure_rate: Probability of a job ending in ``NODE_FAIL`` instead of running.
+        :param max_running: Maximum number of jobs running at the same time, 0 for no limit.
+        :param sacct_lag: Seconds after the submission before a job is listed by ``sacct``, as
+            when the accounting database lags behind the controller.
+        :param quirks: Output format quirks to enable, from ``QUIRKS``.
+        :param seed: Seed of the node failures, to make them reproducible.
+        """
+        unknown = set(quirks) - QUIRKS
+        if unknown:
+            raise ValueError(f'Unknown quirks: {", ".join(sorted(unknown))}')
+        self.state_dir = Path(state_dir).absolute()
+        self.queue_delay = queue_delay
+        self.failure_rate = failure_rate
+        self.max_running = max_running
+        self.sacct_lag = sacct_lag
+        self.quirks = set(quirks)
+        self.seed = seed
+
+    @property
+    def bin_dir(self) -> Path:
+        return self.state_dir / 'bin'
+
+    @property
+    def database(self) -> Path:
+        return self.state_dir / 'slurm.db'
+
+    @classmethod
+    def load(cls, state_dir: Union[str, Path]) -> 'FakeSlurm':
+        """Loads the emulator installed in the state directory."""
+        config = json.loads((Path(state_dir) / 'config.json').read_text())
+        return cls(state_dir, **config)
+
+    def install(self) -> 'FakeSlurm':
+        """Creates the database, the configuration and the commands in the state directory."""
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        (self.state_dir / 'config.json').write_text(json.dumps({
+            'queue_delay': self.queue_delay, 'failure_rate': self.failure_rate, 'max_running': self.max_running,
+            'sacct_lag': self.sacct_lag, 'quirks': sorted(self.quirks), 'seed': self.seed,
+        }))
+        with closing(self.connect()) as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute(_SCHEMA)
+        for command in COMMANDS:
+            path = self.bin_dir / command
+            path.write_text(f'#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(str(Path(__file__).absolute()))}'
+                            f' {shlex.quote(str(self.state_dir))} {command} "$@"\n')
+            path.chmod(0o755)
+        return self
+
+    def connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.database), timeout=60, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def environ(self) -> Dict[str, str]:
+        """Environment where the commands of the emulator are found first."""
+        environ = dict(os.environ)
+        environ['PATH'] = f'{self.bin_dir}{os.pathsep}{environ.get("PATH", "")}'
+        environ.setdefault('USER', getpass.getuser())
+        return environ
+
+    def attach(self, platform: Any, pool_size: int = 4) -> None:
+        """
+        Connects a Slurm platform to the emulator. Its commands are run in local shells, where
+        the commands of the emulator are found first, and its files are copied locally.
+
+        :param platform: ``SlurmPlatform`` to connect.
+        :param pool_size: Number of shells open at the same time.
+        """
+        from autosubmit.platforms.channel_pool import ChannelPool
+
+        platform.transport = LocalShellTransport(self.bin_dir)
+        platform._channel_pool = ChannelPool(pool_size)
+        platform._ftpChannel = LocalSFTPClient()
+        platform.connected = True
+
+    # Commands
+
+    def run(self, command: str, args: List[str]) -> int:
+        """
+        Runs a command of the emulator.
+
+        :param command: Name of the command, from ``COMMANDS``.
+        :param args: Arguments of the command.
+        :return: Exit code.
+        """
+        with closing(self.connect()) as db:
+            try:
+                if command == '_run':
+                    return self._run_job(db, int(args[0]))
+                self._schedule(db)
+                return getattr(self, f'_{command}')(db, args)
+            except SlurmError as e:
+                print(f'{command}: error: {e}', file=sys.stderr)
+                return 1
+
+    def _schedule(self, db: sqlite3.Connection) -> None:
+        """Starts the pending jobs whose queue delay is over."""
+        now = time.time()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            running = db.execute("SELECT COUNT(*) FROM jobs WHERE state = 'RUNNING'").fetchone()[0]
+            pending = db.execute("SELECT id, eligible FROM jobs WHERE state = 'PENDING' AND held = 0 "
+                                 "ORDER BY id").fetchall()
+            for row in pending:
+                job_id = row['id']
+                if row['eligible'] + self.queue_delay > now:
+                    continue
+                if 0 < self.max_running <= running:
+                    db.execute("UPDATE jobs SET reason = 'Resources' WHERE id = ?", (job_id,))
+                    continue
+                draw = random.Random(f'{self.seed}-{job_id}').random() if self.seed is not None else random.random()
+                if draw < self.failure_rate:
+                    db.execute("UPDATE jobs SET state = 'NODE_FAIL', reason = 'None', start = ?, end = ?, "
+                               "exit_code = 1 WHERE id = ?", (now, now, job_id))
+                    continue
+                runner = subprocess.Popen([sys.executable, str(Path(__file__).absolute()), str(self.state_dir),
+                                           '_run', str(job_id)], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                          stderr=subprocess.DEVNULL, start_new_session=True)
+                db.execute("UPDATE jobs SET state = 'RUNNING', reason = 'None', start = ?, pid = ? WHERE id = ?",
+                           (now, runner.pid, job_id))
+                running += 1
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+    def _run_job(self, db: sqlite3.Connection, job_id: int) -> int:
+        """Runs the script of a job and records how it ended. This process leads the job process group."""
+        job = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        environ = dict(os.environ, SLURM_JOB_ID=str(job_id), SLURM_JOBID=str(job_id), SLURM_JOB_NAME=job['name'],
+                       SLURM_JOB_NODELIST=socket.gethostname(), SLURM_SUBMIT_DIR=job['workdir'],
+                       SLURM_NNODES='1', SLURM_CPUS_ON_NODE='1')
+        state = 'FAILED'
+        try:
+            with open(job['stdout'], 'ab') as stdout, open(job['stderr'], 'ab') as stderr:
+                process = subprocess.Popen(['bash', job['script']], cwd=job['workdir'], env=environ,
+                                           stdin=subprocess.DEVNULL, stdout=stdout, stderr=stderr)
+                try:
+                    exit_code = process.wait(timeout=job['time_limit'] or None)
+                    state = 'COMPLETED' if exit_code == 0 else 'FAILED'
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                    exit_code, state = 0, 'TIMEOUT'
+        except OSError:
+            exit_code = 1
+        # A cancelled job keeps its state
+        db.execute("UPDATE jobs SET state = ?, end = ?, exit_code = ? WHERE id = ? AND state = 'RUNNING'",
+                   (state, time.time(), exit_code, job_id))
+        return 0
+
+    def _sbatch(self, db: sqlite3.Connection, args: List[str]) -> int:
+        options, script = self._parse_sbatch_args(args)
+        if script is None:
+            raise SlurmError('No batch script specified')
+        script_path = Path(script).absolute()
+        if not script_path.is_file():
+            raise SlurmError(f'Unable to open file {script}')
+        directives = self._parse_directives(script_path.read_text(errors='replace'))
+        directives.update(options)
+        options = directives
+        workdir = Path(options.get('chdir', os.getcwd())).absolute()
+        name = options.get('job-name', script_path.name)
+        try:
+            time_limit = parse_time_limit(options.get('time', ''))
+        except ValueError:
+            raise SlurmError('Invalid time limit specification')
+        held = 1 if options.get('hold') else 0
+        now = time.time()
+        db.execute('BEGIN IMMEDIATE')
+        cursor = db.execute('INSERT INTO jobs (name, user, state, reason, script, workdir, stdout, stderr, time_limit, '
+                            'held, submit, eligible) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            (name, getpass.getuser(), 'PENDING', 'JobHeldUser' if held else 'Priority',
+                             str(script_path), str(workdir), '', '', time_limit, held, now, now))
+        job_id = cursor.lastrowid
+        stdout = self._output_path(options.get('output', 'slurm-%j.out'), workdir, job_id, name)
+        stderr = self._output_path(options.get('error', options.get('output', 'slurm-%j.out')), workdir, job_id, name)
+        db.execute('UPDATE jobs SET stdout = ?, stderr = ? WHERE id = ?', (stdout, stderr, job_id))
+        db.execute('COMMIT')
+        if 'sbatch_warning' in self.quirks:
+            print('sbatch: warning: this is a local emulation of Slurm', file=sys.stderr)
+        print(job_id if options.get('parsable') else f'Submitted batch job {job_id}')
+        return 0
+
+    @staticmethod
+    def _parse_sbatch_args(args: List[str]) -> Tuple[Dict[str, str], Optional[str]]:
+        """Parses the options given to sbatch, up to the script."""
+        options = {}
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg in _SBATCH_FLAGS:
+                options[_SBATCH_FLAGS[arg]] = 'true'
+            elif arg.startswith('--'):
+                key, separator, value = arg[2:].partition('=')
+                if not separator and key in _SBATCH_LONG_OPTIONS and args:
+                    value = args.pop(0)
+                options[key] = value
+            elif arg[:2] in _SBATCH_OPTIONS:
+                value = arg[2:] if len(arg) > 2 else (args.pop(0) if args else '')
+                options[_SBATCH_OPTIONS[arg[:2]]] = value
+            elif arg.startswith('-'):
+                raise SlurmError(f'unrecognized option {arg}')
+            else:
+                return options, arg
+        return options, None
+
+    @classmethod
+    def _parse_directives(cls, script: str) -> Dict[str, str]:
+        """Parses the ``#SBATCH`` lines of a script, up to its first command, as sbatch does."""
+        args = []
+        for line in script.splitlines()[1:]:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                break
+            if line.startswith('#SBATCH'):
+                with suppress(ValueError):
+                    args.extend(shlex.split(line[len('#SBATCH'):], comments=True))
+        options, _ = cls._parse_sbatch_args(args + ['script'])
+        return options
+
+    @staticmethod
+    def _output_path(pattern: str, workdir: Path, job_id: int, name: str) -> str:
+        path = pattern.replace('%j', str(job_id)).replace('%J', str(job_id)).replace('%x', name)
+        path = path.replace('%u', getpass.getuser()).replace('%%', '%')
+        return str(workdir / path)
+
+    def _squeue(self, db: sqlite3.Connection, args: List[str]) -> int:
+        header = True
+        format_ = _SQUEUE_DEFAULT_FORMAT
+        filters = []
+        values = []
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            option, separator, value = arg.partition('=')
+            if option in ('-h', '--noheader'):
+                header = False
+                continue
+            if option in ('-o', '--format', '-u', '--user', '-j', '--jobs', '-n', '--name', '-t', '--states'):
+                value = value if separator else (args.pop(0) if args else '')
+            elif option[:2] in ('-o', '-u', '-j', '-n', '-t'):
+                option, value = option[:2], arg[2:]
+            else:
+                raise SlurmError(f'unrecognized option {arg}')
+            if option in ('-o', '--format'):
+                format_ = value
+            elif option in ('-u', '--user'):
+                users = value.split(',')
+                filters.append(f'user IN ({",".join("?" * len(users))})')
+                values.extend(users)
+            elif option in ('-j', '--jobs'):
+                ids = _split_ids([value])
+                filters.append(f'id IN ({",".join("?" * len(ids))})')
+                values.extend(ids)
+            elif option in ('-n', '--name'):
+                names = value.split(',')
+                filters.append(f'name IN ({",".join("?" * len(names))})')
+                values.extend(names)
+            else:
+                states = [state.upper() for state in value.split(',')]
+                filters.append(f'state IN ({",".join("?" * len(states))})')
+                values.extend(states)
+        filters.append("state IN ('PENDING', 'RUNNING')")
+        rows = db.execute(f'SELECT * FROM jobs WHERE {" AND ".join(filters)} ORDER BY id', values).fetchall()
+        lines = []
+        if header:
+            lines.append(self._squeue_line(format_, lambda field: _SQUEUE_HEADERS.get(field, field.upper())))
+        now = time.time()
+        for row in rows:
+            lines.append(self._squeue_line(format_, lambda field, row=row: self._squeue_field(row, field, now)))
+        if lines:
+            print('\n'.join(lines))
+        return 0
+
+    @staticmethod
+    def _squeue_line(format_: str, value_of: Any) -> str:
+        def replace(match: re.Match) -> str:
+            right, width, field = match.groups()
+            value = str(value_of(field))
+            if not width:
+                return value
+            value = value[:int(width)]
+            return value.rjust(int(width)) if right else value.ljust(int(width))
+        return _SQUEUE_FIELD.sub(replace, format_)
+
+    @staticmethod
+    def _squeue_field(row: sqlite3.Row, field: str, now: float) -> str:
+        if field in ('A', 'i'):
+            return str(row['id'])
+        if field == 'j':
+            return row['name']
+        if field == 'R':
+            return socket.gethostname() if row['state'] == 'RUNNING' else f"({row['reason']})"
+        if field == 'T':
+            return row['state']
+        if field == 't':
+            return _SHORT_STATES.get(row['state'], row['state'][:2])
+        if field == 'u':
+            return row['user']
+        if field == 'M':
+            return _format_duration(now - row['start']) if row['start'] else '0:00'
+        if field == 'S':
+            return _format_date(row['start']) if row['start'] else 'N/A'
+        if field == 'l':
+            return _format_duration(row['time_limit']) if row['time_limit'] else 'UNLIMITED'
+        if field == 'P':
+            return 'local'
+        if field == 'D':
+            return '1'
+        return ''
+
+    def _sacct(self, db: sqlite3.Connection, args: List[str]) -> int:
+        header = True
+        allocations = False
+        parsable = False
+        format_ = _SACCT_DEFAULT_FORMAT
+        ids = []
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            option, separator, value = arg.partition('=')
+            if option in ('-n', '--noheader'):
+                header = False
+            elif option in ('-X', '--allocations'):
+                allocations = True
+            elif option in ('-P', '--parsable2'):
+                parsable = True
+            elif option in ('-j', '--jobs', '-o', '--format', '-u', '--user', '-S', '--starttime', '-E', '--endtime'):
+                value = value if separator else (args.pop(0) if args else '')
+                if option in ('-j', '--jobs'):
+                    ids.extend(_split_ids([value]))
+                elif option in ('-o', '--format'):
+                    format_ = value
+            else:
+                raise SlurmError(f'unrecognized option {arg}')
+        columns = []
+        for column in format_.split(','):
+            name, _, width = column.strip().partition('%')
+            columns.append((name, int(width) if width else _SACCT_WIDTHS.get(name.lower(), 10)))
+        query = 'SELECT * FROM jobs WHERE submit <= ?'
+        values: List[Any] = [time.time() - self.sacct_lag]
+        if ids:
+            query += f' AND id IN ({",".join("?" * len(ids))})'
+            values.extend(ids)
+        lines = []
+        if header and not parsable:
+            lines.append(' '.join(_fit(name, width) for name, width in columns))
+            lines.append(' '.join('-' * width for _, width in columns))
+        elif header:
+            lines.append('|'.join(name for name, _ in columns))
+        for row in db.execute(query + ' ORDER BY id', values).fetchall():
+            records = [(str(row['id']), row['state'], row)]
+            if row['start'] is not None and (not allocations or 'sacct_steps' in self.quirks):
+                batch_state = row['state'] if row['state'] not in ('TIMEOUT', 'NODE_FAIL') else 'CANCELLED'
+                records.append((f"{row['id']}.batch", batch_state, row))
+                records.append((f"{row['id']}.extern", 'COMPLETED' if row['end'] else 'RUNNING', row))
+            for job_id, state, record in records:
+                fields = [self._sacct_field(record, job_id, state, name) for name, _ in columns]
+                if parsable:
+                    lines.append('|'.join(fields))
+                else:
+                    lines.append(' '.join(_fit(field, width) for field, (_, width) in zip(fields, columns)))
+        if lines:
+            print('\n'.join(lines))
+        return 0
+
+    @staticmethod
+    def _sacct_field(row: sqlite3.Row, job_id: str, state: str, name: str) -> str:
+        name = name.lower()
+        if name == 'jobid':
+            return job_id
+        if name == 'jobname':
+            return row['name'] if '.' not in job_id else job_id.split('.', 1)[1]
+        if name == 'state':
+            # The user that cancelled the job is part of its state, truncated by sacct to CANCELLED+
+            return f'CANCELLED by {os.getuid()}' if state == 'CANCELLED' and '.' not in job_id else state
+        if name == 'exitcode':
+            return '0:0' if job_id.endswith('.extern') else f"{row['exit_code'] or 0}:0"
+        if name in ('submit', 'start', 'end'):
+            return _format_date(row[name])
+        if name == 'elapsed':
+            if row['start'] is None:
+                return '00:00:00'
+            return _format_duration((row['end'] or time.time()) - row['start'])
+        if name in ('alloccpus', 'ncpus', 'nnodes'):
+            return '1'
+        if name == 'partition':
+            return 'local'
+        if name == 'timelimit':
+            return _format_duration(row['time_limit']) if row['time_limit'] else 'UNLIMITED'
+        if name == 'consumedenergy':
+            return '0'
+        return ''
+
+    def _scancel(self, db: sqlite3.Connection, args: List[str]) -> int:
+        ids = _split_ids(arg for arg in args if not arg.startswith('-'))
+        if not ids:
+            raise SlurmError('No job identification provided')
+        exit_code = 0
+        now = time.time()
+        for job_id in ids:
+            db.execute('BEGIN IMMEDIATE')
+            row = db.execute('SELECT state, pid FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                db.execute('COMMIT')
+                print(f'scancel: error: Kill job error on job id {job_id}: Invalid job id specified', file=sys.stderr)
+                exit_code = 1
+                continue
+            if row['state'] in ('PENDING', 'RUNNING'):
+                db.execute("UPDATE jobs SET state = 'CANCELLED', reason = 'None', end = ? WHERE id = ?",
+                           (now, job_id))
+            db.execute('COMMIT')
+            if row['state'] == 'RUNNING' and row['pid']:
+                with suppress(OSError):
+                    os.killpg(row['pid'], signal.SIGTERM)
+        return exit_code
+
+    def _scontrol(self, db: sqlite3.Connection, args: List[str]) -> int:
+        args = [arg for arg in args if arg not in ('-o', '--oneliner')]
+        if not args:
+            raise SlurmError('No command given')
+        command = args[0].lower()
+        if command in ('hold', 'release'):
+            for job_id in _split_ids(args[1:]):
+                if command == 'hold':
+                    db.execute("UPDATE jobs SET held = 1, reason = 'JobHeldUser' WHERE id = ? AND state = 'PENDING'",
+                               (job_id,))
+                else:
+                    db.execute("UPDATE jobs SET held = 0, reason = 'Priority', eligible = ? "
+                               "WHERE id = ? AND state = 'PENDING' AND held = 1", (time.time(), job_id))
+            return 0
+        if command == 'show' and len(args) > 1 and args[1].lower() == 'hostnames':
+            print(socket.gethostname())
+            return 0
+        if command == 'show' and len(args) > 2 and args[1].lower() in ('job', 'jobid'):
+            job_id = _split_ids(args[2:3])[0]
+            row = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                raise SlurmError('Invalid job id specified')
+            print(f"JobId={row['id']} JobName={row['name']} UserId={row['user']} JobState={row['state']} "
+                  f"Reason={row['reason']} SubmitTime={_format_date(row['submit'])} "
+                  f"EligibleTime={_format_date(row['eligible'] + self.queue_delay)} "
+                  f"StartTime={_format_date(row['start'])} EndTime={_format_date(row['end'])} "
+                  f"WorkDir={row['workdir']} StdOut={row['stdout']} StdErr={row['stderr']}")
+            return 0
+        raise SlurmError(f'Invalid command: {" ".join(args)}')
+
+
+class LocalShellChannel(object):
+    """Wraps a ``LoopbackChannel`` whose shell finds the commands of the emulator first."""
+
+    def __init__(self, channel: Any, bin_dir: Path):
+        self._channel = channel
+        self._bin_dir = bin_dir
+
+    def exec_command(self, command: str) -> None:
+        self._channel.exec_command(f'PATH={shlex.quote(str(self._bin_dir))}:"$PATH"; USER="${{USER:-$(id -un)}}"; '
+                                   f'export PATH USER; {command}')
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._channel, name)
+
+
+class LocalShellTransport(object):
+    """Stand-in of a paramiko transport, whose sessions are local shells that use the emulator."""
+
+    def __init__(self, bin_dir: Path):
+        from test.unit.utils.loopback import LoopbackTransport
+
+        self._transport = LoopbackTransport()
+        self._bin_dir = bin_dir
+
+    @property
+    def sessions_opened(self) -> int:
+        return self._transport.sessions_opened
+
+    def open_session(self) -> LocalShellChannel:
+        return LocalShellChannel(self._transport.open_session(), self._bin_dir)
+
+    def is_active(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class LocalSFTPClient(object):
+    """Stand-in of a paramiko SFTP client, with the file operations used by the platforms."""
+
+    def get_channel(self) -> 'LocalSFTPClient':
+        return self
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        pass
+
+    def put(self, localpath: str, remotepath: str, callback: Any = None, confirm: bool = True) -> None:
+        shutil.copyfile(localpath, remotepath)
+
+    def get(self, remotepath: str, localpath: str, callback: Any = None) -> None:
+        shutil.copyfile(remotepath, localpath)
+
+    def file(self, filename: str, mode: str = 'r', bufsize: int = -1) -> Any:
+        return open(filename, mode if 'b' in mode else mode + 'b')
+
+    def stat(self, path: str) -> os.stat_result:
+        return os.stat(path)
+
+    def chdir(self, path: Optional[str] = None) -> None:
+        if path is not None and not os.path.isdir(path):
+            raise FileNotFoundError(path)
+
+    def chmod(self, path: str, mode: int) -> None:
+        os.chmod(path, mode)
+
+    def mkdir(self, path: str, mode: int = 0o777) -> None:
+        os.mkdir(path, mode)
+
+    def rmdir(self, path: str) -> None:
+        os.rmdir(path)
+
+    def remove(self, path: str) -> None:
+        os.remove(path)
+
+    def rename(self, oldpath: str, newpath: str) -> None:
+        os.rename(oldpath, newpath)
+
+    def close(self) -> None:
+        pass
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2:
+        print(f'Usage: {Path(__file__).name} <state dir> <{"|".join(COMMANDS)}> [args...]', file=sys.stderr)
+        return 2
+    return FakeSlurm.load(argv[0]).run(argv[1], argv[2:])
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
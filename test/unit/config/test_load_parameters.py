@@ -15,6 +15,9 @@
 # You should have received a copy of the GNU General Public License
 # along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
 
+from autosubmit.platforms.platform import Platform
+
+
 def test_load_parameters(autosubmit_config):
     as_conf = autosubmit_config(
         expid='a000',
@@ -23,3 +26,48 @@ def test_load_parameters(autosubmit_config):
                                     'M': '%M%', 'M_': '%M_%', 'm': '%m%', 'm_': '%m_%'})
     parameters = as_conf.load_parameters()
     assert parameters['VAR.DEEP_VAR'] == ['%NOTFOUND%', '%TEST%', '%TEST2%']
+
+
+def test_load_parameters_is_cached(autosubmit_config, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={'VAR': {'DEEP_VAR': 'value'}})
+    spy = mocker.spy(as_conf, 'deep_parameters_export')
+
+    parameters = as_conf.load_parameters()
+    parameters['VAR.DEEP_VAR'] = 'changed by the caller'
+    assert as_conf.load_parameters()['VAR.DEEP_VAR'] == 'value'
+    assert spy.call_count == 1
+
+    # New keys or a new version are noticed
+    as_conf.experiment_data['OTHER'] = 'other'
+    assert as_conf.load_parameters()['OTHER'] == 'other'
+    as_conf.experiment_data['VAR']['DEEP_VAR'] = 'new value'
+    as_conf.invalidate_parameters()
+    assert as_conf.load_parameters()['VAR.DEEP_VAR'] == 'new value'
+    assert spy.call_count == 3
+
+
+def test_load_parameters_returns_copies_of_the_containers(autosubmit_config):
+    as_conf = autosubmit_config(expid='a000', experiment_data={'VAR': {'LIST': ['a', 'b']}})
+
+    as_conf.load_parameters()['VAR.LIST'].append('c')
+
+    assert as_conf.load_parameters()['VAR.LIST'] == ['a', 'b']
+    assert as_conf.experiment_data['VAR']['LIST'] == ['a', 'b']
+
+
+def test_load_parameters_after_in_place_updates(autosubmit_config, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={'VAR': {'DEEP_VAR': 'value'}, 'HPCARCH': 'old'})
+    assert as_conf.load_parameters()['VAR.DEEP_VAR'] == 'value'
+
+    as_conf.deep_update(as_conf.experiment_data, {'VAR': {'DEEP_VAR': 'new value'}})
+    assert as_conf.load_parameters()['VAR.DEEP_VAR'] == 'new value'
+
+    platform = mocker.MagicMock(name='platform')
+    platform.name = 'new'
+    platform.get_files_path.return_value = '/log'
+    Platform.add_parameters(platform, as_conf)
+    assert as_conf.load_parameters()['HPCARCH'] == 'new'
+    version = as_conf.data_version
+    # Nothing changed, so the cache is kept
+    Platform.add_parameters(platform, as_conf)
+    assert as_conf.data_version == version
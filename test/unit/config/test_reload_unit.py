@@ -15,11 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 import time
 from pathlib import Path
 
 import pytest
 
+from autosubmit.config.yamlparser import YAMLParser
+
 
 @pytest.mark.parametrize(
     "force_load,current_loaded_files,expected_result",
@@ -92,3 +95,80 @@ def test_needs_reload(autosubmit_config, tmpdir, current_loaded_files, reload_wh
         as_conf.experiment_data["CONFIG"]["RELOAD_WHILE_RUNNING"] = False
 
     assert as_conf.needs_reload() == expected_result
+
+
+def test_reload_without_changes_keeps_data_version(autosubmit_config, tmpdir):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    as_conf.conf_folder_yaml = tmpdir / 'conf'
+    Path(as_conf.conf_folder_yaml).mkdir(parents=True, exist_ok=True)
+    with open(as_conf.conf_folder_yaml / 'test.yml', 'w') as f:
+        f.write('VAR: value')
+
+    as_conf.reload(force_load=True)
+    version = as_conf.data_version
+    experiment_data = as_conf.experiment_data
+    as_conf.reload(force_load=True)
+    assert as_conf.data_version == version
+    assert as_conf.experiment_data is experiment_data
+
+    with open(as_conf.conf_folder_yaml / 'test.yml', 'w') as f:
+        f.write('VAR: other value')
+    as_conf.reload(force_load=True)
+    assert as_conf.data_version == version + 1
+    assert as_conf.load_parameters()['VAR'] == 'other value'
+
+
+def test_reload_reuses_parsed_files(autosubmit_config, tmpdir, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    as_conf.conf_folder_yaml = tmpdir / 'conf'
+    Path(as_conf.conf_folder_yaml).mkdir(parents=True, exist_ok=True)
+    for name in ['a', 'b']:
+        with open(as_conf.conf_folder_yaml / f'{name}.yml', 'w') as f:
+            f.write(f'{name.upper()}: value')
+    as_conf.reload(force_load=True)
+
+    create_parser = mocker.spy(as_conf.parser_factory, 'create_parser')
+    load = mocker.spy(YAMLParser, 'load')
+    # Touched, but with the same content
+    os.utime(as_conf.conf_folder_yaml / 'a.yml', (time.time() + 10, time.time() + 10))
+    assert not as_conf.needs_reload()
+    as_conf.reload()
+    assert load.call_count == 0
+
+    with open(as_conf.conf_folder_yaml / 'b.yml', 'w') as f:
+        f.write('B: other value')
+    os.utime(as_conf.conf_folder_yaml / 'b.yml', (time.time() + 20, time.time() + 20))
+    assert as_conf.needs_reload()
+    as_conf.reload()
+    # Only the changed file is parsed again
+    assert load.call_count == 1
+    assert create_parser.call_count > 1
+    assert as_conf.experiment_data['A'] == 'value'
+    assert as_conf.experiment_data['B'] == 'other value'
+
+
+def test_reload_starts_a_new_stat_pass(autosubmit_config, tmpdir):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    as_conf.conf_folder_yaml = tmpdir / 'conf'
+    Path(as_conf.conf_folder_yaml).mkdir(parents=True, exist_ok=True)
+    with open(as_conf.conf_folder_yaml / 'a.yml', 'w') as f:
+        f.write('A: value')
+    as_conf.reload(force_load=True)
+
+    with open(as_conf.conf_folder_yaml / 'a.yml', 'w') as f:
+        f.write('A: other value')
+    os.utime(as_conf.conf_folder_yaml / 'a.yml', (time.time() + 10, time.time() + 10))
+    # Not followed by a reload, its stat pass must not be reused later
+    assert as_conf.needs_reload()
+
+    with open(as_conf.conf_folder_yaml / 'a.yml', 'w') as f:
+        f.write('A: third value')
+    os.utime(as_conf.conf_folder_yaml / 'a.yml', (time.time() + 20, time.time() + 20))
+    as_conf.reload(force_load=True)
+    assert as_conf.experiment_data['A'] == 'third value'
+    assert not as_conf.needs_reload()
+
+
+def test_config_file_mtime_of_a_missing_file(autosubmit_config, tmpdir):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    assert as_conf._config_file_mtime(tmpdir / 'missing.yml') == 0
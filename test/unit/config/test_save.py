@@ -62,10 +62,20 @@ def test_save(autosubmit_config, tmpdir, mocker, data: dict, owner: str):
             assert data['DEFAULT']['HPCARCH'] == loaded['DEFAULT']['HPCARCH']
             assert data['ROOTDIR'] == loaded['ROOTDIR']
 
+        # Nothing changed, nothing is written
+        dump = mocker.spy(YAML, 'dump')
+        as_conf.save()
+        assert dump.call_count == 0
+        assert not (Path(as_conf.metadata_folder) / 'experiment_data.yml.bak').exists()
+
         # Test .bak generated.
+        as_conf.experiment_data['NEW_KEY'] = 'new value'
         as_conf.save()
+        assert dump.call_count == 1
         assert (Path(as_conf.metadata_folder) / 'experiment_data.yml.bak').exists()
+        assert not (Path(as_conf.metadata_folder) / 'experiment_data.yml.tmp').exists()
         # force fail save
+        as_conf.experiment_data['NEW_KEY'] = 'other value'
         mocker.patch("builtins.open", side_effect=Exception("Forced exception"))
         mocker.patch("shutil.copyfile", return_value=True)
         as_conf.save()
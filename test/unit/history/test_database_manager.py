@@ -0,0 +1,84 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the pool of connections of the history database managers."""
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from autosubmit.history.database_managers import database_manager
+from autosubmit.history.database_managers.database_manager import ConnectionPool, DatabaseManager
+
+
+@pytest.fixture
+def manager(mocker):
+    mocker.patch.object(database_manager, 'connection_pool', ConnectionPool())
+    yield DatabaseManager('a000')
+    database_manager.connection_pool.close()
+
+
+@pytest.fixture
+def db_file(tmp_path, manager):
+    db_file = str(tmp_path / 'job_data_a000.db')
+    manager.execute_statement_on_dbfile(db_file, 'CREATE TABLE job_data (id INTEGER PRIMARY KEY, name TEXT)')
+    return db_file
+
+
+def test_one_connection_per_database_file(mocker, manager, db_file):
+    connect = mocker.spy(sqlite3, 'connect')
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: manager.insert_statement_with_arguments(
+            db_file, 'INSERT INTO job_data (name) VALUES (?)', (f'a000_{i}',)), range(40)))
+
+    assert manager.get_from_statement(db_file, 'SELECT COUNT(*) FROM job_data') == [(40,)]
+    assert manager.get_from_statement(db_file, 'PRAGMA journal_mode') == [('wal',)]
+    connect.assert_not_called()
+
+
+def test_failed_statement_is_rolled_back(manager, db_file):
+    with pytest.raises(sqlite3.IntegrityError):
+        manager.execute_many_statement_with_arguments_on_dbfile(
+            db_file, 'INSERT INTO job_data (id, name) VALUES (?, ?)', [(1, 'a000_SIM'), (1, 'a000_POST')])
+
+    assert manager.get_from_statement(db_file, 'SELECT * FROM job_data') == []
+
+
+def test_reopens_a_replaced_database_file(manager, db_file, tmp_path):
+    manager.insert_statement_with_arguments(db_file, 'INSERT INTO job_data (name) VALUES (?)', ('a000_SIM',))
+    database_manager.connection_pool.close(db_file)
+    replacement = str(tmp_path / 'replacement.db')
+    with sqlite3.connect(replacement) as conn:
+        conn.execute('CREATE TABLE job_data (id INTEGER PRIMARY KEY, name TEXT)')
+    manager.get_from_statement(db_file, 'SELECT * FROM job_data')
+
+    os.replace(replacement, db_file)
+
+    assert manager.get_from_statement(db_file, 'SELECT * FROM job_data') == []
+
+
+def test_close_writes_the_changes_to_the_database_file(manager, db_file):
+    manager.insert_statement_with_arguments(db_file, 'INSERT INTO job_data (name) VALUES (?)', ('a000_SIM',))
+
+    database_manager.connection_pool.close()
+
+    assert not os.path.exists(f'{db_file}-wal')
+    with sqlite3.connect(db_file) as conn:
+        assert conn.execute('SELECT name FROM job_data').fetchall() == [('a000_SIM',)]
@@ -109,7 +109,7 @@ def test_cancel_jobs_platform_error(create_job_list, mocker):
         }
     ])
 
-    job_list.get_job_list()[0].platform.send_command.side_effect = ValueError('platypus')
+    job_list.get_job_list()[0].platform.send_commands.side_effect = ValueError('platypus')
 
     mocked_log = mocker.patch('autosubmit.job.job_utils.Log')
 
@@ -145,3 +145,19 @@ def test_cancel_jobs(create_job_list):
 
     for job in job_list.get_job_list():
         assert job.status == Status.KEY_TO_VALUE[target_status]
+
+
+def test_cancel_jobs_of_a_platform_at_once(create_job_list, mocker):
+    """Test that the jobs of a platform are cancelled in one round trip."""
+    platform = mocker.MagicMock(cancel_cmd='scancel')
+    job_list = create_job_list([
+        {'status': Status.KEY_TO_VALUE['RUNNING'], 'platform': platform},
+        {'status': Status.KEY_TO_VALUE['QUEUING'], 'platform': platform}
+    ])
+    for index, job in enumerate(job_list.get_job_list()):
+        job.id = str(index)
+
+    cancel_jobs(job_list, [Status.KEY_TO_VALUE['RUNNING'], Status.KEY_TO_VALUE['QUEUING']], 'FAILED')
+
+    platform.send_commands.assert_called_once_with(['scancel 0', 'scancel 1'], ignore_log=True)
+    platform.send_command.assert_not_called()
@@ -0,0 +1,159 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+from contextlib import closing
+from threading import Event, Thread
+
+import pytest
+
+from autosubmit.autosubmit import Autosubmit
+from autosubmit.database import db_backup
+from autosubmit.database.db_backup import (
+    backup_database, check_integrity, restore_database, restore_database_from_dump
+)
+from autosubmit.database.db_manager import DbManager
+
+
+def _create_database(path, rows=1000):
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE job_data (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO job_data(name) VALUES (?)", [(f"a000_SIM_{i}" * 20,) for i in range(rows)])
+        conn.commit()
+
+
+def _count(path):
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT count(*) FROM job_data").fetchone()[0]
+
+
+def test_backup_while_the_database_is_written(tmp_path):
+    database, backup = tmp_path / "job_data_a000.db", tmp_path / "job_data_a000_backup.db"
+    _create_database(database)
+    stop = Event()
+
+    def write():
+        with closing(sqlite3.connect(database)) as conn:
+            while not stop.is_set():
+                conn.execute("INSERT INTO job_data(name) VALUES ('a000_POST')")
+                conn.commit()
+
+    writer = Thread(target=write)
+    writer.start()
+    try:
+        backup_database(database, backup, pages=1)
+    finally:
+        stop.set()
+        writer.join()
+
+    assert check_integrity(backup) == []
+    assert 1000 <= _count(backup) <= _count(database)
+    assert not (tmp_path / "job_data_a000_backup.db-wal").exists()
+
+
+def test_incorrect_backup_keeps_the_previous_one(mocker, tmp_path):
+    database, backup = tmp_path / "job_data_a000.db", tmp_path / "job_data_a000_backup.db"
+    _create_database(database)
+    backup_database(database, backup)
+    with closing(sqlite3.connect(database)) as conn:
+        conn.execute("DELETE FROM job_data")
+        conn.commit()
+    mocker.patch.object(db_backup, "check_integrity", return_value=["Page 2 is never used"])
+
+    with pytest.raises(sqlite3.DatabaseError, match="Page 2 is never used"):
+        backup_database(database, backup)
+
+    assert _count(backup) == 1000
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith(".tmp")] == []
+
+
+def test_check_integrity_of_a_corrupted_database(tmp_path):
+    database = tmp_path / "job_data_a000.db"
+    _create_database(database)
+    with open(database, "r+b") as f:
+        f.seek(4096)
+        f.write(b"\xff" * 8192)
+
+    assert check_integrity(database) != []
+    assert check_integrity(database, quick=True) != []
+    assert check_integrity(tmp_path / "missing.db") != []
+
+
+def test_restore_replaces_the_database_and_its_wal(tmp_path):
+    database, backup = tmp_path / "job_data_a000.db", tmp_path / "job_data_a000_backup.db"
+    _create_database(database)
+    backup_database(database, backup)
+    database.write_bytes(b"not a database")
+    (tmp_path / "job_data_a000.db-wal").write_bytes(b"stale")
+
+    restore_database(backup, database)
+
+    assert _count(database) == 1000
+    assert not (tmp_path / "job_data_a000.db-wal").exists()
+
+
+def test_restore_from_a_legacy_dump(tmp_path):
+    database, dump = tmp_path / "job_data_a000.db", tmp_path / "job_data_a000.sql"
+    _create_database(database, rows=10)
+    with closing(sqlite3.connect(database)) as conn:
+        dump.write_text("\n".join(conn.iterdump()))
+    database.write_bytes(b"not a database")
+
+    restore_database_from_dump(dump, database)
+
+    assert _count(database) == 10
+
+
+def test_db_manager_backup_and_restore(tmp_path):
+    manager = DbManager(str(tmp_path), "a000", 1)
+    manager.create_table("tests", ["name"])
+    manager.insert("tests", ["name"], ["a000_SIM"])
+    manager.backup()
+    manager.drop_table("tests")
+
+    manager.restore()
+
+    assert manager.select_all("tests") == [("a000_SIM",)]
+    manager.disconnect()
+
+
+def test_database_fix_restores_the_backup(mocker, tmp_path):
+    mocker.patch("autosubmit.autosubmit.BasicConfig.JOBDATA_DIR", str(tmp_path))
+    mocker.patch("autosubmit.autosubmit.BasicConfig.HISTORICAL_LOG_DIR", str(tmp_path))
+    mocker.patch("autosubmit.autosubmit.ExperimentHistory")
+    database = tmp_path / "job_data_a000.db"
+    _create_database(database)
+    Autosubmit.database_backup("a000")
+    database.write_bytes(b"not a database")
+
+    Autosubmit.database_fix("a000")
+
+    assert _count(database) == 1000
+    assert (tmp_path / "job_data_a000_corrupted.db").read_bytes() == b"not a database"
+
+
+def test_database_backup_waits_for_the_interval(mocker, tmp_path):
+    mocker.patch("autosubmit.autosubmit.BasicConfig.JOBDATA_DIR", str(tmp_path))
+    backup = mocker.patch("autosubmit.autosubmit.backup_database")
+    (tmp_path / "job_data_a000_backup.db").touch()
+
+    Autosubmit.database_backup("a000", min_interval=600)
+    backup.assert_not_called()
+
+    Autosubmit.database_backup("a000")
+    assert backup.call_count == 1
@@ -38,6 +38,9 @@ from autosubmit.job.job import Job
 from autosubmit.job.job_common import Status
 from autosubmit.job.job_list import JobList
 from autosubmit.job.job_list_persistence import JobListPersistencePkl
+from autosubmit.job.job_template import (
+    ScriptFile, ScriptTemplate, TemplateCache, TemplateContent, substitute_placeholders, write_scripts
+)
 from autosubmit.job.job_utils import calendar_chunk_section
 from autosubmit.job.job_utils import get_job_package_code, SubJob, SubJobManager
 from autosubmit.log.log import AutosubmitCritical
@@ -2072,3 +2075,140 @@ def test_write_end_time_ignore_exp_history(completed: bool, existing_lines: str,
     existing_lines = len(existing_lines.split('\n')) - 1 if existing_lines else 0
     expected_lines = existing_lines + 1
     assert len(total_stats.read_text().split('\n')) == expected_lines
+
+
+def test_update_parameters_reuses_section_parameters(autosubmit_config, local, mocker):
+    as_conf = autosubmit_config('t000', {
+        'CONFIG': {
+            'METRIC_FOLDER': '%CURRENT_ROOTDIR%/metrics',
+        },
+        'JOBS': {
+            'SIM': {
+                'FOO': '%CURRENT_METRIC_FOLDER%/foo',
+                'BAR': ['%CURRENT_ARCH%', '%CURRENT_METRIC_FOLDER%'],
+                'BAZ': ['a', 'b'],
+            },
+            'POST': {
+                'FOO': 'post',
+            },
+        },
+    })
+    jobs = []
+    for name, section in [('t000_1_SIM', 'SIM'), ('t000_2_SIM', 'SIM'), ('t000_3_POST', 'POST')]:
+        job = Job(name, '1', Status.READY, 0)
+        job.section = section
+        job.platform = local
+        jobs.append(job)
+    spy = mocker.spy(as_conf, 'substitute_dynamic_variables')
+
+    first = jobs[0].update_parameters(as_conf)
+    calls = spy.call_count
+    second = jobs[1].update_parameters(as_conf)
+    # Same section and platform, nothing is substituted again
+    assert spy.call_count == calls
+    jobs[2].update_parameters(as_conf)
+    assert spy.call_count > calls
+
+    for job, parameters in [(jobs[0], first), (jobs[1], second)]:
+        metric_folder = str(Path(local.root_dir, 'metrics', job.name))
+        assert parameters['CURRENT_METRIC_FOLDER'] == metric_folder
+        assert parameters['CURRENT_FOO'] == f'{metric_folder}/foo'
+        assert parameters['JOBNAME'] == job.name
+        expected = job.substitute_section_parameters(as_conf)
+        assert {key: parameters[key] for key in expected if key.startswith('CURRENT_')} == \
+               {key: value for key, value in expected.items() if key.startswith('CURRENT_')}
+
+    # The containers are not shared by the jobs of the section
+    assert second['CURRENT_BAZ'] == ['a', 'b']
+    first['CURRENT_BAZ'].append('c')
+    assert second['CURRENT_BAZ'] == ['a', 'b']
+    assert jobs[1].update_parameters(as_conf)['CURRENT_BAZ'] == ['a', 'b']
+
+    # A reload replaces the experiment data, the parameters are substituted again
+    as_conf.experiment_data = dict(as_conf.experiment_data)
+    calls = spy.call_count
+    jobs[0].update_parameters(as_conf)
+    assert spy.call_count > calls
+
+
+@pytest.mark.parametrize('content', [
+    'echo %A% %b% %Y%',
+    'cp %A%_%B%.nc %UNDEFINED%/%A%',
+    '%A%%B% and %%A%% and 100%% done',
+    '%A.B% %AXB% %A%',
+    '%A%_%%B%',
+    'plain text without placeholders',
+    'echo %BACKSLASH% %PERCENT%',
+], ids=['case', 'adjacent', 'escaped', 'dotted', 'overlapping', 'plain', 'unsafe-values'])
+def test_substitute_placeholders_compiled_template(content, mocker):
+    """The compiled templates render the same content as the sequential substitution."""
+    skipped_placeholders = frozenset(['%d%', '%Y%'])
+    parameters = {'A': 'a', 'B': 'b', 'A.B': 'ab', 'AXB': 'axb', '_': 'underscore',
+                  'BACKSLASH': 'C:\\tmp', 'PERCENT': '50%'}
+
+    compiled = substitute_placeholders(content, parameters, skipped_placeholders, ['UNDEFINED'])
+    mocker.patch.object(ScriptTemplate, 'render', return_value=None)
+    expected = substitute_placeholders(content, parameters, skipped_placeholders, ['UNDEFINED'])
+
+    assert compiled == expected
+
+
+@pytest.mark.parametrize('parts', [
+    ['#SBATCH -J %A%\n', 'echo %A% %B%', '\n%B%\n'],
+    ['echo x%', 'A% %B%'],
+    ['echo %Y%\n', 'echo %y%'],
+    ['echo %A.B%\n', 'echo %AXB%'],
+    ['echo %A%B\n', 'echo %B%'],
+    ['echo %_%\n', 'echo %A%_%B%'],
+], ids=['separable', 'split-placeholder', 'skipped-case', 'dotted', 'name-after', 'name-after-key'])
+def test_substitute_placeholders_template_parts(parts):
+    """The parts of a content render the same content as the whole content."""
+    skipped_placeholders = frozenset(['%d%', '%Y%'])
+    parameters = {'A': 'a', 'B': 'b', 'Y': 'y', 'A.B': 'ab', 'AXB': 'axb', '_': 'underscore'}
+
+    content = TemplateContent(parts, cached=[False] + [True] * (len(parts) - 1))
+
+    assert substitute_placeholders(content, parameters, skipped_placeholders) == \
+           substitute_placeholders(''.join(parts), parameters, skipped_placeholders)
+
+
+def test_template_cache_reuses_the_shared_parts():
+    cache = TemplateCache()
+    body = 'echo %A%\n' * 10
+
+    first = cache.compile_parts(TemplateContent(['#SBATCH -J job1\n', body], cached=[False, True]), frozenset())
+    second = cache.compile_parts(TemplateContent(['#SBATCH -J job2\n', body], cached=[False, True]), frozenset())
+
+    assert first.render({'A': 'a'}) == '#SBATCH -J job1\n' + 'echo a\n' * 10
+    assert second._templates[1] is first._templates[1]
+    assert list(cache._compiled) == [(body, frozenset())]
+
+
+def test_template_cache_reads_changed_files(tmp_path):
+    template_file = tmp_path / 'template.sh'
+    template_file.write_text('echo %A%')
+    cache = TemplateCache()
+
+    assert cache.read(str(template_file)) == 'echo %A%'
+    assert cache.compile('echo %A%', frozenset()) is cache.compile('echo %A%', frozenset())
+
+    template_file.write_text('echo %A% %B%')
+    assert cache.read(str(template_file)) == 'echo %A% %B%'
+    assert cache.compile('echo %A% %B%', frozenset()).keys == ['A', 'B']
+
+
+def test_write_scripts(tmp_path):
+    scripts = [
+        ScriptFile.build(str(tmp_path / 'job.cmd'), 'echo %A% %B% %%', {'A': 'a', 'B': 'b', 'C': 'c'},
+                         frozenset(), None, 'UTF-8', executable=True),
+        ScriptFile.build(str(tmp_path / 'job_file'), 'echo %A% %UNDEFINED%', {'A': 'a'},
+                         frozenset(), ['UNDEFINED'], 'UTF-8')
+    ]
+    # Only the parameters used by the placeholders are kept
+    assert scripts[0].parameters == {'A': 'a', 'B': 'b'}
+
+    write_scripts(scripts)
+
+    assert (tmp_path / 'job.cmd').read_text() == 'echo a b %'
+    assert os.access(tmp_path / 'job.cmd', os.X_OK)
+    assert (tmp_path / 'job_file').read_text() == 'echo a '
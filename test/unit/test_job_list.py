@@ -31,6 +31,7 @@ from autosubmit.job.job_common import Type
 from autosubmit.job.job_dict import DicJobs
 from autosubmit.job.job_list import JobList
 from autosubmit.job.job_list_persistence import JobListPersistencePkl
+from autosubmit.log.log import AutosubmitError
 
 """Tests for the ``JobList`` class."""
 
@@ -817,3 +818,196 @@ def test_retrieve_times(job_list, jobs_as_dict, tmp_path, make_exception, second
                                                     job_times=None, seconds=seconds, job_data_collection=None)
             assert retrieve_data.name == job.name
             assert retrieve_data.status == Status.VALUE_TO_KEY[job.status]
+
+
+def test_status_index_follows_status_changes(job_list, jobs_as_dict):
+    """The status getters must reflect status changes made after the index was built."""
+    waiting_job = jobs_as_dict[Status.WAITING][0]
+    assert waiting_job in job_list.get_waiting()
+
+    waiting_job.status = Status.READY
+    assert waiting_job not in job_list.get_waiting()
+    assert waiting_job in job_list.get_ready()
+
+    new_job = _create_dummy_job_with_status(Status.FAILED)
+    job_list._job_list.append(new_job)
+    assert new_job in job_list.get_failed()
+
+
+def test_status_index_keeps_job_list_order(job_list):
+    ready = job_list.get_ready()
+    for job in job_list.get_job_list():
+        if job.status == Status.WAITING:
+            job.status = Status.READY
+    expected = [job for job in job_list.get_job_list() if job.status == Status.READY]
+    assert job_list.get_ready() == expected
+    assert len(expected) > len(ready)
+
+
+def test_status_index_follows_in_place_reorder(job_list):
+    job_list.get_ready()
+    # The ends of the list changed
+    job_list._job_list.reverse()
+    expected = [job for job in job_list.get_job_list() if job.status == Status.READY]
+    assert job_list.get_ready() == expected
+
+    # Both ends are kept, so the index has to be invalidated
+    job_list._job_list[1:-1] = sorted(job_list._job_list[1:-1], key=lambda job: job.name)
+    job_list._status_index.invalidate()
+    expected = [job for job in job_list.get_job_list() if job.status == Status.READY]
+    assert job_list.get_ready() == expected
+
+
+def test_status_index_is_invalidated_when_jobs_are_removed(job_list):
+    job_list.get_ready()
+    ready = job_list.get_ready()[0]
+    job_list._remove_job(ready)
+    assert job_list._status_index._source is None
+    assert ready not in job_list.get_ready()
+
+    job_list.get_ready()
+    job_list.graph = DiGraph()
+    job_list._delete_edgeless_jobs()
+    assert job_list._status_index._source is None
+
+
+def test_status_index_filters_by_platform(job_list, jobs_as_dict, mocker):
+    platform = mocker.MagicMock()
+    platform.name = 'platform'
+    other_platform = mocker.MagicMock()
+    other_platform.name = 'other_platform'
+    platform.serial_platform = platform
+    other_platform.serial_platform = other_platform
+    for job in job_list.get_job_list():
+        job.platform = other_platform
+    running_job = jobs_as_dict[Status.RUNNING][0]
+    running_job.platform = platform
+
+    assert job_list.get_running(platform) == [running_job]
+    assert len(job_list.get_running(other_platform)) == len(jobs_as_dict[Status.RUNNING]) - 1
+
+
+def test_status_index_job_shared_by_two_job_lists(job_list, jobs_as_dict, as_conf):
+    """A job moved by another job list must still be found by the first one."""
+    other_job_list = JobList(_EXPID, as_conf, YAMLParserFactory(), JobListPersistencePkl())
+    other_job_list._job_list = list(job_list.get_job_list())
+    assert job_list.get_waiting() == other_job_list.get_waiting()
+
+    waiting_job = jobs_as_dict[Status.WAITING][0]
+    waiting_job.status = Status.COMPLETED
+    assert waiting_job in job_list.get_completed()
+    assert waiting_job in other_job_list.get_completed()
+
+
+def test_save_passes_the_jobs_changed_since_the_previous_save(job_list, jobs_as_dict, mocker):
+    save = mocker.patch.object(job_list._persistence, 'save')
+    mocker.patch.object(job_list, 'update_status_log')
+
+    job_list.save()
+    assert save.call_args.kwargs['changed_jobs'] is None
+
+    waiting_job = jobs_as_dict[Status.WAITING][0]
+    waiting_job.status = Status.READY
+    job_list._status_index.mark_unsaved([jobs_as_dict[Status.COMPLETED][0]])
+    job_list.save()
+    assert save.call_args.kwargs['changed_jobs'] == [waiting_job, jobs_as_dict[Status.COMPLETED][0]]
+
+    job_list.save()
+    assert save.call_args.kwargs['changed_jobs'] == []
+
+    # A failed save loses the changes taken, so the next one writes every job
+    save.side_effect = [OSError('disk full'), None]
+    waiting_job.status = Status.SUBMITTED
+    with pytest.raises(AutosubmitError):
+        job_list.save()
+    job_list.save()
+    assert save.call_args.kwargs['changed_jobs'] is None
+
+
+def test_remove_persistence_files(empty_job_list):
+    job_list = empty_job_list()
+    names = [f'{job_list._persistence_file}{extension}'
+             for extension in ['.pkl', '_backup.pkl', '.journal', '.stubs.pkl', '_cw_flag.pkl']]
+    for name in names:
+        Path(job_list._persistence_path, name).touch()
+
+    job_list._remove_persistence_files()
+
+    assert sorted(path.name for path in Path(job_list._persistence_path).iterdir()) == [names[-1]]
+
+
+def test_update_list_incremental_only_checks_children_of_changed_jobs(as_conf):
+    job_list = JobList(_EXPID, as_conf, YAMLParserFactory(), JobListPersistencePkl())
+    parent = Job(f"{_EXPID}_parent", "1", Status.RUNNING, 0)
+    child = Job(f"{_EXPID}_child", "2", Status.WAITING, 0)
+    other_parent = Job(f"{_EXPID}_other_parent", "3", Status.RUNNING, 0)
+    other_child = Job(f"{_EXPID}_other_child", "4", Status.WAITING, 0)
+    child.add_parent(parent)
+    other_child.add_parent(other_parent)
+    for job in [parent, child, other_parent, other_child]:
+        job.section = "SECTION"
+        job_list._job_list.append(job)
+
+    # First update is always a full pass
+    job_list.update_list(as_conf, store_change=False, incremental=True)
+    assert job_list.get_waiting() == [child, other_child]
+
+    parent.status = Status.COMPLETED
+    # Bypasses the status setter, so the index does not know about this change
+    other_parent._status = Status.COMPLETED
+    job_list.update_list(as_conf, store_change=False, incremental=True)
+    assert child.status == Status.READY
+    assert other_child.status == Status.WAITING
+
+    job_list.update_list(as_conf, store_change=False)
+    assert other_child.status == Status.READY
+
+
+def test_generate_lazy_keeps_jobs_light(as_conf, mocker, empty_job_list):
+    as_conf.experiment_data = {
+        'DEFAULT': {
+            'EXPID': _EXPID,
+            'HPCARCH': 'ARM'
+        },
+        'JOBS': {
+            'fake-section': {
+                'file': 'fake-file',
+                'running': 'member'
+            }
+        },
+        'PLATFORMS': {
+            'fake-platform': {
+                'type': 'fake-type',
+                'name': 'fake-name',
+                'user': 'fake-user'
+            }
+        }
+    }
+    as_conf.detailed_deep_diff = mocker.Mock(return_value={})
+    mocker.patch('autosubmit.job.job.Job.update_parameters', return_value={})
+    generate_args = dict(
+        as_conf=as_conf,
+        date_list=['fake-date1'],
+        member_list=['fake-member1', 'fake-member2'],
+        num_chunks=1,
+        chunk_ini=1,
+        parameters={},
+        date_format='H',
+        default_retrials=1,
+        default_job_type=Type.BASH,
+        wrapper_jobs={}
+    )
+    job_list = empty_job_list()
+    job_list.generate(new=True, create=True, **generate_args)
+    job_list._job_list[0].status = Status.SUSPENDED
+    job_list._job_list[0].local_logs = ('fake.out', 'fake.err')
+    job_list.save()
+
+    lazy_job_list = empty_job_list()
+    lazy_job_list.generate(new=False, lazy=True, **generate_args)
+
+    assert [job.name for job in lazy_job_list.get_job_list()] == [job.name for job in job_list.get_job_list()]
+    assert lazy_job_list.get_job_list()[0].status == Status.SUSPENDED
+    assert all(job._lazy_state is not None for job in lazy_job_list.get_job_list())
+    assert lazy_job_list.get_job_list()[0].local_logs == ('fake.out', 'fake.err')
+    assert lazy_job_list.get_job_list()[0]._lazy_state is None
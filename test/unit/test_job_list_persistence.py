@@ -0,0 +1,225 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the job list persistence backends."""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from autosubmit.job.job import Job, LazyJobState
+from autosubmit.job.job_common import Status
+from autosubmit.job.job_list_persistence import (
+    JobListPersistenceDb, JobListPersistenceJournal, JobListPersistencePkl
+)
+
+_EXPID = 'a000'
+_PERSISTENCE_FILE = f'job_list_{_EXPID}'
+
+
+@pytest.fixture
+def persistence_path(tmp_path) -> str:
+    Path(tmp_path, 'pkl').mkdir()
+    Path(tmp_path, 'tmp').mkdir()
+    return str(Path(tmp_path, 'pkl'))
+
+
+@pytest.fixture
+def jobs():
+    return [Job(f'{_EXPID}_{i}_SIM', str(i), Status.WAITING, 0) for i in range(5)]
+
+
+def test_journal_first_save_is_a_snapshot(persistence_path, jobs):
+    persistence = JobListPersistenceJournal()
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+
+    assert Path(persistence_path, f'{_PERSISTENCE_FILE}.pkl').exists()
+    journal = Path(persistence_path, f'{_PERSISTENCE_FILE}.journal')
+    journal_size = journal.stat().st_size
+
+    # Nothing changed, nothing is written
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[])
+    assert journal.stat().st_size == journal_size
+
+
+def test_journal_appends_only_changes(persistence_path, jobs, mocker):
+    persistence = JobListPersistenceJournal()
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    snapshot = Path(persistence_path, f'{_PERSISTENCE_FILE}.pkl')
+    snapshot_mtime = snapshot.stat().st_mtime_ns
+    get_state = mocker.spy(Job, '__getstate__')
+
+    jobs[1].status = Status.COMPLETED
+    jobs[3].fail_count = 2
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[1], jobs[3]])
+    jobs[1].local_logs = ('out', 'err')
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[1]])
+
+    # Only the states of the changed jobs are read
+    assert get_state.call_count == 3
+    assert snapshot.stat().st_mtime_ns == snapshot_mtime
+    loaded = JobListPersistenceJournal().load(persistence_path, _PERSISTENCE_FILE)
+    assert loaded[jobs[1].name]['_status'] == Status.COMPLETED
+    assert loaded[jobs[1].name]['_local_logs'] == ('out', 'err')
+    assert loaded[jobs[3].name]['_fail_count'] == 2
+    assert loaded[jobs[0].name]['_status'] == Status.WAITING
+
+
+def test_journal_saves_nested_in_place_changes(persistence_path, jobs):
+    persistence = JobListPersistenceJournal()
+    jobs[1].edge_info = {'COMPLETED': {jobs[0].name: (jobs[0], 0)}}
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+
+    jobs[1].edge_info['COMPLETED'][jobs[2].name] = (jobs[2], 0)
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[1]])
+    jobs[1].edge_info['COMPLETED'].pop(jobs[0].name)
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[1]])
+
+    loaded = JobListPersistenceJournal().load(persistence_path, _PERSISTENCE_FILE)
+    assert list(loaded[jobs[1].name]['edge_info']['COMPLETED']) == [jobs[2].name]
+
+
+@pytest.mark.parametrize('added', [True, False], ids=['jobs-added', 'changes-unknown'])
+def test_journal_compacts(persistence_path, jobs, added):
+    persistence = JobListPersistenceJournal()
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs[:-1] if added else jobs, None)
+    snapshot = Path(persistence_path, f'{_PERSISTENCE_FILE}.pkl')
+    snapshot_mtime = snapshot.stat().st_mtime_ns
+    jobs[0].status = Status.READY
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[0]] if added else None)
+
+    assert snapshot.stat().st_mtime_ns != snapshot_mtime
+    loaded = JobListPersistenceJournal().load(persistence_path, _PERSISTENCE_FILE)
+    assert len(loaded) == len(jobs)
+    assert loaded[jobs[0].name]['_status'] == Status.READY
+
+
+def test_journal_of_another_snapshot_is_ignored(persistence_path, jobs):
+    persistence = JobListPersistenceJournal()
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    jobs[0].status = Status.FAILED
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[0]])
+    journal = Path(persistence_path, f'{_PERSISTENCE_FILE}.journal')
+    old_journal = journal.read_bytes()
+
+    # Simulates a crash between writing a new snapshot and resetting the journal
+    jobs[0].status = Status.COMPLETED
+    persistence.compact(persistence_path, _PERSISTENCE_FILE, jobs)
+    journal.write_bytes(old_journal)
+
+    loaded = JobListPersistenceJournal().load(persistence_path, _PERSISTENCE_FILE)
+    assert loaded[jobs[0].name]['_status'] == Status.COMPLETED
+
+
+def test_journal_truncated_frame_is_ignored(persistence_path, jobs):
+    persistence = JobListPersistenceJournal()
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    jobs[0].status = Status.RUNNING
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[0]])
+    jobs[0].status = Status.COMPLETED
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[0]])
+    journal = Path(persistence_path, f'{_PERSISTENCE_FILE}.journal')
+    journal.write_bytes(journal.read_bytes()[:-3])
+
+    loaded = JobListPersistenceJournal().load(persistence_path, _PERSISTENCE_FILE)
+    assert loaded[jobs[0].name]['_status'] == Status.RUNNING
+
+
+def test_pkl_lazy_load_defers_heavy_attributes(persistence_path, jobs, mocker):
+    jobs[1].status = Status.COMPLETED
+    jobs[1].local_logs = ('out', 'err')
+    jobs[2].local_logs = ('out2', 'err2')
+    JobListPersistencePkl().save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    assert Path(persistence_path, f'{_PERSISTENCE_FILE}.stubs.pkl').exists()
+    assert [path.name for path in Path(persistence_path).iterdir() if '.tmp' in path.name] == []
+
+    spy = mocker.spy(pickle, 'load')
+    loaded = JobListPersistencePkl().load(persistence_path, _PERSISTENCE_FILE, lazy=True)
+    assert spy.call_count == 1
+    loaded_jobs = {name: Job(loaded_data=state) for name, state in loaded.items()}
+    assert loaded_jobs[jobs[1].name].status == Status.COMPLETED
+    assert loaded_jobs[jobs[1].name].name == jobs[1].name
+    assert spy.call_count == 1
+
+    # Saved again, the stubs are still hydrated from the pkl file they were loaded with
+    jobs[1].local_logs = ('new_out', 'new_err')
+    JobListPersistencePkl().save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+
+    # Assigned before hydration, the loaded value must not override it
+    loaded_jobs[jobs[2].name].local_logs = ('new', 'new')
+    assert loaded_jobs[jobs[1].name].local_logs == ('out', 'err')
+    assert loaded_jobs[jobs[2].name].local_logs == ('new', 'new')
+    assert loaded_jobs[jobs[2].name].script_name == jobs[2].script_name
+    assert spy.call_count == 2
+
+
+def test_pkl_lazy_load_without_matching_stubs_is_eager(persistence_path, jobs):
+    JobListPersistencePkl().save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    stubs = Path(persistence_path, f'{_PERSISTENCE_FILE}.stubs.pkl')
+    stubs_content = stubs.read_bytes()
+    # Written by another version, the stubs are stale
+    JobListPersistencePkl().save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    stubs.write_bytes(stubs_content)
+
+    loaded = JobListPersistencePkl().load(persistence_path, _PERSISTENCE_FILE, lazy=True)
+    assert not any(isinstance(state, LazyJobState) for state in loaded.values())
+    assert loaded[jobs[0].name]['script_name'] == jobs[0].script_name
+    # The stubs are only written by the saves
+    assert stubs.read_bytes() == stubs_content
+
+
+def test_journal_lazy_load_applies_changes(persistence_path, jobs):
+    persistence = JobListPersistenceJournal()
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None)
+    jobs[1].status = Status.FAILED
+    jobs[1].local_logs = ('out', 'err')
+    persistence.save(persistence_path, _PERSISTENCE_FILE, jobs, None, changed_jobs=[jobs[1]])
+
+    loaded = JobListPersistenceJournal().load(persistence_path, _PERSISTENCE_FILE, lazy=True)
+    assert isinstance(loaded[jobs[1].name], LazyJobState)
+    job = Job(loaded_data=loaded[jobs[1].name])
+    assert job.status == Status.FAILED
+    assert job.local_logs == ('out', 'err')
+    assert job.script_name == jobs[1].script_name
+
+
+@pytest.mark.parametrize('delta', [True, False])
+def test_db_save_writes_only_changed_rows(autosubmit_config, jobs, delta, mocker):
+    autosubmit_config(_EXPID)
+    persistence = JobListPersistenceDb(_EXPID, delta=delta)
+    persistence.save(None, None, jobs, None)
+    sync_rows = mocker.spy(persistence.db_manager, 'sync_rows')
+    reset_table = mocker.spy(persistence, '_reset_table')
+
+    jobs[1].status = Status.COMPLETED
+    new_job = Job(f'{_EXPID}_5_SIM', '5', Status.READY, 0)
+    persistence.save(None, None, jobs[1:] + [new_job], None)
+
+    rows = {row[0]: row for row in persistence.load(None, None)}
+    assert set(rows) == {job.name for job in jobs[1:] + [new_job]}
+    assert rows[jobs[1].name][2] == Status.COMPLETED
+    assert rows[new_job.name][2] == Status.READY
+    if delta:
+        assert reset_table.call_count == 0
+        inserted, updated, deleted = sync_rows.call_args.args[3:]
+        assert [row[0] for row in inserted] == [new_job.name]
+        assert [row[0] for row in updated] == [jobs[1].name]
+        assert deleted == [jobs[0].name]
+    else:
+        assert reset_table.call_count == 1
+        assert sync_rows.call_count == 0
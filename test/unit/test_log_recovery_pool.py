@@ -0,0 +1,109 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+import queue
+import time
+from threading import Event
+from types import SimpleNamespace
+
+import pytest
+
+from autosubmit.platforms.log_recovery import LogRecoveryPool
+
+
+class _Job(SimpleNamespace):
+    def retrieve_logfiles(self, raise_error=False):
+        self.platform.recovered.append(self.name)
+
+
+@pytest.fixture
+def platform(mocker):
+    platform = SimpleNamespace(name='local', recovery_queue=queue.Queue(), work_event=Event(),
+                               cleanup_event=Event(), recovered=[])
+    platform.retrieve_logfiles_in_bulk = mocker.MagicMock(side_effect=lambda jobs: list(jobs))
+    platform.restore_connection = mocker.MagicMock()
+    return platform
+
+
+@pytest.fixture
+def pool(mocker, platform):
+    mocker.patch.object(LogRecoveryPool, 'BATCH_WINDOW', 0.1)
+    mocker.patch.object(LogRecoveryPool, '_load_job',
+                        side_effect=lambda data: _Job(name=data[0], fail_count=data[1], platform=platform))
+    return LogRecoveryPool(platform, None, workers=2, keep_alive_timeout=30)
+
+
+def _cleanup(platform):
+    platform.cleanup_event.set()
+    platform.recovery_queue.put(None)
+
+
+def test_recovers_the_jobs_received_together_in_bulk(pool, platform):
+    for job in [('a000_SIM', 0), ('a000_POST', 0), ('a000_SIM', 0), ('a000_SIM', 1)]:
+        platform.recovery_queue.put(job)
+    _cleanup(platform)
+
+    pool.run()
+
+    assert sorted(platform.recovered) == ['a000_POST', 'a000_SIM', 'a000_SIM']
+    batches = [[(job.name, job.fail_count) for job in call.args[0]]
+               for call in platform.retrieve_logfiles_in_bulk.call_args_list]
+    assert sorted(job for batch in batches for job in batch) == [('a000_POST', 0), ('a000_SIM', 0), ('a000_SIM', 1)]
+    assert len(batches) == 2
+
+
+def test_retries_the_failed_recoveries(mocker, pool, platform):
+    mocker.patch('autosubmit.platforms.log_recovery.backoff_time', return_value=0.1)
+    failures = iter([True, True, False])
+
+    def retrieve_logfiles(self, raise_error=False):
+        if next(failures):
+            raise ValueError('No log yet')
+        self.platform.recovered.append(self.name)
+
+    mocker.patch.object(_Job, 'retrieve_logfiles', retrieve_logfiles)
+    platform.recovery_queue.put(('a000_SIM', 0))
+    platform.work_event.set()
+    pool.keep_alive_timeout = 1
+
+    pool.run()
+
+    assert platform.recovered == ['a000_SIM']
+    assert platform.retrieve_logfiles_in_bulk.call_count == 3
+    assert platform.restore_connection.call_count == 2
+
+
+def test_gives_up_after_the_maximum_retries(mocker, pool, platform):
+    mocker.patch.object(_Job, 'retrieve_logfiles', side_effect=ValueError('No log'), autospec=True)
+    pool.max_retries = 2
+    platform.recovery_queue.put(('a000_SIM', 0))
+    _cleanup(platform)
+
+    pool.run()
+
+    assert platform.retrieve_logfiles_in_bulk.call_count == 3
+    assert pool._in_flight == set()
+
+
+def test_exits_without_keep_alive_signal(pool, platform):
+    pool.keep_alive_timeout = 0.2
+    start = time.monotonic()
+
+    pool.run()
+
+    assert time.monotonic() - start < 5
+    platform.retrieve_logfiles_in_bulk.assert_not_called()
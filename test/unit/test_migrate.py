@@ -199,3 +199,20 @@ PLATFORMS:
         assert migrate_tmpdir.join(f'scratch/whatever_new/{migrate_tmpdir.owner}/t000').check(dir=True)
         assert "dummy data" == migrate_tmpdir.join(
             f'scratch/whatever_new/{migrate_tmpdir.owner}/t000/real_data/dummy_symlink').read()
+
+
+def test_migrate_offer_and_pickup_jobdata(mocker, tmp_path):
+    mocker.patch.object(BasicConfig, 'read')
+    mocker.patch.object(BasicConfig, 'JOBDATA_DIR', str(tmp_path))
+    migrate = Migrate('t000', False)
+    for suffix in ('.db', '.sql', '_backup.db'):
+        (tmp_path / f'job_data_t000{suffix}').write_text(f'data{suffix}')
+
+    migrate.migrate_offer_jobdata()
+    for suffix in ('.db', '.sql', '_backup.db'):
+        (tmp_path / f'job_data_t000{suffix}').unlink()
+    migrate.migrate_pickup_jobdata()
+
+    for suffix in ('.db', '.sql', '_backup.db'):
+        assert (tmp_path / f'job_data_t000{suffix}').read_text() == f'data{suffix}'
+    assert not (tmp_path / 't000_jobdata.tar').exists()
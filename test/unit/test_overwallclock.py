@@ -162,6 +162,13 @@ def test_platform_job_is_over_wallclock(setup_as_conf, new_platform_mock, platfo
     job_status = platform_instance.job_is_over_wallclock(job, Status.RUNNING, True)
     assert job_status == Status.FAILED
     platform_instance.send_command.assert_called_once()
+    # The caller cancels them later, all at once
+    platform_instance.send_command = mocker.MagicMock()
+    jobs_to_cancel = []
+    job_status = platform_instance.job_is_over_wallclock(job, Status.RUNNING, True, jobs_to_cancel=jobs_to_cancel)
+    assert job_status == Status.FAILED
+    assert jobs_to_cancel == [job]
+    platform_instance.send_command.assert_not_called()
     platform_instance.cancel_cmd = None
     platform_instance.send_command = mocker.MagicMock()
     platform_instance.job_is_over_wallclock(job, Status.RUNNING, True)
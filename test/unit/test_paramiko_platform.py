@@ -15,17 +15,23 @@
 # You should have received a copy of the GNU General Public License
 # along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import signal
+import socket
 from getpass import getuser
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import pytest
+from paramiko.ssh_exception import SSHException
 
 from autosubmit.job.job import Job
 from autosubmit.job.job_common import Status
 from autosubmit.log.log import AutosubmitError
+from autosubmit.platforms.channel_pool import ChannelPool
 from autosubmit.platforms.paramiko_platform import ParamikoPlatform
 from autosubmit.platforms.psplatform import PsPlatform
+from test.unit.utils.loopback import LoopbackTransport
 
 
 @pytest.fixture
@@ -236,3 +242,256 @@ def test_submit_job(mocker, autosubmit_config, tmpdir):
     job.platform_name = platform.name
     jobs_id = platform.submit_job(job, "dummy")
     assert jobs_id == 10000
+
+
+def test_channel_pool_reuses_shells():
+    transport = LoopbackTransport()
+    pool = ChannelPool(2)
+
+    assert pool.run(transport, 'printf "no newline"') == (b'no newline', b'', 0)
+    assert pool.run(transport, "echo 'quoted $HOME'; echo error >&2; exit 3") == (b'quoted $HOME\n', b'error\n', 3)
+    assert transport.sessions_opened == 1
+
+    # Shells of a previous transport are not reused
+    new_transport = LoopbackTransport()
+    assert pool.run(new_transport, 'echo new') == (b'new\n', b'', 0)
+    assert new_transport.sessions_opened == 1
+    pool.close()
+
+
+def test_channel_pool_pipelines_commands():
+    transport = LoopbackTransport()
+    pool = ChannelPool(1)
+
+    results = pool.run_many(transport, ['echo a', 'printf b; echo error >&2; exit 2', 'cat; echo c'])
+
+    assert results == [(b'a\n', b'', 0), (b'b', b'error\n', 2), (b'c\n', b'', 0)]
+    assert transport.sessions_opened == 1
+    pool.close()
+
+
+def test_channel_pool_discards_shells_after_timeout():
+    transport = LoopbackTransport()
+    pool = ChannelPool(1)
+
+    with pytest.raises(socket.timeout):
+        pool.run(transport, 'sleep 5', timeout=0.2)
+    assert pool.run(transport, 'echo again') == (b'again\n', b'', 0)
+    assert transport.sessions_opened == 2
+    pool.close()
+
+
+@pytest.mark.parametrize('closed', [True, False], ids=['closed_channel', 'ended_shell'])
+def test_channel_pool_replaces_shells_closed_while_idle(closed):
+    transport = LoopbackTransport()
+    pool = ChannelPool(1)
+    assert pool.run(transport, 'echo first') == (b'first\n', b'', 0)
+
+    shell = pool._idle[0]
+    if closed:
+        shell.channel.close()
+    else:
+        # The server ended the session, but the channel does not know it yet
+        os.killpg(shell.channel._process.pid, signal.SIGKILL)
+        shell.channel._process.wait()
+
+    assert pool.run_many(transport, ['echo a', 'echo b']) == [(b'a\n', b'', 0), (b'b\n', b'', 0)]
+    assert transport.sessions_opened == 2
+    pool.close()
+
+
+def test_channel_pool_does_not_retry_answered_commands():
+    transport = LoopbackTransport()
+    pool = ChannelPool(1)
+    assert pool.run(transport, 'echo first') == (b'first\n', b'', 0)
+
+    with pytest.raises(SSHException):
+        pool.run_many(transport, ['echo a', 'kill -9 $PPID'])
+    assert transport.sessions_opened == 1
+    pool.close()
+
+
+def test_send_command_uses_channel_pool(mocker, paramiko_platform):
+    platform = paramiko_platform
+    platform._channel_pool = ChannelPool(1)
+    platform.transport = LoopbackTransport()
+    exec_command = mocker.patch.object(platform, 'exec_command')
+
+    assert platform.send_command('echo first')
+    assert platform.get_ssh_output() == 'first\n'
+    assert platform.send_command('echo second; echo warning >&2', ignore_log=True)
+    assert platform.get_ssh_output() == 'second\n'
+    assert platform.get_ssh_output_err() == 'warning\n'
+    assert platform.send_commands(['echo third', 'echo fourth']) == ['third\n', 'fourth\n']
+    assert platform.transport.sessions_opened == 1
+    exec_command.assert_not_called()
+
+    with pytest.raises(AutosubmitError):
+        platform.send_commands(['echo "sbatch: error: Batch job submission failed" >&2'])
+    platform.closeConnection()
+
+
+def test_send_commands_without_channel_pool(mocker, paramiko_platform):
+    platform = paramiko_platform
+    send_command = mocker.patch.object(platform, 'send_command')
+
+    platform.send_commands(['scancel 1', 'scancel 2'], ignore_log=True)
+
+    assert send_command.call_args_list == [mocker.call('scancel 1', True), mocker.call('scancel 2', True)]
+
+
+def test_channel_pool_falls_back_without_sessions(mocker):
+    transport = mocker.MagicMock()
+    transport.open_session.side_effect = SSHException('administratively prohibited')
+
+    assert ChannelPool(1).run(transport, 'echo hello') is None
+
+
+def test_delete_files_in_one_command(mocker, paramiko_platform, tmp_path):
+    platform = paramiko_platform
+    platform._channel_pool = ChannelPool(1)
+    platform.transport = LoopbackTransport()
+    platform.DELETE_FILES_BATCH = 2
+    mocker.patch.object(platform, 'get_files_path', return_value=str(tmp_path))
+    delete_file = mocker.patch.object(platform, 'delete_file')
+    for filename in ['a000_SIM_STAT0', 'a000_SIM_COMPLETED', "a000_POST 'quoted'_COMPLETED"]:
+        (tmp_path / filename).touch()
+
+    removed = platform.delete_files(['a000_SIM_STAT0', 'a000_SIM_COMPLETED', 'a000_POST_STAT0',
+                                     "a000_POST 'quoted'_COMPLETED"])
+
+    assert removed == {'a000_SIM_STAT0': True, 'a000_SIM_COMPLETED': True, 'a000_POST_STAT0': False,
+                       "a000_POST 'quoted'_COMPLETED": True}
+    assert list(tmp_path.iterdir()) == []
+    assert platform.transport.sessions_opened == 1
+    delete_file.assert_not_called()
+    platform.closeConnection()
+
+
+def test_delete_files_falls_back_to_one_by_one(mocker, paramiko_platform):
+    platform = paramiko_platform
+    mocker.patch.object(platform, 'get_files_path', return_value='/remote')
+    mocker.patch.object(platform, 'send_commands', side_effect=AutosubmitError('Session not active', 6005))
+    mocker.patch.object(platform, 'delete_file', side_effect=lambda filename: filename == 'a')
+
+    assert platform.delete_files(['a', 'b']) == {'a': True, 'b': False}
+
+
+def test_send_files_in_one_tar_stream(mocker, paramiko_platform, tmp_path):
+    platform = paramiko_platform
+    platform.transport = LoopbackTransport()
+    local_path, remote_path = tmp_path / 'local', tmp_path / 'remote' / 'a000'
+    local_path.mkdir()
+    platform.tmp_path = str(local_path)
+    mocker.patch.object(platform, 'get_files_path', return_value=str(remote_path))
+    send_file = mocker.patch.object(platform, 'send_file')
+    (local_path / 'a000_SIM.cmd').write_text('#!/bin/bash\necho SIM\n')
+    (local_path / 'a000_SIM.cmd').chmod(0o755)
+    (local_path / 'a000_POST.cmd').write_text('echo POST\n')
+    (local_path / 'a000_POST.cmd').chmod(0o640)
+
+    platform.send_files(['a000_SIM.cmd', 'a000_POST.cmd'])
+
+    assert (remote_path / 'a000_SIM.cmd').read_text() == '#!/bin/bash\necho SIM\n'
+    assert (remote_path / 'a000_SIM.cmd').stat().st_mode & 0o777 == 0o755
+    assert (remote_path / 'a000_POST.cmd').stat().st_mode & 0o777 == 0o640
+    assert platform.transport.sessions_opened == 1
+    send_file.assert_not_called()
+
+
+def test_send_files_falls_back_to_one_by_one(mocker, paramiko_platform):
+    platform = paramiko_platform
+    mocker.patch.object(platform, '_stream_files',
+                        side_effect=AutosubmitError('Could not extract the files', 6004, 'tar: not found'))
+    send_file = mocker.patch.object(platform, 'send_file')
+
+    platform.send_files(['a000_SIM.cmd', 'a000_POST.cmd'])
+
+    assert [call.args[0] for call in send_file.call_args_list] == ['a000_SIM.cmd', 'a000_POST.cmd']
+
+
+def test_defer_uploads_sends_the_files_at_once(mocker, paramiko_platform):
+    platform = paramiko_platform
+    upload_files = mocker.patch.object(platform, '_upload_files')
+
+    with platform.defer_uploads():
+        platform.send_files(['a000_SIM.cmd', 'common.cmd'])
+        platform.send_files(['a000_POST.cmd', 'common.cmd'])
+        platform.send_files(['a000_X11.cmd'], deferrable=False)
+        assert upload_files.call_count == 1
+    upload_files.assert_called_with(['a000_SIM.cmd', 'common.cmd', 'a000_POST.cmd'])
+
+    upload_files.reset_mock()
+    with pytest.raises(ValueError):
+        with platform.defer_uploads():
+            platform.send_files(['a000_SIM.cmd'])
+            raise ValueError
+    upload_files.assert_not_called()
+
+
+def test_get_files_in_one_tar_stream(mocker, paramiko_platform, tmp_path):
+    platform = paramiko_platform
+    platform.transport = LoopbackTransport()
+    local_path, remote_path = tmp_path / 'local', tmp_path / 'remote'
+    (local_path / 'LOG_a000').mkdir(parents=True)
+    remote_path.mkdir()
+    platform.tmp_path = str(local_path)
+    mocker.patch.object(platform, 'get_files_path', return_value=str(remote_path))
+    get_file = mocker.patch.object(platform, 'get_file')
+    (remote_path / 'a000_SIM.cmd.out.0').write_text('out')
+    (remote_path / 'a000_SIM_STAT_0').write_text('1700000000\n1700000100\n')
+    (local_path / 'a000_SIM_COMPLETED').write_text('stale')
+
+    missing = platform.get_files_in_bulk({'a000_SIM.cmd.out.0': 'LOG_a000', 'a000_SIM.cmd.err.0': 'LOG_a000',
+                                          'a000_SIM_STAT_0': '', 'a000_SIM_COMPLETED': ''})
+
+    assert missing == ['a000_SIM.cmd.err.0', 'a000_SIM_COMPLETED']
+    assert (local_path / 'LOG_a000' / 'a000_SIM.cmd.out.0').read_text() == 'out'
+    assert (local_path / 'a000_SIM_STAT_0').read_text() == '1700000000\n1700000100\n'
+    assert not (local_path / 'a000_SIM_COMPLETED').exists()
+    assert platform.get_files_in_bulk({'a000_POST_COMPLETED': ''}) == ['a000_POST_COMPLETED']
+    assert platform.transport.sessions_opened == 2
+    get_file.assert_not_called()
+
+
+def test_get_files_in_bulk_falls_back_to_one_by_one(mocker, paramiko_platform):
+    platform = paramiko_platform
+    mocker.patch.object(platform, '_stream_remote_files', side_effect=SSHException('Session not active'))
+    get_file = mocker.patch.object(platform, 'get_file', side_effect=lambda filename, *_, **__: filename == 'a')
+
+    assert platform.get_files_in_bulk({'a': '', 'b': 'LOG_a000'}) == ['b']
+    assert get_file.call_count == 2
+
+
+def test_fetch_completed_files(mocker, paramiko_platform):
+    platform = paramiko_platform
+    get_files_in_bulk = mocker.patch.object(platform, 'get_files_in_bulk', return_value=['a000_POST_COMPLETED'])
+    check_file_exists = mocker.patch.object(platform, 'check_file_exists', return_value=False)
+
+    platform.fetch_completed_files(['a000_SIM', 'a000_POST'])
+
+    get_files_in_bulk.assert_called_once_with({'a000_SIM_COMPLETED': '', 'a000_POST_COMPLETED': ''})
+    assert platform.get_completed_files('a000_SIM')
+    check_file_exists.assert_not_called()
+    # A missing file is checked again, it may not be visible yet
+    assert not platform.get_completed_files('a000_POST')
+    check_file_exists.assert_called_once()
+
+
+def test_retrieve_logfiles_in_bulk(mocker, paramiko_platform):
+    platform = paramiko_platform
+    jobs = []
+    for name, wrapper_type in [('a000_SIM', None), ('a000_POST', None), ('a000_VERTICAL', 'vertical')]:
+        job = mocker.MagicMock(wrapper_type=wrapper_type)
+        job.name = name
+        job.get_log_and_stat_files.return_value = {f'{name}.cmd.out.0': 'LOG_a000', f'{name}_STAT_0': ''}
+        job.retrieve_fetched_logfiles.side_effect = lambda missing, name=name: f'{name}.cmd.out.0' not in missing
+        jobs.append(job)
+    get_files_in_bulk = mocker.patch.object(platform, 'get_files_in_bulk', return_value=['a000_POST.cmd.out.0'])
+
+    pending = platform.retrieve_logfiles_in_bulk(jobs)
+
+    assert [job.name for job in pending] == ['a000_VERTICAL', 'a000_POST']
+    get_files_in_bulk.assert_called_once_with({'a000_SIM.cmd.out.0': 'LOG_a000', 'a000_SIM_STAT_0': '',
+                                               'a000_POST.cmd.out.0': 'LOG_a000', 'a000_POST_STAT_0': ''})
+    jobs[2].get_log_and_stat_files.assert_not_called()
@@ -17,11 +17,17 @@
 
 """This file contains tests for the ``platform``."""
 
+import time
 from pathlib import Path
+from threading import Event
 
 import pytest
 
+from autosubmit.job.job import Job
+from autosubmit.job.job_common import Status
+from autosubmit.job.job_index import JobStatusIndex
 from autosubmit.platforms.locplatform import LocalPlatform
+from autosubmit.platforms.platform_checker import PlatformChecker
 from test.unit.test_job import TestJob, FakeBasicConfig
 
 
@@ -82,3 +88,78 @@ def test_local_platform_read_file(tmp_path):
 
     assert platform.get_file_size(path_not_exists) is None
     assert platform.read_file(path_not_exists) is None
+
+
+def test_platform_checker_checks_platforms_at_the_same_time(mocker):
+    """A stalled platform does not hold up the others, and is not checked again until it answers."""
+    answer = Event()
+    fast = mocker.MagicMock()
+    fast.name = 'fast'
+    fast.check_Alljobs.side_effect = lambda jobs, as_conf: time.sleep(0.2)
+    other = mocker.MagicMock()
+    other.name = 'other'
+    other.check_Alljobs.side_effect = lambda jobs, as_conf: time.sleep(0.2)
+    stalled = mocker.MagicMock()
+    stalled.name = 'stalled'
+    stalled.check_Alljobs.side_effect = lambda jobs, as_conf: answer.wait(10)
+    a, b, c = ([[Job(name, name, Status.RUNNING, 0), Status.RUNNING]] for name in 'abc')
+
+    checker = PlatformChecker(timeout=1)
+    start = time.monotonic()
+    checked = checker.check([(fast, a), (stalled, b), (other, c)], None)
+    assert time.monotonic() - start < 2
+    assert checked == [(fast, a), (other, c)]
+    assert checker.is_busy(stalled) and not checker.is_busy(fast)
+
+    checked = checker.check([(fast, a), (stalled, b)], None)
+    assert checked == [(fast, a)]
+    assert stalled.check_Alljobs.call_count == 1
+
+    answer.set()
+    time.sleep(0.2)
+    assert not checker.is_busy(stalled)
+    assert checker.check([(stalled, b)], None) == [(stalled, b)]
+    assert stalled.check_Alljobs.call_count == 2
+
+
+def test_platform_checker_keeps_timed_out_checks_away_from_the_jobs(mocker):
+    """Only the checks that finish in time change the jobs, and always in the calling thread."""
+    answer = Event()
+
+    def check(jobs, as_conf, wait):
+        if wait:
+            answer.wait(10)
+        for job, _ in jobs:
+            job.new_status = Status.COMPLETED
+            job.status = Status.FAILED
+            job.start_time = 'now'
+
+    fast = mocker.MagicMock()
+    fast.name = 'fast'
+    fast.check_Alljobs.side_effect = lambda jobs, as_conf: check(jobs, as_conf, False)
+    stalled = mocker.MagicMock()
+    stalled.name = 'stalled'
+    stalled.check_Alljobs.side_effect = lambda jobs, as_conf: check(jobs, as_conf, True)
+    fast_job, stalled_job = Job('fast_job', '1', Status.RUNNING, 0), Job('stalled_job', '2', Status.RUNNING, 0)
+    job_list = [fast_job, stalled_job]
+    index = JobStatusIndex()
+    index.rebuild(job_list)
+
+    checker = PlatformChecker(timeout=0.5)
+    checker.check([(fast, [[fast_job, Status.RUNNING]]), (stalled, [[stalled_job, Status.RUNNING]])], None)
+    answer.set()
+    time.sleep(0.2)
+
+    assert (fast_job.new_status, fast_job.status, fast_job.start_time) == (Status.COMPLETED, Status.FAILED, 'now')
+    assert index.get(job_list, [Status.FAILED]) == [fast_job]
+    assert (stalled_job.new_status, stalled_job.status, stalled_job.start_time) == (Status.RUNNING, Status.RUNNING, None)
+    assert index.get(job_list, [Status.RUNNING]) == [stalled_job]
+
+
+def test_platform_checker_raises_errors_of_checks(mocker):
+    failing = mocker.MagicMock()
+    failing.name = 'failing'
+    failing.check_Alljobs.side_effect = ValueError('connection lost')
+
+    with pytest.raises(ValueError, match='connection lost'):
+        PlatformChecker(timeout=5).check([(failing, [])], None)
@@ -0,0 +1,75 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the waiting times between the checks of the jobs."""
+
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from autosubmit.job.job_common import Status
+from autosubmit.platforms.polling import PollingScheduler, backoff_time
+
+NOW = datetime.datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _job(name, status, section='SIM', start_time=None, wallclock_in_seconds=None):
+    return SimpleNamespace(name=name, status=status, section=section, start_time=start_time,
+                           wallclock_in_seconds=wallclock_in_seconds)
+
+
+@pytest.mark.parametrize('attempt,low,high', [
+    (0, 2.5, 5),
+    (1, 5, 10),
+    (3, 20, 40),
+    (10, 30, 60),
+    (1000, 30, 60),
+])
+def test_backoff_time(attempt, low, high):
+    for _ in range(20):
+        assert low <= backoff_time(attempt) <= high
+
+
+def test_next_poll_without_running_jobs():
+    polling = PollingScheduler()
+    assert polling.next_poll([], 5, 60, NOW) == 60
+    assert polling.next_poll([_job('a', Status.QUEUING)], 5, 60, NOW) == 60
+    assert polling.next_poll([_job('a', Status.QUEUING), _job('b', Status.SUBMITTED)], 5, 60, NOW) == 5
+    # Fixed sleep, as SAFETYSLEEPTIME
+    assert polling.next_poll([_job('b', Status.SUBMITTED)], 10, 10, NOW) == 10
+
+
+def test_next_poll_uses_wallclock_and_seen_runtimes():
+    polling = PollingScheduler()
+    first = _job('first', Status.RUNNING, start_time=NOW, wallclock_in_seconds=3600)
+    assert polling.next_poll([first], 5, 60, NOW) == 60
+    # Close to the end of its wallclock
+    assert polling.next_poll([first], 5, 60, NOW + datetime.timedelta(seconds=3580)) == 20
+    # Over it
+    assert polling.next_poll([first], 5, 60, NOW + datetime.timedelta(seconds=3700)) == 5
+
+    first.status = Status.COMPLETED
+    polling.next_poll([], 5, 60, NOW + datetime.timedelta(seconds=3720))
+    assert polling.expected_runtime(first) == 3720
+
+    second_start = NOW + datetime.timedelta(seconds=4000)
+    second = _job('second', Status.RUNNING, start_time=second_start, wallclock_in_seconds=7200)
+    assert polling.next_poll([second], 5, 60, second_start + datetime.timedelta(seconds=3690)) == 30
+    # No runtimes seen for the section, and no wallclock
+    other = _job('other', Status.RUNNING, section='POST', start_time=second_start)
+    assert polling.next_poll([other], 5, 60, second_start) == 60
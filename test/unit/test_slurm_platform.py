@@ -171,6 +171,44 @@ def test_process_batch_ready_jobs_valid_packages_to_submit(mocker, slurm_platfor
     assert failed_packages == []
 
 
+def test_process_batch_ready_jobs_cancels_duplicates_at_once(mocker, slurm_platform, create_packages):
+    slurm_platform.get_jobid_by_jobname = mocker.MagicMock(side_effect=lambda name: ['1', '2', '3'])
+    slurm_platform.send_commands = mocker.MagicMock()
+    slurm_platform.submit_Script = mocker.MagicMock(return_value=[1, 2, 3])
+
+    slurm_platform.process_batch_ready_jobs(create_packages, [])
+
+    slurm_platform.send_commands.assert_called_once_with(
+        ['scancel 2', 'scancel 3', 'scancel 1', 'scancel 3', 'scancel 1', 'scancel 2'])
+
+
+def test_get_queue_status_sends_the_commands_at_once(mocker, slurm_platform):
+    slurm_platform._queue_snapshot = ({'1': '(JobHeldUser)', '2': '(JobHeldUser)', '3': '(Priority)'}, {})
+    slurm_platform.send_commands = mocker.MagicMock()
+    slurm_platform.send_command = mocker.MagicMock()
+    jobs = [Job(f'a000_{job_id}_SIM', job_id, Status.QUEUING, 0) for job_id in ('1', '2', '3')]
+    jobs[1].hold = True
+
+    slurm_platform.get_queue_status(jobs, '1,2,3', None)
+
+    slurm_platform.send_commands.assert_called_once_with(['scontrol release 1'])
+    slurm_platform.send_command.assert_not_called()
+    assert [job.new_status for job in jobs[:2]] == [Status.QUEUING, Status.HELD]
+
+
+def test_get_queue_status_fails_the_jobs_even_if_a_cancellation_fails(mocker, slurm_platform):
+    slurm_platform._queue_snapshot = ({'1': '(InvalidQOS)', '2': '(InvalidAccount)'}, {})
+    slurm_platform.send_commands = mocker.MagicMock(side_effect=AutosubmitError('scancel: error: Invalid job id', 6005))
+    update_status = mocker.patch.object(Job, 'update_status')
+    jobs = [Job(f'a000_{job_id}_SIM', job_id, Status.QUEUING, 0) for job_id in ('1', '2')]
+
+    with pytest.raises(AutosubmitError):
+        slurm_platform.get_queue_status(jobs, '1,2', None)
+
+    assert [job.new_status for job in jobs] == [Status.FAILED, Status.FAILED]
+    assert update_status.call_count == 2
+
+
 def test_submit_job(mocker, slurm_platform):
     slurm_platform.get_submit_cmd = mocker.MagicMock(returns="dummy")
     slurm_platform.send_command = mocker.MagicMock(returns="dummy")
@@ -189,3 +227,59 @@ def test_submit_job(mocker, slurm_platform):
     slurm_platform._ssh_output = "10000\n"
     jobs_id = slurm_platform.submit_job(job, "dummy")
     assert jobs_id == 10000
+
+
+def test_parse_jobs_status(platform):
+    output = ("10000 RUNNING\n"
+              "10001_1 COMPLETED\n"
+              "10001_[2-4] PENDING\n"
+              "10002.batch FAILED\n"
+              "10002 COMPLETED\n"
+              "10003+0 RUNNING\n"
+              "\n"
+              "100040 PENDING\n")
+    jobs_status = platform.parse_jobs_status(output)
+    assert jobs_status['10000'] == 'RUNNING'
+    assert jobs_status['10001'] == 'COMPLETED'
+    assert jobs_status['10001_[2-4]'] == 'PENDING'
+    # The first line of a job gives its status
+    assert jobs_status['10002'] == 'FAILED'
+    assert jobs_status['10003'] == 'RUNNING'
+    assert '10004' not in jobs_status
+    for job_id, status in [(10000, 'RUNNING'), (10001, 'COMPLETED'), (10004, [])]:
+        assert platform.parse_Alljobs_output(output, job_id) == status
+
+
+def test_parse_queue_reasons(platform):
+    output = "JOBID,NODELIST(REASON)\n10000,(JobHeldUser)\n10001,(Priority)\n"
+    assert platform.parse_queue_reasons(output) == {
+        'JOBID': 'NODELIST(REASON)', '10000': '(JobHeldUser)', '10001': '(Priority)'}
+    assert platform.parse_queue_reason(output, 10000) == '(JobHeldUser)'
+    assert platform.parse_queue_reason(output, 10002) == ''
+
+
+def test_queue_snapshot_is_shared_until_invalidated(mocker, platform):
+    commands = []
+
+    def send_command(command, ignore_log=False, x11=False):
+        commands.append(command)
+        platform._ssh_output = ("10000|(JobHeldUser)|a000_SIM\n"
+                                "10001|(Priority)|a000_POST\n"
+                                "10002|node[1-2],node5|a000_SIM\n")
+        return True
+
+    mocker.patch.object(platform, 'send_command', side_effect=send_command)
+    assert platform.get_jobid_by_jobname('a000_SIM') == ['10000', '10002']
+    assert platform.get_jobid_by_jobname('a000_INI') == []
+    assert platform.get_queue_reason('10001') == '(Priority)'
+    assert platform.get_queue_reason(10002) == 'node[1-2],node5'
+    assert commands == [platform.get_queue_snapshot_cmd()]
+
+    job = Job('a000_POST', '10001', Status.QUEUING, 0)
+    job.hold = False
+    platform.get_queue_status([job], '10001', None)
+    assert len(commands) == 1
+
+    platform.invalidate_queue_snapshot()
+    assert platform.get_jobid_by_jobname('a000_POST') == ['10001']
+    assert len(commands) == 2
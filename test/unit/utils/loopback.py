@@ -0,0 +1,142 @@
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+#
+# This file is part of Autosubmit.
+#
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Stand-ins of a paramiko transport and channel that run the sessions in local shells."""
+
+import os
+import signal
+import subprocess
+import time
+from contextlib import suppress
+from threading import Lock, Thread
+from typing import Any, List, Optional
+
+
+class LoopbackChannel(object):
+    """
+    Stand-in of a paramiko session channel that runs its command in a local subprocess.
+
+    It gives the persistent shells of ``ChannelPool`` a real shell to talk to without an
+    SSH server, for the tests and for benchmarking the command pipelining.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self._process: Optional[subprocess.Popen] = None
+        self._stdout = b''
+        self._stderr = b''
+        self._lock = Lock()
+        self._readers: List[Thread] = []
+        self._signal_read, self._signal_write = os.pipe()
+        os.set_blocking(self._signal_read, False)
+
+    def exec_command(self, command: str) -> None:
+        self._process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE, start_new_session=True)
+        self._readers = [Thread(target=self._pump, args=(self._process.stdout, '_stdout'), daemon=True),
+                         Thread(target=self._pump, args=(self._process.stderr, '_stderr'), daemon=True)]
+        for reader in self._readers:
+            reader.start()
+
+    def _pump(self, stream: Any, buffer: str) -> None:
+        for chunk in iter(lambda: os.read(stream.fileno(), 65536), b''):
+            with self._lock:
+                setattr(self, buffer, getattr(self, buffer) + chunk)
+            with suppress(OSError):
+                os.write(self._signal_write, b'\0')
+        with suppress(OSError):
+            os.write(self._signal_write, b'\0')
+
+    def _pop(self, buffer: str, size: int) -> bytes:
+        with self._lock:
+            data = getattr(self, buffer)
+            setattr(self, buffer, data[size:])
+            if not self._stdout and not self._stderr:
+                with suppress(OSError):
+                    while os.read(self._signal_read, 4096):
+                        pass
+        return data[:size]
+
+    def fileno(self) -> int:
+        """Readable while there is data to receive, like the pipe of a paramiko channel."""
+        return self._signal_read
+
+    def sendall(self, data: bytes) -> None:
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+
+    def recv_ready(self) -> bool:
+        return bool(self._stdout)
+
+    def recv(self, size: int) -> bytes:
+        # Waits for data until the output is closed, like a paramiko channel
+        while not self._stdout and self._readers[0].is_alive():
+            time.sleep(0.01)
+        return self._pop('_stdout', size)
+
+    def recv_stderr_ready(self) -> bool:
+        return bool(self._stderr)
+
+    def recv_stderr(self, size: int) -> bytes:
+        return self._pop('_stderr', size)
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        pass
+
+    def shutdown_write(self) -> None:
+        with suppress(Exception):
+            self._process.stdin.close()
+
+    def recv_exit_status(self) -> int:
+        exit_status = self._process.wait()
+        for reader in self._readers:
+            reader.join()
+        return exit_status
+
+    def exit_status_ready(self) -> bool:
+        return self._process.poll() is not None and not any(reader.is_alive() for reader in self._readers)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._process is not None:
+            with suppress(Exception):
+                self._process.stdin.close()
+            with suppress(Exception):
+                # Also the commands still running, that keep the output pipes open
+                os.killpg(self._process.pid, signal.SIGKILL)
+                self._process.wait()
+            for reader in self._readers:
+                reader.join()
+            for stream in (self._process.stdout, self._process.stderr):
+                with suppress(Exception):
+                    stream.close()
+        for descriptor in (self._signal_read, self._signal_write):
+            with suppress(OSError):
+                os.close(descriptor)
+
+
+class LoopbackTransport(object):
+    """Stand-in of a paramiko transport whose sessions are ``LoopbackChannel``."""
+
+    def __init__(self):
+        self.sessions_opened = 0
+
+    def open_session(self) -> LoopbackChannel:
+        self.sessions_opened += 1
+        return LoopbackChannel()